@@ -1,90 +1,78 @@
-from scipy import io      # Biblioteca para manipulação dos arquivos.mat.
 from pathlib import Path  # Biblioteca para manipulação dos diretórios.
-import pandas as pd
-from scipy.io import loadmat
 import numpy as np
 import matplotlib.pyplot as plt
-import control as ctrl
 
-# Carregar o dataset
-caminhoArquivos = Path(__file__).resolve().parents[0]
-caminhoCompleto = str(Path(caminhoArquivos/'Dataset_Grupo9'))
-arquivoDados = io.loadmat(caminhoCompleto)
+from c213 import identify_smith
+from c213.dados import carregar_dataset
+from c213.metricas import metricas_degrau
+from c213.simulacao import resposta_degrau_fopdt
 
-valores_strct = arquivoDados['reactionExperiment'][0, 0]
+# Dataset do grupo, na mesma pasta do script
+ARQUIVO = Path(__file__).resolve().parent / 'Dataset_Grupo9.mat'
 
-# Extraindo entrada, saída e tempo
-tempo  = valores_strct['sampleTime'].flatten().astype(float)
-entrada  = valores_strct['dataInput'].flatten()    
-saida  = valores_strct['dataOutput'].flatten()
-# 1. Determinar o valor final da saída
-valor_final = saida[-1]
-# 2. Encontrar os tempos correspondentes a 28,3% e 63,2% do valor final
-y1 = 0.283 * valor_final
-y2 = 0.632 * valor_final
-# Encontrar t1 e t2 nos dados
-t1 = tempo[np.where(saida >= y1)[0][0]]
-t2 = tempo[np.where(saida >= y2)[0][0]]
-# 3. Calcular τ e θ usando o Método de Smith
-tau = 1.5 * (t2 - t1)
-theta = t2 - tau
-# 4. Calcular o ganho k
-amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
-k = (valor_final - saida[0]) / amplitude_degrau
 
-# 5. Definir o modelo identificado com atraso
-# Função de transferência do sistema de primeira ordem: G(s) = k / (tau * s + 1)
-G_s = ctrl.tf([k], [tau, 1])
-# Aproximação de Pade para o atraso
-num_pade, den_pade = ctrl.pade(theta, 5)  # Aproximação de ordem 5
-pade_approx = ctrl.tf(num_pade, den_pade)
-# 6. Calcular a resposta estimada usando o modelo
-modelo_estimado = ctrl.series(G_s, pade_approx)
-# 7. Simular a resposta ao degrau do modelo identificado
-# Usando o vetor de tempo original dos dados reais
-t_open, y_open = ctrl.step_response(modelo_estimado * amplitude_degrau, T=tempo)
-# 8. Cálculo do Erro Quadrático Médio (EQM)
-EQM = np.sqrt(np.sum((y_open - saida) ** 2) / len(saida))
+def main():
+    # Carregar o dataset (tempo, entrada e saída)
+    tempo, entrada, saida = carregar_dataset(ARQUIVO)
+    # 1-3. Calcular τ e θ usando o Método de Smith (28,3% e 63,2% do valor final)
+    amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
+    # 4. Calcular o ganho k (junto com τ e θ, numa única varredura)
+    k, tau, theta = identify_smith(tempo, entrada, saida)
 
+    # 5. Definir o modelo identificado com atraso
+    # G(s) = k * exp(-theta*s) / (tau * s + 1)
+    # 6. Calcular a resposta estimada usando o modelo
+    # 7. Simular a resposta ao degrau do modelo identificado
+    # Usando o vetor de tempo original dos dados reais
+    # (resposta exata do FOPDT: atraso aplicado sem a aproximação de Padé)
+    t_open = tempo
+    y_open = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
+    # 8. Cálculo do Erro Quadrático Médio (EQM)
+    EQM = np.sqrt(np.sum((y_open - saida) ** 2) / len(saida))
 
 
-# 9. Visualização dos Resultados
-plt.figure(figsize=(12, 6))
-plt.plot(tempo, saida, 'black', label='Resposta Real do Sistema')
-plt.plot(tempo, entrada, label='Entrada (Degrau)', color='blue')
-plt.plot(t_open, y_open, 'r', label='Modelo Identificado (Smith) Malha Aberta')
-plt.title('Identificação da Planta pelo Método de Smith (Malha Aberta)')
-plt.xlabel('Tempo (s)')
-plt.ylabel('Temperatura')
-plt.legend()
-plt.grid()
-plt.tight_layout()
+    # 9. Visualização dos Resultados
+    plt.figure(figsize=(12, 6))
+    plt.plot(tempo, saida, 'black', label='Resposta Real do Sistema')
+    plt.plot(tempo, entrada, label='Entrada (Degrau)', color='blue')
+    plt.plot(t_open, y_open, 'r', label='Modelo Identificado (Smith) Malha Aberta')
+    plt.title('Identificação da Planta pelo Método de Smith (Malha Aberta)')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Temperatura')
+    plt.legend()
+    plt.grid()
+    plt.tight_layout()
 
-# Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
-props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
+    # Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
+    props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
 
-textstr = '\n'.join((
-    f'Ganho (k): {k:.4f}',
-    f'Tempo de Atraso (θ): {theta:.4f} s',
-    f'Constante de Tempo (τ): {tau:.4f} s',
-    f'(EQM): {EQM:.4f}'))
+    textstr = '\n'.join((
+        f'Ganho (k): {k:.4f}',
+        f'Tempo de Atraso (θ): {theta:.4f} s',
+        f'Constante de Tempo (τ): {tau:.4f} s',
+        f'(EQM): {EQM:.4f}'))
 
-# Posicionar a caixa com os resultados no gráfico
-plt.text(tempo[-1] * 0.77, max(saida) * 0.7, textstr, fontsize=10, bbox=props)
+    # Posicionar a caixa com os resultados no gráfico
+    plt.text(tempo[-1] * 0.77, max(saida) * 0.7, textstr, fontsize=10, bbox=props)
 
-plt.show()
+    plt.show()
 
-# Exibir os resultados
-print(f'Método de Identificação: Smith (Malha Aberta)')
-print(f'Parâmetros Identificados:')
-print(f'Ganho (k): {k:.4f}')
-print(f'Tempo de Atraso (θ): {theta:.4f} s')
-print(f'Constante de Tempo (τ): {tau:.4f} s')
-print(f'Função de Transferência do Modelo Identificado: G(s) = {k:.4f} * e^(-{theta:.4f} * s) / ({tau:.4f} * s + 1)')
-print(f'Erro Quadrático Médio (EQM): {EQM}')
+    # Exibir os resultados
+    print(f'Método de Identificação: Smith (Malha Aberta)')
+    print(f'Parâmetros Identificados:')
+    print(f'Ganho (k): {k:.4f}')
+    print(f'Tempo de Atraso (θ): {theta:.4f} s')
+    print(f'Constante de Tempo (τ): {tau:.4f} s')
+    print(f'Função de Transferência do Modelo Identificado: G(s) = {k:.4f} * e^(-{theta:.4f} * s) / ({tau:.4f} * s + 1)')
+    print(f'Erro Quadrático Médio (EQM): {EQM}')
 
-# Informações adicionais sobre o sistema
-info = ctrl.step_info(modelo_estimado)
-print(f"Tempo de subida (tr): {info['RiseTime']:.4f} s")
-print(f"Tempo de acomodação (ts): {info['SettlingTime']:.4f} s")
-print(f"Valor de pico: {info['Peak']:.4f}")
+    # Informações adicionais sobre o sistema
+    # (calculadas da resposta já simulada, normalizada para degrau unitário)
+    info = metricas_degrau(t_open, y_open / amplitude_degrau, valor_final=k)
+    print(f"Tempo de subida (tr): {info['RiseTime']:.4f} s")
+    print(f"Tempo de acomodação (ts): {info['SettlingTime']:.4f} s")
+    print(f"Valor de pico: {info['Peak']:.4f}")
+
+
+if __name__ == '__main__':
+    main()
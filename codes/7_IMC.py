@@ -1,107 +1,66 @@
-from scipy import io      # Biblioteca para manipulação dos arquivos.mat.
 from pathlib import Path  # Biblioteca para manipulação dos diretórios.
-import pandas as pd
-from scipy.io import loadmat
-import numpy as np
 import matplotlib.pyplot as plt
-import control as ctrl
 
-# Carregar o dataset
-caminhoArquivos = Path(__file__).resolve().parents[0]
-caminhoCompleto = str(Path(caminhoArquivos/'Dataset_Grupo9'))
-arquivoDados = io.loadmat(caminhoCompleto)
+from c213 import identify_smith, tune_imc, simulate_until_settled
+from c213.dados import carregar_dataset
+from c213.simulacao import malha_fechada_unitaria
 
-valores_strct = arquivoDados['reactionExperiment'][0, 0]
+# Dataset do grupo, na mesma pasta do script
+ARQUIVO = Path(__file__).resolve().parent / 'Dataset_Grupo9.mat'
 
-# Extraindo entrada, saída e tempo
-tempo  = valores_strct['sampleTime'].flatten().astype(float)
-entrada  = valores_strct['dataInput'].flatten()    
-saida    = valores_strct['dataOutput'].flatten()
 
-# 1. Determinar o valor final da saída
-valor_final = saida[-1]
+def main():
+    # Carregar o dataset (tempo, entrada e saída)
+    tempo, entrada, saida = carregar_dataset(ARQUIVO)
+    # 1-4. Calcular k, τ e θ pelo Método de Smith (28,3% e 63,2% do valor final), numa única varredura
+    k, tau, theta = identify_smith(tempo, entrada, saida)
 
-# 2. Encontrar os tempos correspondentes a 28,3% e 63,2% do valor final
-y1 = 0.283 * valor_final
-y2 = 0.632 * valor_final
+    # 5-6. Modelo usado na sintonia: feedback(G, 1) em série com o atraso theta
+    k_fechada, tau_fechada = malha_fechada_unitaria(k, tau)
 
-# Encontrar t1 e t2 nos dados
-t1 = tempo[np.where(saida >= y1)[0][0]]
-t2 = tempo[np.where(saida >= y2)[0][0]]
+    # Calculando os valores de kp, ti e td
+    lamb = 20 # lambda tem que ser maior que 10.2 (lamb/theta > 0.8)
+    kp, ti, td = tune_imc(k, tau, theta, lamb)
 
-# 3. Calcular τ e θ usando o Método de Smith
-tau = 1.5 * (t2 - t1)
-theta = t2 - tau
+    # Simulação da resposta ao degrau (discreta, com atraso exato)
+    # Com lambda = 20 a malha demora a acomodar: a grade é estendida até a resposta acomodar
+    # (as métricas já vêm da resposta simulada; com ação integral o valor final é o setpoint)
+    t_sim, y_modelo, info = simulate_until_settled(tempo, k_fechada, tau_fechada, theta, kp, ti, td)
 
-# 4. Calcular o ganho k
-amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
-k = (valor_final - saida[0]) / amplitude_degrau
+    # 9. Visualização dos Resultados
+    plt.figure(figsize=(12, 6))
+    plt.plot(t_sim, y_modelo, 'red', label='PID')
+    plt.title('Sistema com controle PID\n Sistema lento, com overshoot (ts elevado)')
+    plt.xlabel('Tempo (s)')
+    plt.ylabel('Temepratura')
+    plt.legend()
+    plt.grid()
+    plt.tight_layout()
 
-# 5. função de tranferencia do modelo
-def modelo_identificado(k, tau, theta):
-    G_s = ctrl.tf([k], [tau, 1])
-    H_s = ctrl.feedback(G_s, 1)
-    # Aproximação de Pade para o atraso
-    num_pade, den_pade = ctrl.pade(theta, 5)  # Aproximação de ordem 5
-    Pade_approx = ctrl.tf(num_pade, den_pade)
-    # Função de transferência com atraso
-    return ctrl.series(H_s, Pade_approx)
+    # Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
+    props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
 
-# 6. Calcular a resposta estimada usando o modelo
-resposta_modelo = modelo_identificado(k, tau, theta)
+    textstr = '\n'.join((
+        f"Tempo de subida(tr): {info['RiseTime']:.4f} s",
+        f"Tempo de acomodação(ts): {info['SettlingTime']:.4f} s"))
 
-# Calculando os valores de kp, ti e td
-lamb = 20 # lambda tem que ser maior que 10.2 (lamb/theta > 0.8)
-kp = ((2*tau)+theta)/(k*((2*lamb)+theta))
-ti = tau+(theta/2)
-td = (tau*theta)/((2*tau)+theta)
+    # Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
+    props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
 
-# 7. função do PID
-def funcao_PID(kp, ti, td):
-    pid = ctrl.tf([kp*td, kp, kp/ti], [1, 0])
-    return pid
 
-PID = funcao_PID(kp, ti, td)
+    # Posicionar a caixa com os resultados no gráfico
+    plt.text(t_sim[-1], 0.7, textstr, fontsize=10, bbox=props)
 
-# Sistema em malha fechada com controlador PID e modelo identificado
-sistema_em_malha_fechada = ctrl.feedback(ctrl.series(PID, resposta_modelo))
+    plt.show()
 
-# Simulação da resposta ao degrau
-t_sim, y_modelo = ctrl.step_response(sistema_em_malha_fechada)
+    # Exibir os resultados
+    print(f'Sistema com controle PID')
+    print(f'respostas:')
 
-# 9. Visualização dos Resultados
-plt.figure(figsize=(12, 6))
-plt.plot(t_sim, y_modelo, 'red', label='PID')
-plt.title('Sistema com controle PID\n Sistema lento, com overshoot (ts elevado)')
-plt.xlabel('Tempo (s)')
-plt.ylabel('Temepratura')
-plt.legend()
-plt.grid()
-plt.tight_layout()
+    print(f"Tempo de subida(tr): {info['RiseTime']:.4f} s")
+    print(f"Tempo de acomodação(ts): {info['SettlingTime']:.4f} s")
+    print(f"valor de pico: {info['Peak']:.4f}")
 
-info = ctrl.step_info(sistema_em_malha_fechada)
 
-# Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
-props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
-
-textstr = '\n'.join((
-    f'Tempo de subida(tr): {info['RiseTime']:.4f} s',
-    f'Tempo de acomodação(ts): {info['SettlingTime']:.4f} s'))
-
-# Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
-props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
-
-
-# Posicionar a caixa com os resultados no gráfico
-plt.text(tempo[-1] * 6, 0.7, textstr, fontsize=10, bbox=props)
-
-plt.show()
-
-# Exibir os resultados
-print(f'Sistema com controle PID')
-print(f'respostas:')
-
-info = ctrl.step_info(sistema_em_malha_fechada)
-print(f"Tempo de subida(tr): {info['RiseTime']:.4f} s")
-print(f"Tempo de acomodação(ts): {info['SettlingTime']:.4f} s")
-print(f"valor de pico: {info['Peak']:.4f}")
+if __name__ == '__main__':
+    main()
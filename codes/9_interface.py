@@ -1,22 +1,27 @@
 import sys
-import numpy as np
-import scipy.io as io
+from functools import partial
 from pathlib import Path
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QVBoxLayout, QHBoxLayout, QPushButton,
-    QFileDialog, QLabel, QComboBox, QDoubleSpinBox, QCheckBox
+    QFileDialog, QLabel, QComboBox, QDoubleSpinBox, QCheckBox, QMessageBox
 )
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import control as ctrl
+
+from c213 import identify_smith, identify_sundaresan, tune_chr
+from c213.dados import carregar_dataset
+from c213.grafico import MODULOS_GRAFICO, GraficoIncremental
+from c213.tarefas import ExecutorTarefas, pre_carregar
+
+# heavy modules: imported in the background once the window is shown, or on first use
+DEFERRED_MODULES = MODULOS_GRAFICO + ('scipy.io', 'scipy.signal', 'control')
 
 class MethodSelectorGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Identificação e Controle de Processo")
         self.dataset = None  # t, u, y
+        self.params = {}  # method -> (k, tau, theta)
         self.k = self.tau = self.theta = None
 
         central = QWidget()
@@ -80,10 +85,16 @@ class MethodSelectorGUI(QMainWindow):
         btn_sim.clicked.connect(self.simulate)
         layout.addWidget(btn_sim)
 
-        # Plot area
-        self.fig = Figure(figsize=(6,4))
-        self.canvas = FigureCanvas(self.fig)
-        layout.addWidget(self.canvas)
+        # Plot area (the Matplotlib figure is created on the first plot)
+        self.plot = GraficoIncremental(self, figsize=(6, 4))
+        layout.addWidget(self.plot, 1)
+
+        # Background jobs (loading and simulation); a new click supersedes the previous one
+        self.loader = ExecutorTarefas(self)
+        self.executor = ExecutorTarefas(self)
+        for executor in (self.loader, self.executor):
+            executor.ocupado.connect(lambda busy: self.statusBar().showMessage('Calculando...' if busy else ''))
+            executor.erro.connect(lambda message: QMessageBox.critical(self, 'Erro', message))
 
     def toggle_manual(self):
         manual = self.manual_cb.isChecked()
@@ -94,21 +105,19 @@ class MethodSelectorGUI(QMainWindow):
         path, _ = QFileDialog.getOpenFileName(self, "Selecione o arquivo .mat", "", "MAT files (*.mat)")
         if not path:
             return
-        data = io.loadmat(path)
-        v = data['reactionExperiment'][0,0]
-        t = v['sampleTime'].flatten().astype(np.float64)
-        u = v['dataInput'].flatten()
-        y = v['dataOutput'].flatten()
-
-        # compute k, tau, theta by Smith for base
-        yf = y[-1]
-        t1 = t[np.where(y >= 0.283*yf)[0][0]]
-        t2 = t[np.where(y >= 0.632*yf)[0][0]]
-        tau = 1.5*(t2 - t1)
-        theta = t2 - tau
-        k = (yf - y[0]) / u.mean()
-
-        self.dataset = (t, u, y)
+        # loading and identification run off the GUI thread
+        self.loader.executar(partial(self.read_and_identify, path), self.data_loaded)
+
+    @staticmethod
+    def read_and_identify(path):
+        t, u, y = carregar_dataset(path)
+        return (t, u, y), {'smith': identify_smith(t, u, y), 'sundaresan': identify_sundaresan(t, u, y)}
+
+    def data_loaded(self, result):
+        self.dataset, self.params = result
+        # Smith is the base
+        k, tau, theta = self.params['smith']
+
         self.k, self.tau, self.theta = k, tau, theta
         # update labels and manual spins
         self.lbl_k.setText(f"k: {k:.3f}")
@@ -132,109 +141,70 @@ class MethodSelectorGUI(QMainWindow):
             k, tau, theta = self.k, self.tau, self.theta
         # recompute params for methods that change tau/theta
         if method == "Sundaresan Malha Aberta" or method == "Sundaresan Malha Fechada":
-            yf = y[-1]
-            t1_idx = np.where(y >= 0.353*yf)[0][0]
-            t2_idx = np.where(y >= 0.853*yf)[0][0]
-            t1 = t[t1_idx]
-            t2 = t[t2_idx]
-            tau = (2/3)*(t2 - t1)
-            theta = 1.3*t1 - 0.29*t2
-            k = (yf - y[0]) / u.mean()
+            k, tau, theta = self.params['sundaresan']
         # update labels with current params
         self.lbl_k.setText(f"k: {k:.3f}")
         self.lbl_tau.setText(f"τ: {tau:.3f}")
         self.lbl_theta.setText(f"θ: {theta:.3f}")
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-
-        # prepare base models
-        G = ctrl.tf([k], [tau, 1])
-        num_p, den_p = ctrl.pade(theta, 5)
-        P = ctrl.tf(num_p, den_p)
-
-        # implement each method using k, tau, theta
+        # run the simulation off the GUI thread; draw_simulation updates the plot
+        self.executor.executar(partial(self.compute_simulation, method, t, u, y, k, tau, theta),
+                               self.draw_simulation)
+
+    @staticmethod
+    def compute_simulation(method, t, u, y, k, tau, theta):
+        """Return (method, curves), where curves = [(t, y, style, label), ...]."""
+        import control as ctrl
+        from c213 import modelos
+
+        # systems come from the memoized factory: repeated plots reuse them and
+        # each method only builds the models it actually simulates
         if method == "Smith Malha Aberta":
-            model = ctrl.series(G, P)
+            model = modelos.malha_aberta(k, tau, theta)
             t_sim, y_sim = ctrl.step_response(model * u.mean(), T=t)
-            ax.plot(t, y, 'k', label='Real')
-            ax.plot(t_sim, y_sim, 'r', label='Smith Aberta')
+            curves = [(t, y, 'k', 'Real'), (t_sim, y_sim, 'r', 'Smith Aberta')]
 
         elif method == "Smith Malha Fechada":
-            H = ctrl.feedback(G, 1)
-            model = ctrl.series(H, P)
+            model = modelos.malha_fechada(k, tau, theta)
             t_sim, y_sim = ctrl.step_response(model * u.mean(), T=t)
-            ax.plot(t, y, 'k', label='Real')
-            ax.plot(t_sim, y_sim, 'b', label='Smith Fechada')
+            curves = [(t, y, 'k', 'Real'), (t_sim, y_sim, 'b', 'Smith Fechada')]
 
         elif method == "Sundaresan Malha Aberta":
-            yf = y[-1]
-            t1 = t[np.where(y >= 0.353*yf)[0][0]]
-            t2 = t[np.where(y >= 0.853*yf)[0][0]]
-            tau_s = 2/3*(t2 - t1)
-            theta_s = 1.3*t1 - 0.29*t2
-            Gs = ctrl.tf([k], [tau_s,1])
-            num_s, den_s = ctrl.pade(theta_s,5)
-            Ps = ctrl.tf(num_s, den_s)
-            model = ctrl.series(Gs, Ps)
+            model = modelos.malha_aberta(k, tau, theta)
             t_sim, y_sim = ctrl.step_response(model * u.mean(), T=t)
-            ax.plot(t, y, 'k', label='Real')
-            ax.plot(t_sim, y_sim, 'm', label='Sundaresan Aberta')
+            curves = [(t, y, 'k', 'Real'), (t_sim, y_sim, 'm', 'Sundaresan Aberta')]
 
         elif method == "Sundaresan Malha Fechada":
-            yf = y[-1]
-            t1 = t[np.where(y >= 0.353*yf)[0][0]]
-            t2 = t[np.where(y >= 0.853*yf)[0][0]]
-            tau_s = 2/3*(t2 - t1)
-            theta_s = 1.3*t1 - 0.29*t2
-            Gs = ctrl.tf([k], [tau_s,1])
-            Hs = ctrl.feedback(Gs, 1)
-            num_s, den_s = ctrl.pade(theta_s,5)
-            Ps = ctrl.tf(num_s, den_s)
-            model = ctrl.series(Hs, Ps)
+            model = modelos.malha_fechada(k, tau, theta)
             t_sim, y_sim = ctrl.step_response(model * u.mean(), T=t)
-            ax.plot(t, y, 'k', label='Real')
-            ax.plot(t_sim, y_sim, 'c', label='Sundaresan Fechada')
+            curves = [(t, y, 'k', 'Real'), (t_sim, y_sim, 'c', 'Sundaresan Fechada')]
 
         elif method == "Comparação Aberta vs Fechada":
-            mo = ctrl.series(G, P)
+            mo = modelos.malha_aberta(k, tau, theta)
             to, yo = ctrl.step_response(mo * u.mean(), T=t)
-            mc = ctrl.series(ctrl.feedback(G,1), P)
+            mc = modelos.malha_fechada(k, tau, theta)
             tc, yc = ctrl.step_response(mc * u.mean(), T=t)
-            ax.plot(to, yo, 'r', label='Aberta')
-            ax.plot(tc, yc, 'b', label='Fechada')
+            curves = [(to, yo, 'r', 'Aberta'), (tc, yc, 'b', 'Fechada')]
 
         elif method == "IMC":
-            s = ctrl.tf([1,0],[1])
-            C = (tau * s + 1) / (k * tau)
-            loop = ctrl.series(C, G, P)
-            model = ctrl.feedback(loop, 1)
+            model = modelos.malha_imc(k, tau, theta)
             t_sim, y_sim = ctrl.step_response(model * u.mean(), T=t)
-            ax.plot(t, y, 'k', label='Real')
-            ax.plot(t_sim, y_sim, 'g', label='IMC')
+            curves = [(t, y, 'k', 'Real'), (t_sim, y_sim, 'g', 'IMC')]
 
         else:  # CHR Sem Sobrevalor
-            Kp = 0.95 * tau / (k * theta)
-            Ti = 2.4 * tau
-            Td = 0.42 * tau
-            PID = ctrl.tf([Kp * Td, Kp, Kp / Ti], [1, 0])
-            loop = ctrl.series(PID, G, P)
-            model = ctrl.feedback(loop, 1)
+            Kp, Ti, Td = tune_chr(k, tau, theta)
+            model = modelos.malha_pid(k, tau, theta, Kp, Ti, Td)
             t_sim, y_sim = ctrl.step_response(model, T=t)
-            ax.plot(t, y, 'k', label='Real')
-            ax.plot(t_sim, y_sim, 'r', label='CHR Sem Sobrevalor')
+            curves = [(t, y, 'k', 'Real'), (t_sim, y_sim, 'r', 'CHR Sem Sobrevalor')]
+
+        return method, curves
 
-        ax.set_title(method)
-        ax.set_xlabel('Tempo (s)')
-        ax.set_ylabel('Saída')
-        ax.legend()
-        ax.grid(True)
-        self.canvas.draw()
+    def draw_simulation(self, result):
+        method, curves = result
+        self.plot.atualizar(curves, titulo=method, ylabel='Saída')
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     win = MethodSelectorGUI()
     win.show()
+    pre_carregar(DEFERRED_MODULES)
     sys.exit(app.exec_())
\ No newline at end of file
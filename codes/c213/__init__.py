@@ -0,0 +1,14 @@
+"""Rotinas compartilhadas de identificação e controle do projeto C213.
+
+A API pública (c213.api) é reexportada aqui sob demanda: `import c213`
+não carrega numpy/scipy até que uma das funções seja usada.
+"""
+__all__ = ['identify_smith', 'identify_sundaresan', 'tune_imc', 'tune_chr', 'simulate_closed_loop',
+           'simulate_until_settled']
+
+
+def __getattr__(nome):
+    if nome in __all__:
+        from c213 import api
+        return getattr(api, nome)
+    raise AttributeError(f'module {__name__!r} has no attribute {nome!r}')
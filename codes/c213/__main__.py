@@ -0,0 +1,4 @@
+"""Permite rodar a linha de comando como `python -m c213 <subcomando> ...`."""
+from c213.cli import main
+
+main()
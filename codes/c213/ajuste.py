@@ -0,0 +1,135 @@
+"""Identificação por mínimos quadrados sobre o registro inteiro.
+
+Os métodos de dois pontos usam só dois instantes da curva. Aqui k, tau e
+theta (FOPDT) ou k, tau1, tau2 e theta (SOPDT) minimizam o EQM entre o modelo
+e toda a saída medida, partindo da melhor estimativa de Smith/Sundaresan.
+As respostas ao degrau têm forma fechada, então resíduos e jacobianos são
+calculados analiticamente, sem simulação numérica nem diferenças finitas.
+
+Modelos (mesma convenção dos scripts: degrau de amplitude média da entrada):
+    FOPDT: G(s) = k * exp(-theta*s) / (tau*s + 1)
+    SOPDT: G(s) = k * exp(-theta*s) / ((tau1*s + 1)(tau2*s + 1))
+"""
+import numpy as np
+
+from c213.identificacao import identificar
+from c213.simulacao import resposta_degrau_fopdt
+
+# Menor separação relativa entre tau1 e tau2 (evita a divisão por tau1 - tau2)
+SEPARACAO_MINIMA = 1e-6
+
+
+def eqm(saida, modelo):
+    """Raiz do erro quadrático médio, como calculado nos scripts."""
+    return float(np.sqrt(np.mean((np.asarray(modelo) - np.asarray(saida)) ** 2)))
+
+
+def _residuos_fopdt(parametros, tempo, saida, amplitude):
+    k, tau, theta = parametros
+    decorrido = np.maximum(tempo - theta, 0.0)
+    decaimento = np.exp(-decorrido / tau)
+    forma = 1 - decaimento
+    residuos = amplitude*k*forma - saida
+
+    jacobiano = np.empty((len(tempo), 3))
+    jacobiano[:, 0] = amplitude * forma
+    jacobiano[:, 1] = -amplitude * k * decaimento * decorrido / tau**2
+    jacobiano[:, 2] = np.where(tempo > theta, -amplitude * k * decaimento / tau, 0.0)
+    return residuos, jacobiano
+
+
+def _separar(tau1, tau2):
+    if abs(tau1 - tau2) < SEPARACAO_MINIMA * max(tau1, tau2):
+        tau2 = tau1 * (1 - SEPARACAO_MINIMA)
+    return tau1, tau2
+
+
+def _residuos_sopdt(parametros, tempo, saida, amplitude):
+    k, tau1, tau2, theta = parametros
+    tau1, tau2 = _separar(tau1, tau2)
+    decorrido = np.maximum(tempo - theta, 0.0)
+    e1 = np.exp(-decorrido / tau1)
+    e2 = np.exp(-decorrido / tau2)
+    diferenca = tau1 - tau2
+    numerador = tau1*e1 - tau2*e2
+    forma = 1 - numerador/diferenca
+    residuos = amplitude*k*forma - saida
+
+    # Derivadas de forma = 1 - (tau1*e1 - tau2*e2)/(tau1 - tau2)
+    d_tau1 = -(e1*(1 + decorrido/tau1)*diferenca - numerador) / diferenca**2
+    d_tau2 = -(-e2*(1 + decorrido/tau2)*diferenca + numerador) / diferenca**2
+    d_theta = np.where(tempo > theta, -(e1 - e2) / diferenca, 0.0)
+
+    ganho = amplitude * k
+    jacobiano = np.column_stack((amplitude*forma, ganho*d_tau1, ganho*d_tau2, ganho*d_theta))
+    return residuos, jacobiano
+
+
+def _minimizar(residuos_e_jacobiano, inicial, limites, tempo, saida, amplitude):
+    from scipy.optimize import least_squares  # adiado: só o ajuste usa o SciPy
+
+    # least_squares pede resíduos e jacobiano em funções separadas; o cache
+    # evita recalcular as exponenciais para o mesmo ponto
+    cache = {}
+
+    def avaliar(x):
+        chave = x.tobytes()
+        if chave not in cache:
+            cache.clear()
+            cache[chave] = residuos_e_jacobiano(x, tempo, saida, amplitude)
+        return cache[chave]
+
+    resultado = least_squares(lambda x: avaliar(x)[0], inicial, jac=lambda x: avaliar(x)[1],
+                              bounds=limites, x_scale='jac', method='trf')
+    return resultado.x
+
+
+def _preparar(tempo, entrada, saida, amplitude_degrau):
+    tempo = np.asarray(tempo, dtype=np.float64)
+    saida = np.asarray(saida, dtype=np.float64)
+    if amplitude_degrau is None:
+        amplitude_degrau = float(np.mean(entrada))
+    return tempo, saida, amplitude_degrau
+
+
+def estimativa_inicial(tempo, entrada, saida, amplitude_degrau=None):
+    """(k, tau, theta) de Smith ou Sundaresan, o que tiver menor EQM."""
+    tempo, saida, amplitude_degrau = _preparar(tempo, entrada, saida, amplitude_degrau)
+    candidatos = identificar(tempo, entrada, saida, amplitude_degrau=amplitude_degrau).values()
+    return min(candidatos,
+               key=lambda p: eqm(saida, resposta_degrau_fopdt(tempo, *p, amplitude_degrau)))
+
+
+def ajustar_fopdt(tempo, entrada, saida, inicial=None, amplitude_degrau=None):
+    """Retorna (k, tau, theta) que minimizam o EQM sobre todo o registro.
+
+    inicial é um (k, tau, theta) de partida (padrão: estimativa_inicial).
+    """
+    tempo, saida, amplitude_degrau = _preparar(tempo, entrada, saida, amplitude_degrau)
+    if inicial is None:
+        inicial = estimativa_inicial(tempo, entrada, saida, amplitude_degrau)
+    k, tau, theta = inicial
+    duracao = tempo[-1] - tempo[0]
+    inicial = [k, max(tau, 1e-6*duracao), min(max(theta, 0.0), duracao)]
+    limites = ([-np.inf, 1e-9*duracao, 0.0], [np.inf, np.inf, duracao])
+    k, tau, theta = _minimizar(_residuos_fopdt, inicial, limites, tempo, saida, amplitude_degrau)
+    return float(k), float(tau), float(theta)
+
+
+def ajustar_sopdt(tempo, entrada, saida, inicial=None, amplitude_degrau=None):
+    """Retorna (k, tau1, tau2, theta) que minimizam o EQM sobre todo o registro.
+
+    inicial é um (k, tau1, tau2, theta); por padrão parte do FOPDT de
+    estimativa_inicial dividindo tau em 0.7*tau e 0.3*tau. Retorna tau1 >= tau2.
+    """
+    tempo, saida, amplitude_degrau = _preparar(tempo, entrada, saida, amplitude_degrau)
+    if inicial is None:
+        k, tau, theta = estimativa_inicial(tempo, entrada, saida, amplitude_degrau)
+        inicial = (k, 0.7*tau, 0.3*tau, theta)
+    k, tau1, tau2, theta = inicial
+    duracao = tempo[-1] - tempo[0]
+    inicial = [k, max(tau1, 1e-6*duracao), max(tau2, 1e-6*duracao), min(max(theta, 0.0), duracao)]
+    limites = ([-np.inf, 1e-9*duracao, 1e-9*duracao, 0.0], [np.inf, np.inf, np.inf, duracao])
+    k, tau1, tau2, theta = _minimizar(_residuos_sopdt, inicial, limites, tempo, saida, amplitude_degrau)
+    tau1, tau2 = max(tau1, tau2), min(tau1, tau2)
+    return float(k), float(tau1), float(tau2), float(theta)
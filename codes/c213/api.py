@@ -0,0 +1,65 @@
+"""API pública do pacote: identificação, sintonia e simulação de malha fechada.
+
+Scripts, interfaces e a linha de comando usam estas funções, de modo que o
+caminho crítico (identificação, regras de sintonia e simulação com atraso
+exato) fica num só lugar para ser otimizado e medido:
+
+    from c213 import identify_sundaresan, tune_chr, simulate_closed_loop, simulate_until_settled
+
+    k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+    kp, ti, td = tune_chr(k, tau, theta)
+    y, info = simulate_closed_loop(tempo, k, tau, theta, kp, ti, td)
+    t, y, info = simulate_until_settled(tempo, k, tau, theta, kp, ti, td)
+"""
+from c213.identificacao import identificar
+from c213.metricas import metricas_degrau
+from c213.simulacao import simular_ate_acomodar, simular_malha_fechada
+from c213.sintonia import sintonia_chr, sintonia_imc
+
+
+def identify_smith(tempo, entrada, saida, amplitude_degrau=None):
+    """(k, tau, theta) pelo método de Smith (28,3% e 63,2% do valor final).
+
+    amplitude_degrau padrão: média da entrada.
+    """
+    return identificar(tempo, entrada, saida, ['smith'], amplitude_degrau=amplitude_degrau)['smith']
+
+
+def identify_sundaresan(tempo, entrada, saida, amplitude_degrau=None):
+    """(k, tau, theta) pelo método de Sundaresan (35,3% e 85,3% do valor final).
+
+    amplitude_degrau padrão: média da entrada.
+    """
+    return identificar(tempo, entrada, saida, ['sundaresan'],
+                       amplitude_degrau=amplitude_degrau)['sundaresan']
+
+
+def tune_imc(k, tau, theta, lamb):
+    """(Kp, Ti, Td) pela regra IMC com constante de tempo de malha fechada lamb."""
+    return sintonia_imc(k, tau, theta, lamb)
+
+
+def tune_chr(k, tau, theta):
+    """(Kp, Ti, Td) pela regra CHR sem sobrevalor."""
+    return sintonia_chr(k, tau, theta)
+
+
+def simulate_closed_loop(tempo, k, tau, theta, kp, ti, td, setpoint=1.0):
+    """Resposta ao degrau de setpoint do PID com a planta FOPDT e suas métricas.
+
+    Simulação discreta com atraso exato (sem Padé) na grade de tempo dada.
+    Retorna (y, info), com info = metricas_degrau em relação ao setpoint.
+    """
+    y = simular_malha_fechada(tempo, k, tau, theta, kp, ti, td, setpoint)
+    return y, metricas_degrau(tempo, y, valor_final=setpoint)
+
+
+def simulate_until_settled(tempo, k, tau, theta, kp, ti, td, setpoint=1.0):
+    """Como simulate_closed_loop, numa grade estendida até a resposta acomodar.
+
+    A grade parte da do ensaio (mesmo dt) e dobra até a acomodação, com no
+    máximo HORIZONTE_MAXIMO vezes a duração do ensaio (c213.simulacao).
+    Retorna (t, y, info).
+    """
+    t, y = simular_ate_acomodar(tempo, k, tau, theta, kp, ti, td, setpoint)
+    return t, y, metricas_degrau(t, y, valor_final=setpoint)
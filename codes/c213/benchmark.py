@@ -0,0 +1,350 @@
+"""Benchmarks do caminho crítico, da leitura do ensaio à sintonia e aos gráficos.
+
+Cada caso roda sobre registros sintéticos de um degrau em planta FOPDT
+conhecida (com ruído), de 10^3 a 10^7 amostras; os casos mais caros param
+antes (limite de cada caso em CASOS). Cada medida guarda o mínimo e a
+mediana de várias repetições. As medianas são comparadas com a referência
+gravada no repositório (benchmark_referencia.json) e o comando falha se
+algum caso ficar mais lento que a tolerância. Medidas curtas demais
+(referência abaixo de DURACAO_MINIMA) são mostradas mas não comparadas,
+porque nelas o ruído da máquina passa da tolerância, e os casos que
+regridem são medidos de novo (até REMEDICOES rodadas) antes de falhar,
+valendo a mediana das rodadas:
+
+    python -m c213.benchmark                      # roda e compara com a referência
+    python -m c213.benchmark --max-amostras 100000 --casos simulacao_exata metricas
+    python -m c213.benchmark --atualizar-referencia
+
+A referência vale para a máquina em que foi gravada; em outra máquina,
+grave uma nova antes de comparar.
+"""
+import argparse
+import json
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from c213.dados import TAMANHO_BLOCO, ler_mat
+from c213.decimacao import SerieDecimada
+from c213.frequencia import grade_frequencias, margens_pid
+from c213.identificacao import IdentificacaoIncremental, identificar
+from c213.metricas import metricas_degrau
+from c213.preprocessamento import Preprocessamento
+from c213.recursiva import IdentificacaoRecursiva
+from c213.robustez import amostrar_plantas, avaliar_robustez
+from c213.simulacao import resposta_degrau_fopdt, simular_malha_fechada
+from c213.sintetico import gerar_registro, gravar
+from c213.sintonia import avaliar_pid_lote, sintonia_chr
+
+REFERENCIA = Path(__file__).with_name('benchmark_referencia.json')
+
+TAMANHOS = (10**3, 10**4, 10**5, 10**6, 10**7)
+
+# Planta dos registros sintéticos, em amostras (dt = 1 s): a dinâmica escala
+# com o tamanho para que o degrau acomode dentro de qualquer registro
+K_SINTETICO = 2.0
+TAU_RELATIVO = 0.1
+THETA_RELATIVO = 0.05
+AMPLITUDE_SINTETICA = 50.0
+RUIDO_SINTETICO = 0.01
+
+# Largura (pixels) dos eixos no caso decimacao
+COLUNAS_TELA = 800
+
+# Candidatos avaliados de uma vez nos casos sintonia_lote e margens_lote
+CANDIDATOS_LOTE = 64
+
+# Plantas sorteadas no caso robustez (em um processo, para a medida não depender dos núcleos)
+PLANTAS_ROBUSTEZ = 64
+
+# Tempo mínimo acumulado (s) e repetições mínimas/máximas por medida
+TEMPO_MINIMO = 0.2
+REPETICOES_MINIMAS = 5
+REPETICOES_MAXIMAS = 50
+
+# Folga relativa aceita em relação à referência antes de acusar regressão
+TOLERANCIA = 0.5
+
+# Medidas cuja mediana de referência fica abaixo disto (s) não são comparadas
+DURACAO_MINIMA = 0.005
+
+# Rodadas extras dos casos que regrediram antes de acusar a regressão
+REMEDICOES = 2
+
+
+def registro_sintetico(n, semente=0):
+    """(tempo, entrada, saida) de um degrau na planta sintética, com ruído."""
+    return gerar_registro(n, *_planta(n), amplitude=AMPLITUDE_SINTETICA,
+                          ruido=RUIDO_SINTETICO*K_SINTETICO*AMPLITUDE_SINTETICA, semente=semente)
+
+
+def _planta(n):
+    return K_SINTETICO, TAU_RELATIVO*n, THETA_RELATIVO*n
+
+
+# ---------------------------------------------------------------------------
+# Casos: cada um recebe o registro e devolve a função medida (sem argumentos)
+# ---------------------------------------------------------------------------
+
+def _caso_leitura_mat(registro, pasta):
+    n = len(registro[0])
+    caminho = Path(pasta) / f'sintetico_{n}.mat'
+    gravar(caminho, n, *_planta(n), formato='v5', amplitude=AMPLITUDE_SINTETICA,
+           ruido=RUIDO_SINTETICO*K_SINTETICO*AMPLITUDE_SINTETICA)
+    return lambda: ler_mat(caminho)
+
+
+def _caso_busca_limiares(registro, pasta):
+    return lambda: identificar(*registro)
+
+
+def _caso_preprocessamento(**opcoes):
+    def preparar(registro, pasta):
+        def medir():
+            # Em blocos, como em identificar_arquivo, e seguido da busca dos níveis
+            etapa = Preprocessamento(**opcoes)
+            acumulador = IdentificacaoIncremental()
+            n = len(registro[0])
+            blocos = (tuple(campo[i:i + TAMANHO_BLOCO] for campo in registro) for i in range(0, n, TAMANHO_BLOCO))
+            for bloco in etapa.blocos(blocos):
+                acumulador.atualizar(*bloco)
+            return acumulador.resultado(valor_final=etapa.valor_final)
+        return medir
+    return preparar
+
+
+def _caso_margens_lote(registro, pasta):
+    # n é o número de pontos da grade de frequências
+    n = len(registro[0])
+    k, tau, theta = _planta(n)
+    ganhos = _ganhos_lote(k, tau, theta)
+    w = grade_frequencias(tau, theta, n)
+    return lambda: margens_pid(k, tau, theta, ganhos, w)
+
+
+def _caso_decimacao(registro, pasta):
+    tempo, _, saida = registro
+
+    def medir():
+        # Curva nova (nível pré-decimado) e janelas de zoom, como no GraficoIncremental
+        serie = SerieDecimada(tempo, saida)
+        for fracao in (1.0, 0.1, 0.01):
+            serie.janela(tempo[0], tempo[0] + fracao * (tempo[-1] - tempo[0]), COLUNAS_TELA)
+    return medir
+
+
+def _caso_fopdt_aberta(registro, pasta):
+    tempo = registro[0]
+    return lambda: resposta_degrau_fopdt(tempo, *_planta(len(tempo)), AMPLITUDE_SINTETICA)
+
+
+def _caso_simulacao_exata(registro, pasta):
+    tempo = registro[0]
+    k, tau, theta = _planta(len(tempo))
+    ganhos = sintonia_chr(k, tau, theta)
+    return lambda: simular_malha_fechada(tempo, k, tau, theta, *ganhos)
+
+
+def _caso_simulacao_pade(registro, pasta):
+    import control as ctrl
+    from c213 import modelos
+
+    tempo = registro[0]
+    k, tau, theta = _planta(len(tempo))
+    ganhos = sintonia_chr(k, tau, theta)
+
+    def medir():
+        # Como em 9_interface: o modelo vem do cache e só a resposta é simulada
+        return ctrl.step_response(modelos.malha_pid(k, tau, theta, *ganhos), T=tempo)
+    return medir
+
+
+def _caso_metricas(registro, pasta):
+    # metricas_degrau substitui o ctrl.step_info (sem simular de novo)
+    tempo = registro[0]
+    k, tau, theta = _planta(len(tempo))
+    y = simular_malha_fechada(tempo, k, tau, theta, *sintonia_chr(k, tau, theta))
+    return lambda: metricas_degrau(tempo, y, valor_final=1.0)
+
+
+def _ganhos_lote(k, tau, theta):
+    # CANDIDATOS_LOTE variações do Kp da sintonia CHR
+    kp, ti, td = sintonia_chr(k, tau, theta)
+    fatores = np.geomspace(0.25, 4.0, CANDIDATOS_LOTE)
+    return np.column_stack((kp * fatores, np.full(CANDIDATOS_LOTE, ti), np.full(CANDIDATOS_LOTE, td)))
+
+
+def _caso_sintonia_lote(registro, pasta):
+    tempo = registro[0]
+    k, tau, theta = _planta(len(tempo))
+    ganhos = _ganhos_lote(k, tau, theta)
+    return lambda: avaliar_pid_lote(tempo, k, tau, theta, ganhos)
+
+
+def _caso_identificacao_recursiva(registro, pasta):
+    tempo = registro[0]
+    _, _, theta = _planta(len(tempo))
+
+    def medir():
+        # Em blocos, como no subcomando track
+        estimador = IdentificacaoRecursiva(2 * theta, dt=tempo[1] - tempo[0], esquecimento=1.0)
+        for i in range(0, len(tempo), TAMANHO_BLOCO):
+            estimador.atualizar(*(campo[i:i + TAMANHO_BLOCO] for campo in registro))
+        return estimador.resultado()
+    return medir
+
+
+def _caso_robustez(registro, pasta):
+    tempo = registro[0]
+    k, tau, theta = _planta(len(tempo))
+    ganhos = sintonia_chr(k, tau, theta)
+    plantas = amostrar_plantas(k, tau, theta, PLANTAS_ROBUSTEZ)
+    return lambda: avaliar_robustez(tempo, ganhos, *plantas)
+
+
+# Nome -> (preparação, maior registro medido)
+CASOS = {
+    'leitura_mat': (_caso_leitura_mat, 10**6),
+    'busca_limiares': (_caso_busca_limiares, 10**7),
+    'filtro_media': (_caso_preprocessamento(filtro='media'), 10**7),
+    'filtro_savgol': (_caso_preprocessamento(filtro='savgol'), 10**7),
+    'filtro_mediana': (_caso_preprocessamento(filtro='mediana'), 10**7),
+    'filtro_outliers': (_caso_preprocessamento(filtro='media', limite_outlier=4.0), 10**7),
+    'decimacao': (_caso_decimacao, 10**7),
+    'fopdt_aberta': (_caso_fopdt_aberta, 10**7),
+    'simulacao_exata': (_caso_simulacao_exata, 10**7),
+    'simulacao_pade': (_caso_simulacao_pade, 10**5),
+    'metricas': (_caso_metricas, 10**7),
+    'sintonia_lote': (_caso_sintonia_lote, 10**4),
+    'margens_lote': (_caso_margens_lote, 10**5),
+    'robustez': (_caso_robustez, 10**4),
+    'identificacao_recursiva': (_caso_identificacao_recursiva, 10**4),
+}
+
+
+def cronometrar(funcao):
+    """Mínimo e mediana (s) de repetições até somar TEMPO_MINIMO."""
+    tempos = []
+    while (len(tempos) < REPETICOES_MINIMAS or sum(tempos) < TEMPO_MINIMO) \
+            and len(tempos) < REPETICOES_MAXIMAS:
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {'minimo_s': min(tempos), 'mediana_s': float(np.median(tempos)), 'repeticoes': len(tempos)}
+
+
+def executar(casos=None, max_amostras=None, saida=sys.stdout):
+    """Roda os casos pedidos; retorna {caso: {n: medida}} com n como texto."""
+    casos = casos or list(CASOS)
+    resultados = {caso: {} for caso in casos}
+    with tempfile.TemporaryDirectory() as pasta:
+        for n in TAMANHOS:
+            pendentes = [c for c in casos if n <= CASOS[c][1] and (max_amostras is None or n <= max_amostras)]
+            if not pendentes:
+                continue
+            registro = registro_sintetico(n)
+            for caso in pendentes:
+                medida = cronometrar(CASOS[caso][0](registro, pasta))
+                resultados[caso][str(n)] = medida
+                if saida is not None:
+                    print(f'{caso:16s} n={n:>9,d}  {medida["mediana_s"]*1e3:10.3f} ms '
+                          f'(mediana de {medida["repeticoes"]} repetições)', file=saida)
+            del registro
+    return resultados
+
+
+def ambiente():
+    """Versões e máquina, gravadas junto com a referência."""
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'maquina': platform.machine(), 'sistema': platform.system(), 'processador': platform.processor()}
+
+
+def combinar(rodadas):
+    """Junta várias rodadas de executar: mediana das medianas de cada medida."""
+    juntas = {}
+    for rodada in rodadas:
+        for caso, medidas in rodada.items():
+            for n, medida in medidas.items():
+                juntas.setdefault(caso, {}).setdefault(n, []).append(medida)
+    return {caso: {n: {'minimo_s': min(m['minimo_s'] for m in lista),
+                       'mediana_s': float(np.median([m['mediana_s'] for m in lista])),
+                       'repeticoes': sum(m['repeticoes'] for m in lista)}
+                   for n, lista in medidas.items()}
+            for caso, medidas in juntas.items()}
+
+
+def comparar(resultados, referencia, tolerancia=TOLERANCIA, duracao_minima=DURACAO_MINIMA):
+    """Lista de (caso, n, atual_s, referencia_s) com mediana mais lenta que a tolerância.
+
+    Só entram as medidas com mediana de referência de pelo menos duracao_minima.
+    """
+    regressoes = []
+    for caso, medidas in resultados.items():
+        for n, medida in medidas.items():
+            anterior = referencia.get('resultados', {}).get(caso, {}).get(n)
+            if not anterior or anterior['mediana_s'] < duracao_minima:
+                continue
+            if medida['mediana_s'] > anterior['mediana_s'] * (1 + tolerancia):
+                regressoes.append((caso, n, medida['mediana_s'], anterior['mediana_s']))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks de identificação, simulação e sintonia.')
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS), help='casos medidos (padrão: todos)')
+    parser.add_argument('--max-amostras', type=float, help='maior registro medido (ex.: 1e5)')
+    parser.add_argument('--referencia', default=str(REFERENCIA), help='arquivo JSON de referência')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help='folga relativa antes de acusar regressão (padrão: %(default)s)')
+    parser.add_argument('--duracao-minima', type=float, default=DURACAO_MINIMA,
+                        help='medidas com referência abaixo disto (s) não são comparadas (padrão: %(default)s)')
+    parser.add_argument('--remedicoes', type=int, default=REMEDICOES,
+                        help='rodadas extras dos casos que regrediram (padrão: %(default)s)')
+    parser.add_argument('--salvar', help='grava os resultados neste JSON')
+    parser.add_argument('--atualizar-referencia', action='store_true',
+                        help='grava os resultados como nova referência em vez de comparar')
+    args = parser.parse_args(argv)
+
+    max_amostras = int(args.max_amostras) if args.max_amostras else None
+    resultados = executar(args.casos, max_amostras)
+    documento = {'ambiente': ambiente(), 'resultados': resultados}
+    if args.salvar:
+        Path(args.salvar).write_text(json.dumps(documento, indent=2) + '\n', encoding='utf-8')
+
+    referencia = Path(args.referencia)
+    if args.atualizar_referencia:
+        if referencia.exists():
+            # Preserva os casos/tamanhos não medidos nesta execução
+            anterior = json.loads(referencia.read_text(encoding='utf-8'))['resultados']
+            for caso, medidas in resultados.items():
+                anterior.setdefault(caso, {}).update(medidas)
+            documento['resultados'] = anterior
+        referencia.write_text(json.dumps(documento, indent=2) + '\n', encoding='utf-8')
+        print(f'Referência gravada em {referencia}')
+        return
+    if not referencia.exists():
+        print(f'Sem referência em {referencia}; use --atualizar-referencia para criá-la.')
+        return
+
+    referencia = json.loads(referencia.read_text(encoding='utf-8'))
+    rodadas = [resultados]
+    regressoes = comparar(resultados, referencia, args.tolerancia, args.duracao_minima)
+    while regressoes and len(rodadas) <= args.remedicoes:
+        # Lentidão passageira da máquina não se repete em todas as rodadas
+        casos = sorted({caso for caso, *_ in regressoes})
+        print(f'Medindo de novo: {", ".join(casos)}')
+        rodadas.append(executar(casos, max_amostras, saida=None))
+        regressoes = comparar(combinar(rodadas), referencia, args.tolerancia, args.duracao_minima)
+    for caso, n, atual, anterior in regressoes:
+        print(f'REGRESSÃO {caso} n={n}: {atual*1e3:.3f} ms (referência {anterior*1e3:.3f} ms)')
+    if regressoes:
+        sys.exit(1)
+    print(f'Sem regressões (tolerância {args.tolerancia:.0%}, medidas a partir de {args.duracao_minima*1e3:g} ms).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,427 @@
+"""Linha de comando sem interface gráfica, com saída em JSON.
+
+Não importa PyQt5 nem matplotlib, então roda em servidores sem display
+(tarefas noturnas, cron, CI). Subcomandos:
+
+    python -m c213 identify Dataset_Grupo9.mat
+    python -m c213 tune Dataset_Grupo9.mat --metodo sundaresan --regras imc chr otimo
+    python -m c213 simulate Dataset_Grupo9.mat --kp 0.4 --ti 8000 --td 1400
+    python -m c213 compare Dataset_Grupo9.mat -o comparacao.json
+    python -m c213 robust Dataset_Grupo9.mat --regras imc chr --amostras 5000
+    python -m c213 track Dataset_Grupo9.mat --theta-max 5000 --esquecimento 1
+    python -m c213 run Dataset_Grupo9.mat --regra chr --escala 1000 --u-min 0 --u-max 0.5
+
+O resultado vai para a saída padrão (ou para o arquivo de -o/--saida).
+Valores não definidos (NaN, ex.: sistema que não acomoda) viram null.
+"""
+import argparse
+import json
+import math
+import sys
+
+import numpy as np
+
+from c213.ajuste import ajustar_fopdt, ajustar_sopdt, eqm
+from c213.dados import ler_blocos, ler_registro
+from c213.frequencia import margens_pid
+from c213.identificacao import METODOS, identificar
+from c213.lote import LAMBDA_RELATIVO_PADRAO
+from c213.metricas import metricas_degrau
+from c213.preprocessamento import FILTROS, JANELA_FINAL, JANELA_PADRAO, preprocessar
+from c213.recursiva import ATRASOS_PADRAO, ESQUECIMENTO_PADRAO, IdentificacaoRecursiva
+from c213.robustez import (AMOSTRAS_PADRAO, DISTRIBUICOES, VARIACAO_PADRAO, amostrar_plantas,
+                           avaliar_robustez, resumir, variacao_entre_metodos)
+from c213.simulacao import (malha_fechada_unitaria, resposta_degrau_fopdt, resposta_degrau_sopdt,
+                            simular_ate_acomodar, simular_malha_fechada)
+from c213.sintonia import CUSTOS, otimizar_pid, sintonia_chr, sintonia_imc
+from c213.tempo_real import SUBPASSOS_PLANTA, executar_planta_simulada
+
+# Métodos de identificação de primeira ordem aceitos por --metodo
+METODOS_FOPDT = tuple(sorted(METODOS)) + ('minimos_quadrados',)
+
+REGRAS = ('imc', 'chr', 'otimo')
+
+
+def _json(valor):
+    # Converte tipos do numpy e troca NaN/inf por null (JSON estrito)
+    if isinstance(valor, dict):
+        return {str(chave): _json(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_json(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        return _json(valor.tolist())
+    if isinstance(valor, (np.integer, int)) and not isinstance(valor, bool):
+        return int(valor)
+    if isinstance(valor, (np.floating, float)):
+        valor = float(valor)
+        return valor if math.isfinite(valor) else None
+    return valor
+
+
+def _carregar(caminho):
+    tempo, entrada, saida = ler_registro(caminho)
+    return tempo, entrada, saida, float(np.mean(entrada))
+
+
+def _preprocessar(args, tempo, entrada, saida):
+    # (saida_filtrada, valor_final) para os métodos de dois pontos, ou None sem --filtro/--outliers
+    if args.filtro is None and args.outliers is None:
+        return None
+    return preprocessar(tempo, entrada, saida, filtro=args.filtro, janela=args.janela,
+                        limite_outlier=args.outliers, janela_final=args.janela_final)
+
+
+def _modelo(tempo, entrada, saida, amplitude, metodo, preprocessado=None):
+    if metodo == 'minimos_quadrados':
+        return ajustar_fopdt(tempo, entrada, saida, amplitude_degrau=amplitude)
+    valor_final = None
+    if preprocessado is not None:
+        saida, valor_final = preprocessado
+    return identificar(tempo, entrada, saida, [metodo], amplitude_degrau=amplitude,
+                       valor_final=valor_final)[metodo]
+
+
+def _planta(metodo, k, tau, theta):
+    return {'metodo': metodo, 'k': k, 'tau': tau, 'theta': theta}
+
+
+def _lambda_imc(args, theta):
+    return args.lambda_imc if args.lambda_imc is not None else args.lambda_relativo * theta
+
+
+def _malha_pid(tempo, k, tau, theta, kp, ti, td, setpoint=1.0):
+    # Métricas numa grade estendida até a resposta acomodar (mesma política da interface)
+    t, y = simular_ate_acomodar(tempo, k, tau, theta, kp, ti, td, setpoint)
+    resultado = {'Kp': kp, 'Ti': ti, 'Td': td}
+    resultado.update(metricas_degrau(t, y, valor_final=setpoint, referencia=setpoint))
+    resultado['margens'] = margens_pid(k, tau, theta, (kp, ti, td))
+    return resultado, t, y
+
+
+# ---------------------------------------------------------------------------
+# Subcomandos
+# ---------------------------------------------------------------------------
+
+def identify(args):
+    """Parâmetros de cada método de identificação e o EQM de cada modelo."""
+    tempo, entrada, saida, amplitude = _carregar(args.arquivo)
+    preprocessado = _preprocessar(args, tempo, entrada, saida)
+    modelos = {}
+    for metodo in args.metodos:
+        if metodo == 'sopdt':
+            k, tau1, tau2, theta = ajustar_sopdt(tempo, entrada, saida, amplitude_degrau=amplitude)
+            resposta = resposta_degrau_sopdt(tempo, k, tau1, tau2, theta, amplitude)
+            modelos[metodo] = {'k': k, 'tau1': tau1, 'tau2': tau2, 'theta': theta}
+        else:
+            k, tau, theta = _modelo(tempo, entrada, saida, amplitude, metodo, preprocessado)
+            resposta = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude)
+            modelos[metodo] = {'k': k, 'tau': tau, 'theta': theta}
+        modelos[metodo]['EQM'] = eqm(saida, resposta)
+    return {'arquivo': str(args.arquivo), 'amostras': len(tempo), 'amplitude': amplitude,
+            'modelos': modelos}
+
+
+def tune(args):
+    """Ganhos, métricas de malha fechada e margens de estabilidade de cada regra de sintonia."""
+    tempo, entrada, saida, amplitude = _carregar(args.arquivo)
+    k, tau, theta = _modelo(tempo, entrada, saida, amplitude, args.metodo,
+                            _preprocessar(args, tempo, entrada, saida))
+    sintonias = {}
+    for regra in args.regras:
+        if regra == 'imc':
+            lamb = _lambda_imc(args, theta)
+            sintonias[regra], _, _ = _malha_pid(tempo, k, tau, theta, *sintonia_imc(k, tau, theta, lamb))
+            sintonias[regra]['Lambda'] = lamb
+        elif regra == 'chr':
+            sintonias[regra], _, _ = _malha_pid(tempo, k, tau, theta, *sintonia_chr(k, tau, theta))
+        else:
+            otimo = otimizar_pid(tempo, k, tau, theta, args.custo, args.sobressinal_max,
+                                 args.acomodacao_max, semente=args.semente, processos=args.processos)
+            # O custo é o da janela do ensaio; as métricas seguem o horizonte das outras regras
+            ganhos = [otimo[nome] for nome in ('Kp', 'Ti', 'Td')]
+            sintonias[regra], _, _ = _malha_pid(tempo, k, tau, theta, *ganhos)
+            sintonias[regra]['Custo'] = otimo['Custo']
+    return {'arquivo': str(args.arquivo), 'planta': _planta(args.metodo, k, tau, theta),
+            'sintonias': sintonias}
+
+
+def simulate(args):
+    """Métricas da malha fechada com os ganhos dados (e a curva, se pedida)."""
+    tempo, entrada, saida, amplitude = _carregar(args.arquivo)
+    k, tau, theta = _modelo(tempo, entrada, saida, amplitude, args.metodo,
+                            _preprocessar(args, tempo, entrada, saida))
+    resultado, t, y = _malha_pid(tempo, k, tau, theta, args.kp, args.ti, args.td, args.setpoint)
+    resultado['Setpoint'] = args.setpoint
+    saida_json = {'arquivo': str(args.arquivo), 'planta': _planta(args.metodo, k, tau, theta),
+                  'malha_fechada': resultado}
+    if args.curva:
+        np.savetxt(args.curva, np.column_stack((t, y)), delimiter=',',
+                   header='tempo,saida', comments='')
+        saida_json['curva'] = str(args.curva)
+    return saida_json
+
+
+def compare(args):
+    """Compara os métodos: modelo em malha aberta e fechada, EQM e métricas.
+
+    "fechada" é a realimentação unitária do modelo, como nos scripts de
+    comparação (5_comparacao_smith.py, 6_comparacao_sundaresan.py).
+    """
+    tempo, entrada, saida, amplitude = _carregar(args.arquivo)
+    preprocessado = _preprocessar(args, tempo, entrada, saida)
+    metodos = {}
+    for metodo in args.metodos:
+        k, tau, theta = _modelo(tempo, entrada, saida, amplitude, metodo, preprocessado)
+        aberta = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude)
+        k_f, tau_f = malha_fechada_unitaria(k, tau)
+        fechada = resposta_degrau_fopdt(tempo, k_f, tau_f, theta, amplitude)
+        metodos[metodo] = {
+            'k': k, 'tau': tau, 'theta': theta, 'EQM': eqm(saida, aberta),
+            'aberta': metricas_degrau(tempo, aberta / amplitude, valor_final=k),
+            'fechada': metricas_degrau(tempo, fechada / amplitude, valor_final=k_f),
+        }
+    melhor = min(metodos, key=lambda m: metodos[m]['EQM'])
+    return {'arquivo': str(args.arquivo), 'amplitude': amplitude, 'metodos': metodos, 'melhor': melhor}
+
+
+def robust(args):
+    """Distribuições de sobressinal e acomodação das sintonias IMC/CHR sob perturbações da planta.
+
+    Os ganhos saem da planta identificada; cada sintonia é simulada contra
+    as mesmas plantas sorteadas em torno dela (a primeira é a nominal).
+    """
+    tempo, entrada, saida, amplitude = _carregar(args.arquivo)
+    preprocessado = _preprocessar(args, tempo, entrada, saida)
+    k, tau, theta = _modelo(tempo, entrada, saida, amplitude, args.metodo, preprocessado)
+    if args.variacao_metodos:
+        variacao = variacao_entre_metodos({metodo: _modelo(tempo, entrada, saida, amplitude, metodo, preprocessado)
+                                           for metodo in METODOS_FOPDT})
+    else:
+        variacao = tuple(args.variacao)
+    plantas = amostrar_plantas(k, tau, theta, args.amostras, variacao, args.distribuicao, args.semente)
+    sintonias = {}
+    for regra in args.regras:
+        if regra == 'imc':
+            lamb = _lambda_imc(args, theta)
+            ganhos = sintonia_imc(k, tau, theta, lamb)
+        else:
+            ganhos = sintonia_chr(k, tau, theta)
+        # Todas as plantas no horizonte em que a nominal acomoda
+        t, _ = simular_ate_acomodar(tempo, k, tau, theta, *ganhos, args.setpoint)
+        metricas = avaliar_robustez(t, ganhos, *plantas, setpoint=args.setpoint, processos=args.processos)
+        sintonias[regra] = {'Kp': ganhos[0], 'Ti': ganhos[1], 'Td': ganhos[2]}
+        if regra == 'imc':
+            sintonias[regra]['Lambda'] = lamb
+        sintonias[regra].update(resumir(metricas, *plantas))
+    return {'arquivo': str(args.arquivo), 'planta': _planta(args.metodo, k, tau, theta),
+            'perturbacao': {'amostras': args.amostras, 'distribuicao': args.distribuicao,
+                            'variacao': dict(zip(('k', 'tau', 'theta'), variacao)), 'semente': args.semente},
+            'sintonias': sintonias}
+
+
+def track(args):
+    """Identificação recursiva lendo o registro em blocos: estimativas ao longo do tempo.
+
+    Os ganhos IMC/CHR saem da última estimativa, sem recarregar o arquivo.
+    """
+    estimador = IdentificacaoRecursiva(args.theta_max, esquecimento=args.esquecimento,
+                                       atrasos=args.atrasos, theta_min=args.theta_min,
+                                       decimacao=args.decimacao)
+    estimativas = []
+    for tempo, entrada, saida in ler_blocos(args.arquivo, args.intervalo):
+        estimador.atualizar(tempo, entrada, saida)
+        if estimador.n >= 2:
+            k, tau, theta = estimador.resultado()
+            estimativas.append({'t': float(tempo[-1]), 'k': k, 'tau': tau, 'theta': theta})
+    if not estimativas:
+        raise ValueError('O registro tem menos de duas amostras.')
+    k, tau, theta = (estimativas[-1][nome] for nome in ('k', 'tau', 'theta'))
+    sintonias = {}
+    if all(math.isfinite(v) for v in (k, tau, theta)):
+        lamb = _lambda_imc(args, theta)
+        sintonias['imc'] = dict(zip(('Kp', 'Ti', 'Td'), sintonia_imc(k, tau, theta, lamb)), Lambda=lamb)
+        sintonias['chr'] = dict(zip(('Kp', 'Ti', 'Td'), sintonia_chr(k, tau, theta)))
+    return {'arquivo': str(args.arquivo), 'amostras': estimador.n * estimador.decimacao,
+            'planta': _planta('recursivo', k, tau, theta),
+            'estimativas': estimativas, 'sintonias': sintonias}
+
+
+def run(args):
+    """Executa o PID em tempo real contra a planta identificada, simulada em outro processo.
+
+    "execucao" traz as métricas da resposta medida no laço de tempo real e
+    "simulacao" as da simulação discreta com os mesmos ganhos (sem
+    saturação), para comparação; "instrumentacao" traz os histogramas de
+    jitter, latência e cálculo (em s de relógio) e os prazos perdidos.
+    """
+    tempo, entrada, saida, amplitude = _carregar(args.arquivo)
+    k, tau, theta = _modelo(tempo, entrada, saida, amplitude, args.metodo,
+                            _preprocessar(args, tempo, entrada, saida))
+    if args.regra == 'imc':
+        ganhos = sintonia_imc(k, tau, theta, _lambda_imc(args, theta))
+    else:
+        ganhos = sintonia_chr(k, tau, theta)
+    dt = args.periodo if args.periodo is not None else float(tempo[1] - tempo[0])
+    duracao = args.duracao if args.duracao is not None else float(tempo[-1] - tempo[0])
+    periodos = int(duracao // dt) + 1
+    t_execucao, y, u, instrumentacao = executar_planta_simulada(
+        k, tau, theta, ganhos, dt, periodos, args.escala, args.setpoint, args.u_min, args.u_max, args.subpassos)
+    t_simulacao = np.arange(periodos) * dt
+    y_simulacao = simular_malha_fechada(t_simulacao, k, tau, theta, *ganhos, args.setpoint)
+    resultado = {
+        'arquivo': str(args.arquivo), 'planta': _planta(args.metodo, k, tau, theta),
+        'controlador': {'regra': args.regra, 'Kp': ganhos[0], 'Ti': ganhos[1], 'Td': ganhos[2],
+                        'periodo': dt, 'periodo_relogio': dt / args.escala, 'u_min': args.u_min,
+                        'u_max': args.u_max, 'Setpoint': args.setpoint},
+        'execucao': metricas_degrau(t_execucao, y, valor_final=args.setpoint, referencia=args.setpoint),
+        'simulacao': metricas_degrau(t_simulacao, y_simulacao, valor_final=args.setpoint, referencia=args.setpoint),
+        'instrumentacao': instrumentacao,
+    }
+    if args.curva:
+        np.savetxt(args.curva, np.column_stack((t_execucao, y, u)), delimiter=',',
+                   header='tempo,saida,controle', comments='')
+        resultado['curva'] = str(args.curva)
+    return resultado
+
+
+# ---------------------------------------------------------------------------
+# Linha de comando
+# ---------------------------------------------------------------------------
+
+def _argumentos_planta(parser):
+    parser.add_argument('arquivo', help='registro (.mat, .mat v7.3, .csv ou .npy)')
+    parser.add_argument('--metodo', choices=METODOS_FOPDT, default='sundaresan',
+                        help='identificação da planta FOPDT (padrão: %(default)s)')
+    _argumentos_preprocessamento(parser)
+
+
+def _argumentos_preprocessamento(parser):
+    grupo = parser.add_argument_group('pré-processamento (métodos de dois pontos)')
+    grupo.add_argument('--filtro', choices=FILTROS, help='filtra a saída antes da busca dos níveis')
+    grupo.add_argument('--janela', type=int, default=JANELA_PADRAO,
+                       help='amostras da janela do filtro (padrão: %(default)s)')
+    grupo.add_argument('--outliers', type=float, metavar='LIMITE',
+                       help='troca pela mediana móvel as amostras a mais de LIMITE desvios dela')
+    grupo.add_argument('--janela-final', type=int, default=JANELA_FINAL,
+                       help='amostras finais cuja mediana é o valor final (padrão: %(default)s)')
+
+
+def _argumentos_lambda(parser):
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--lambda-imc', type=float, help='lambda do IMC em segundos')
+    grupo.add_argument('--lambda-relativo', type=float, default=LAMBDA_RELATIVO_PADRAO,
+                       help='lambda do IMC como múltiplo de theta (padrão: %(default)s)')
+
+
+def criar_parser():
+    # Opções de saída aceitas por todos os subcomandos (antes ou depois do arquivo)
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument('-o', '--saida', help='grava o JSON neste arquivo em vez da saída padrão')
+    comum.add_argument('--indentar', type=int, default=2, help='indentação do JSON (0 = uma linha)')
+
+    parser = argparse.ArgumentParser(prog='python -m c213',
+                                     description='Identificação e sintonia sem interface gráfica (saída JSON).')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p = comandos.add_parser('identify', help='identifica os modelos do ensaio', parents=[comum])
+    p.add_argument('arquivo', help='registro (.mat, .mat v7.3, .csv ou .npy)')
+    p.add_argument('--metodos', nargs='+', choices=METODOS_FOPDT + ('sopdt',),
+                   default=list(METODOS_FOPDT + ('sopdt',)))
+    _argumentos_preprocessamento(p)
+    p.set_defaults(funcao=identify)
+
+    p = comandos.add_parser('tune', help='sintoniza o PID (IMC, CHR e/ou otimizado)', parents=[comum])
+    _argumentos_planta(p)
+    p.add_argument('--regras', nargs='+', choices=REGRAS, default=['imc', 'chr'])
+    _argumentos_lambda(p)
+    p.add_argument('--custo', choices=CUSTOS, default='ITAE', help='custo da sintonia otimizada')
+    p.add_argument('--sobressinal-max', type=float, help='sobressinal máximo (%%) da sintonia otimizada')
+    p.add_argument('--acomodacao-max', type=float, help='tempo de acomodação máximo (s)')
+    p.add_argument('--processos', type=int, help='processos para avaliar os candidatos')
+    p.add_argument('--semente', type=int, default=0)
+    p.set_defaults(funcao=tune)
+
+    p = comandos.add_parser('simulate', help='simula a malha fechada com ganhos dados', parents=[comum])
+    _argumentos_planta(p)
+    p.add_argument('--kp', type=float, required=True)
+    p.add_argument('--ti', type=float, required=True, help='tempo integral (s)')
+    p.add_argument('--td', type=float, default=0.0, help='tempo derivativo (s)')
+    p.add_argument('--setpoint', type=float, default=1.0)
+    p.add_argument('--curva', help='grava tempo e saída simulada neste CSV')
+    p.set_defaults(funcao=simulate)
+
+    p = comandos.add_parser('compare', help='compara os métodos de identificação', parents=[comum])
+    p.add_argument('arquivo', help='registro (.mat, .mat v7.3, .csv ou .npy)')
+    p.add_argument('--metodos', nargs='+', choices=METODOS_FOPDT, default=list(METODOS_FOPDT))
+    _argumentos_preprocessamento(p)
+    p.set_defaults(funcao=compare)
+
+    p = comandos.add_parser('robust', help='robustez das sintonias IMC/CHR (Monte Carlo)', parents=[comum])
+    _argumentos_planta(p)
+    p.add_argument('--regras', nargs='+', choices=REGRAS[:2], default=['imc', 'chr'])
+    _argumentos_lambda(p)
+    p.add_argument('--amostras', type=int, default=AMOSTRAS_PADRAO,
+                   help='plantas sorteadas (padrão: %(default)s)')
+    grupo = p.add_mutually_exclusive_group()
+    grupo.add_argument('--variacao', type=float, nargs=3, default=VARIACAO_PADRAO, metavar=('K', 'TAU', 'THETA'),
+                       help='variação relativa de cada parâmetro (padrão: %(default)s)')
+    grupo.add_argument('--variacao-metodos', action='store_true',
+                       help='usa como variação a dispersão entre os métodos de identificação')
+    p.add_argument('--distribuicao', choices=DISTRIBUICOES, default='uniforme')
+    p.add_argument('--setpoint', type=float, default=1.0)
+    p.add_argument('--processos', type=int, help='processos para simular os lotes de plantas')
+    p.add_argument('--semente', type=int, default=0)
+    p.set_defaults(funcao=robust)
+
+    p = comandos.add_parser('track', help='identificação recursiva (RLS) lendo o registro em blocos',
+                            parents=[comum])
+    p.add_argument('arquivo', help='registro (.mat, .mat v7.3, .csv ou .npy)')
+    p.add_argument('--theta-max', type=float, required=True, help='maior atraso procurado (s)')
+    p.add_argument('--theta-min', type=float, help='menor atraso procurado (s; padrão: uma amostra)')
+    p.add_argument('--esquecimento', type=float, default=ESQUECIMENTO_PADRAO,
+                   help='fator de esquecimento (1 = sem esquecimento; padrão: %(default)s)')
+    p.add_argument('--atrasos', type=int, default=ATRASOS_PADRAO,
+                   help='atrasos candidatos entre theta-min e theta-max (padrão: %(default)s)')
+    p.add_argument('--decimacao', type=int, default=1,
+                   help='amostras cuja média forma cada passo do estimador (reduz o viés do ruído)')
+    p.add_argument('--intervalo', type=int, default=1000,
+                   help='amostras entre duas estimativas registradas (padrão: %(default)s)')
+    _argumentos_lambda(p)
+    p.set_defaults(funcao=track)
+
+    p = comandos.add_parser('run', help='executa o PID em tempo real contra a planta simulada',
+                            parents=[comum])
+    _argumentos_planta(p)
+    p.add_argument('--regra', choices=REGRAS[:2], default='chr')
+    _argumentos_lambda(p)
+    p.add_argument('--periodo', type=float, help='período de controle em s de planta (padrão: o do registro)')
+    p.add_argument('--duracao', type=float, help='duração em s de planta (padrão: a do registro)')
+    p.add_argument('--escala', type=float, default=1000.0,
+                   help='segundos de planta por segundo de relógio (padrão: %(default)s)')
+    p.add_argument('--setpoint', type=float, default=1.0)
+    p.add_argument('--u-min', type=float, help='saturação inferior do controle (com anti-windup)')
+    p.add_argument('--u-max', type=float, help='saturação superior do controle (com anti-windup)')
+    p.add_argument('--subpassos', type=int, default=SUBPASSOS_PLANTA,
+                   help='passos de integração da planta por período (padrão: %(default)s)')
+    p.add_argument('--curva', help='grava tempo, saída e controle medidos neste CSV')
+    p.set_defaults(funcao=run)
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    try:
+        resultado = args.funcao(args)
+    except (FileNotFoundError, KeyError, ValueError) as erro:
+        parser.exit(1, f'{parser.prog} {args.comando}: erro: {erro}\n')
+    texto = json.dumps(_json(resultado), indent=args.indentar or None, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+    else:
+        sys.stdout.write(texto + '\n')
+
+
+if __name__ == '__main__':
+    main()
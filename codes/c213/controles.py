@@ -0,0 +1,84 @@
+"""Controles de parâmetros para ajuste ao vivo na interface.
+
+ControleParametro junta um QSlider e um QDoubleSpinBox sincronizados. O
+slider percorre uma faixa logarítmica em torno de um valor de referência
+(útil para ganhos e constantes de tempo, que variam em ordens de grandeza);
+o spinbox aceita qualquer valor não negativo digitado.
+"""
+import math
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import QAbstractSpinBox, QDoubleSpinBox, QHBoxLayout, QLabel, QSlider, QWidget
+
+# Resolução do slider (posições inteiras entre 0 e PASSOS_SLIDER)
+PASSOS_SLIDER = 1000
+
+# Faixa padrão do slider: de referência/FATOR_FAIXA até referência*FATOR_FAIXA
+FATOR_FAIXA = 10.0
+
+
+class ControleParametro(QWidget):
+    """Rótulo + slider (escala log) + spinbox para um parâmetro.
+
+    Sinais: valorMudou(float) a cada mudança feita pelo usuário,
+    arrastando(bool) quando o slider é pressionado/solto.
+    """
+
+    valorMudou = pyqtSignal(float)
+    arrastando = pyqtSignal(bool)
+
+    def __init__(self, rotulo, sufixo='', decimais=4, parent=None):
+        super().__init__(parent)
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, PASSOS_SLIDER)
+        self.spin = QDoubleSpinBox()
+        self.spin.setRange(0.0, 1e9)
+        self.spin.setDecimals(decimais)
+        self.spin.setSuffix(sufixo)
+        self.spin.setStepType(QAbstractSpinBox.AdaptiveDecimalStepType)
+        # Sem rastreamento do teclado: só aplica o número depois de digitado
+        self.spin.setKeyboardTracking(False)
+        self.spin.setMinimumWidth(110)
+        self._minimo = 1.0
+        self._maximo = 1.0
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        rotulo = QLabel(rotulo)
+        rotulo.setMinimumWidth(70)
+        layout.addWidget(rotulo)
+        layout.addWidget(self.slider, 1)
+        layout.addWidget(self.spin)
+
+        self.slider.valueChanged.connect(self._slider_mudou)
+        self.spin.valueChanged.connect(self._spin_mudou)
+        self.slider.sliderPressed.connect(lambda: self.arrastando.emit(True))
+        self.slider.sliderReleased.connect(lambda: self.arrastando.emit(False))
+
+    def valor(self):
+        return self.spin.value()
+
+    def definir(self, valor, fator=FATOR_FAIXA):
+        """Põe o valor e centra a faixa do slider nele, sem emitir valorMudou."""
+        referencia = abs(valor) or 1.0
+        self._minimo, self._maximo = referencia / fator, referencia * fator
+        self.spin.blockSignals(True)
+        self.spin.setValue(valor)
+        self.spin.blockSignals(False)
+        self._posicionar(valor)
+
+    def _posicionar(self, valor):
+        # Valores fora da faixa deixam o slider no extremo correspondente
+        fracao = math.log(max(valor, self._minimo) / self._minimo) / math.log(self._maximo / self._minimo)
+        self.slider.blockSignals(True)
+        self.slider.setValue(round(min(fracao, 1.0) * PASSOS_SLIDER))
+        self.slider.blockSignals(False)
+
+    def _slider_mudou(self, posicao):
+        valor = self._minimo * (self._maximo / self._minimo) ** (posicao / PASSOS_SLIDER)
+        self.spin.setValue(valor)  # emite valorMudou por _spin_mudou
+
+    def _spin_mudou(self, valor):
+        if not self.slider.isSliderDown():
+            self._posicionar(valor)
+        self.valorMudou.emit(valor)
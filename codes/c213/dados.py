@@ -0,0 +1,227 @@
+"""Carregamento do dataset reactionExperiment (.mat) com cache compartilhado.
+
+Também oferece leitura em blocos (.mat v7.3/HDF5, CSV e .npy mapeado em
+memória) para registros longos que não cabem inteiros na RAM.
+"""
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+import threading
+
+import numpy as np
+
+# Quantidade máxima de arquivos mantidos em memória (descarte LRU)
+MAX_ARQUIVOS_CACHE = 4
+
+_cache = OrderedDict()
+_trava = threading.Lock()
+
+
+def _resolver_caminho(caminho):
+    # io.loadmat aceita o nome sem extensão ('Dataset_Grupo9'), então fazemos o mesmo
+    caminho = Path(caminho)
+    if not caminho.exists() and caminho.suffix != '.mat':
+        caminho = caminho.with_suffix('.mat')
+    return caminho.resolve()
+
+
+def _vetor(valores):
+    # Vetor 1D contíguo em float64, somente leitura (é compartilhado entre as abas)
+    vetor = np.ascontiguousarray(np.ravel(valores), dtype=np.float64)
+    vetor.setflags(write=False)
+    return vetor
+
+
+def ler_mat(caminho):
+    """Lê sampleTime, dataInput e dataOutput de um .mat, sem usar o cache."""
+    from scipy import io  # importado só na primeira leitura (a interface abre sem o SciPy)
+
+    arquivoDados = io.loadmat(str(caminho), variable_names=['reactionExperiment'])
+    valores_strct = arquivoDados['reactionExperiment'][0, 0]
+    tempo = _vetor(valores_strct['sampleTime'])
+    entrada = _vetor(valores_strct['dataInput'])
+    saida = _vetor(valores_strct['dataOutput'])
+    return tempo, entrada, saida
+
+
+def carregar_dataset(caminho):
+    """Retorna (tempo, entrada, saida) do arquivo, decodificando-o só uma vez.
+
+    O cache é indexado por caminho + mtime + tamanho, então um arquivo
+    sobrescrito em disco é relido automaticamente.
+    """
+    caminho = _resolver_caminho(caminho)
+    info = caminho.stat()
+    chave = (str(caminho), info.st_mtime_ns, info.st_size)
+    with _trava:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            return _cache[chave]
+
+    dados = ler_mat(caminho)
+
+    with _trava:
+        # Remove versões antigas do mesmo arquivo antes de inserir a nova
+        for antiga in [c for c in _cache if c[0] == chave[0]]:
+            del _cache[antiga]
+        _cache[chave] = dados
+        while len(_cache) > MAX_ARQUIVOS_CACHE:
+            _cache.popitem(last=False)
+    return dados
+
+
+def limpar_cache():
+    """Esvazia o cache de datasets."""
+    with _trava:
+        _cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Leitura em blocos
+# ---------------------------------------------------------------------------
+
+# Amostras por bloco na leitura em streaming
+TAMANHO_BLOCO = 1_000_000
+
+CAMPOS = ('sampleTime', 'dataInput', 'dataOutput')
+
+# Nomes de coluna aceitos no cabeçalho de arquivos CSV
+_COLUNAS_CSV = {
+    'sampletime': 0, 'tempo': 0, 't': 0,
+    'datainput': 1, 'entrada': 1, 'u': 1,
+    'dataoutput': 2, 'saida': 2, 'y': 2,
+}
+
+
+def eh_hdf5(caminho):
+    """Indica se o arquivo é um .mat v7.3 (HDF5)."""
+    with open(caminho, 'rb') as arquivo:
+        # Arquivos v7.3 têm o cabeçalho MATLAB de 512 bytes seguido da assinatura HDF5
+        arquivo.seek(512)
+        return arquivo.read(8) == b'\x89HDF\r\n\x1a\n'
+
+
+def _importar_h5py():
+    try:
+        import h5py
+    except ImportError as erro:
+        raise ImportError('A leitura de .mat v7.3 (HDF5) requer o pacote h5py.') from erro
+    return h5py
+
+
+def _fatia_hdf5(dataset, inicio, fim):
+    # O MATLAB grava vetores 1xN como (N, 1) ou (1, N) no HDF5
+    if dataset.ndim == 2 and dataset.shape[0] == 1:
+        return dataset[0, inicio:fim]
+    if dataset.ndim == 2:
+        return dataset[inicio:fim, 0]
+    return dataset[inicio:fim]
+
+
+def _blocos_hdf5(caminho, tamanho_bloco):
+    h5py = _importar_h5py()
+    with h5py.File(caminho, 'r') as arquivo:
+        grupo = arquivo['reactionExperiment']
+        campos = [grupo[nome] for nome in CAMPOS]
+        n = max(campos[0].shape)
+        for inicio in range(0, n, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, n)
+            yield tuple(np.asarray(_fatia_hdf5(ds, inicio, fim), dtype=np.float64) for ds in campos)
+
+
+def _blocos_csv(caminho, tamanho_bloco, delimitador):
+    with open(caminho, encoding='utf-8') as arquivo:
+        primeira = arquivo.readline()
+        nomes = [p.strip().strip('"').lower() for p in primeira.split(delimitador)]
+        colunas = [0, 1, 2]
+        if any(nome in _COLUNAS_CSV for nome in nomes):
+            # Primeira linha é cabeçalho: localiza as colunas pelo nome
+            for i, nome in enumerate(nomes):
+                if nome in _COLUNAS_CSV:
+                    colunas[_COLUNAS_CSV[nome]] = i
+            pendentes = []
+        else:
+            pendentes = [primeira]
+        while True:
+            linhas = pendentes + list(islice(arquivo, tamanho_bloco - len(pendentes)))
+            pendentes = []
+            if not linhas:
+                return
+            bloco = np.loadtxt(linhas, delimiter=delimitador, usecols=colunas,
+                               dtype=np.float64, ndmin=2)
+            if len(bloco):
+                yield bloco[:, 0].copy(), bloco[:, 1].copy(), bloco[:, 2].copy()
+
+
+def _blocos_npy(caminho, tamanho_bloco):
+    tempo, entrada, saida = abrir_memmap(caminho)
+    for inicio in range(0, len(tempo), tamanho_bloco):
+        fim = inicio + tamanho_bloco
+        yield tempo[inicio:fim], entrada[inicio:fim], saida[inicio:fim]
+
+
+def ler_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO, delimitador=','):
+    """Gera blocos (tempo, entrada, saida) do registro sem carregá-lo inteiro.
+
+    Aceita .mat v7.3 (HDF5, via h5py), CSV com colunas tempo/entrada/saída
+    e .npy gerado por converter_para_npy (lido por memmap). Arquivos .mat
+    v5 não permitem leitura parcial e são carregados inteiros pelo cache.
+    """
+    caminho = _resolver_caminho(caminho)
+    sufixo = caminho.suffix.lower()
+    if sufixo in ('.csv', '.txt'):
+        yield from _blocos_csv(caminho, tamanho_bloco, delimitador)
+    elif sufixo == '.npy':
+        yield from _blocos_npy(caminho, tamanho_bloco)
+    elif eh_hdf5(caminho):
+        yield from _blocos_hdf5(caminho, tamanho_bloco)
+    else:
+        tempo, entrada, saida = carregar_dataset(caminho)
+        for inicio in range(0, len(tempo), tamanho_bloco):
+            fim = inicio + tamanho_bloco
+            yield tempo[inicio:fim], entrada[inicio:fim], saida[inicio:fim]
+
+
+def ler_registro(caminho):
+    """Lê o registro inteiro de qualquer formato aceito por ler_blocos."""
+    blocos = list(ler_blocos(caminho))
+    if len(blocos) == 1:
+        return blocos[0]
+    return tuple(np.concatenate(campo) for campo in zip(*blocos))
+
+
+def contar_amostras(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """Número de amostras do registro (lê só metadados quando possível)."""
+    caminho = _resolver_caminho(caminho)
+    if caminho.suffix.lower() == '.npy':
+        return len(abrir_memmap(caminho)[0])
+    if caminho.suffix.lower() == '.mat' and eh_hdf5(caminho):
+        h5py = _importar_h5py()
+        with h5py.File(caminho, 'r') as arquivo:
+            return max(arquivo['reactionExperiment'][CAMPOS[0]].shape)
+    return sum(len(bloco[0]) for bloco in ler_blocos(caminho, tamanho_bloco))
+
+
+def converter_para_npy(origem, destino, tamanho_bloco=TAMANHO_BLOCO):
+    """Grava o registro como matriz (3, n) em .npy, bloco a bloco.
+
+    O arquivo gerado pode ser aberto com abrir_memmap sem ocupar RAM.
+    """
+    n = contar_amostras(origem, tamanho_bloco)
+    matriz = np.lib.format.open_memmap(str(destino), mode='w+', dtype=np.float64, shape=(3, n))
+    inicio = 0
+    for tempo, entrada, saida in ler_blocos(origem, tamanho_bloco):
+        fim = inicio + len(tempo)
+        matriz[0, inicio:fim] = tempo
+        matriz[1, inicio:fim] = entrada
+        matriz[2, inicio:fim] = saida
+        inicio = fim
+    matriz.flush()
+    del matriz
+    return Path(destino)
+
+
+def abrir_memmap(caminho):
+    """Abre um .npy (3, n) mapeado em memória e retorna (tempo, entrada, saida)."""
+    matriz = np.load(str(caminho), mmap_mode='r')
+    return matriz[0], matriz[1], matriz[2]
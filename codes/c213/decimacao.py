@@ -0,0 +1,88 @@
+"""Decimação min-max das curvas para desenho (M4: primeiro, mínimo, máximo, último).
+
+Numa tela de L pixels de largura não adianta desenhar mais que algumas
+amostras por coluna. Para cada grupo de amostras que cai numa coluna,
+guardamos a primeira, a de menor valor, a de maior valor e a última: a
+linha rasterizada fica igual à da curva completa (picos, vales e
+cruzamentos aparecem onde estão), com no máximo 4*L pontos.
+
+SerieDecimada guarda a curva completa e devolve a versão decimada do
+trecho visível; séries longas mantêm também um nível pré-decimado, usado
+enquanto o zoom mostra muitas amostras por coluna, para o pan continuar
+interativo com registros de 10^7 amostras.
+"""
+import numpy as np
+
+# Abaixo de tantas amostras por coluna a curva é desenhada sem decimação
+AMOSTRAS_POR_COLUNA = 4
+
+# Séries maiores que isso ganham um nível pré-decimado com COLUNAS_NIVEL grupos
+LIMITE_NIVEL = 1 << 18
+COLUNAS_NIVEL = 1 << 16
+
+
+def indices_minmax(y, colunas):
+    """Índices (crescentes) de primeiro, mínimo, máximo e último de cada grupo.
+
+    As amostras são divididas em grupos consecutivos de mesmo tamanho, o
+    que corresponde às colunas de pixels quando a amostragem é uniforme.
+    """
+    n = len(y)
+    passo = max(n // max(int(colunas), 1), 1)
+    grupos = n // passo
+    principal = grupos * passo
+    matriz = y[:principal].reshape(grupos, passo)
+    inicio = np.arange(0, principal, passo)
+    indices = [inicio, inicio + matriz.argmin(axis=1), inicio + matriz.argmax(axis=1), inicio + passo - 1]
+    if principal < n:
+        # Sobra menor que um grupo: vira mais um grupo
+        resto = y[principal:]
+        indices = [np.append(i, principal + extra) for i, extra in
+                   zip(indices, (0, int(resto.argmin()), int(resto.argmax()), n - principal - 1))]
+    return np.sort(np.stack(indices, axis=1), axis=1).ravel()
+
+
+class SerieDecimada:
+    """Curva (x, y) completa com decimação min-max sob demanda."""
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        # Tempo crescente permite recortar o trecho visível por busca binária
+        self.ordenada = len(self.x) < 2 or bool(np.all(self.x[1:] >= self.x[:-1]))
+        self._nivel = None
+        self._passo_nivel = 1
+        if self.ordenada and len(self.x) > LIMITE_NIVEL:
+            indices = indices_minmax(self.y, COLUNAS_NIVEL)
+            self._nivel = (self.x[indices], self.y[indices])
+            self._passo_nivel = len(self.x) // COLUNAS_NIVEL
+
+    def __len__(self):
+        return len(self.x)
+
+    def limites(self):
+        """(x_min, x_max, y_min, y_max) da curva completa."""
+        if self.ordenada:
+            x_min, x_max = float(self.x[0]), float(self.x[-1])
+        else:
+            x_min, x_max = float(np.min(self.x)), float(np.max(self.x))
+        # O nível pré-decimado contém os extremos de cada grupo, logo os globais
+        y = self._nivel[1] if self._nivel is not None else self.y
+        return x_min, x_max, float(np.nanmin(y)), float(np.nanmax(y))
+
+    def janela(self, x_min, x_max, colunas):
+        """(x, y) decimados para desenhar o intervalo [x_min, x_max] em `colunas` pixels."""
+        x, y = self.x, self.y
+        if self.ordenada:
+            # Uma amostra além de cada borda, para a linha chegar até a borda dos eixos
+            inicio = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+            fim = min(int(np.searchsorted(x, x_max, side='right')) + 1, len(x))
+            if self._nivel is not None and fim - inicio >= AMOSTRAS_POR_COLUNA * colunas * self._passo_nivel:
+                x, y = self._nivel
+                inicio = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+                fim = min(int(np.searchsorted(x, x_max, side='right')) + 1, len(x))
+            x, y = x[inicio:fim], y[inicio:fim]
+        if len(x) <= AMOSTRAS_POR_COLUNA * colunas:
+            return x, y
+        indices = indices_minmax(y, colunas)
+        return x[indices], y[indices]
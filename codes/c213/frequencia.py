@@ -0,0 +1,183 @@
+"""Resposta em frequência e margens de estabilidade da malha PID + FOPDT, com atraso exato.
+
+L(jw) = C(jw) * k * exp(-jw*theta) / (tau*jw + 1), com o mesmo PID da
+simulação (Kp*(1 + 1/(Ti*s) + Td*s/(Td/N*s + 1))). O atraso entra como
+exponencial complexa, e a fase é calculada analiticamente (fase do PID -
+atan(w*tau) - w*theta), sem desdobramento numérico nem o erro de fase da
+aproximação de Padé em alta frequência.
+
+Tudo é avaliado em NumPy sobre uma grade densa de frequências e para
+vários controladores de uma vez: ganhos com formato (3,) ou (N, 3).
+"""
+import numpy as np
+
+from c213.simulacao import N_FILTRO
+
+# Pontos da grade de frequências padrão (espaçamento logarítmico)
+PONTOS_PADRAO = 4000
+
+# Limites da grade padrão em relação às constantes da planta
+W_MIN_RELATIVO = 1e-3  # vezes 1/(tau + theta)
+W_MAX_RELATIVO = 1e2   # vezes 1/min(tau, theta)
+
+# Controladores avaliados por vez: matrizes N x pontos pequenas o bastante para o cache
+TAMANHO_LOTE = 8
+
+# Queda de -3 dB que define a largura de banda da malha fechada
+_NIVEL_BANDA = 1 / np.sqrt(2)
+
+
+def grade_frequencias(tau, theta, pontos=PONTOS_PADRAO):
+    """Frequências (rad/s) que cobrem a dinâmica da planta, do regime ao atraso."""
+    w_min = W_MIN_RELATIVO / (tau + theta)
+    w_max = W_MAX_RELATIVO / max(min(tau, theta), 1e-12)
+    return np.logspace(np.log10(w_min), np.log10(w_max), int(pontos))
+
+
+def resposta_planta(w, k, tau, theta):
+    """G(jw) = k * exp(-jw*theta) / (tau*jw + 1)."""
+    s = 1j * np.asarray(w, dtype=np.float64)
+    return k * np.exp(-s * theta) / (tau * s + 1)
+
+
+def _partes_pid(w, ganhos, n_filtro):
+    # Partes real e imaginária de C(jw) em aritmética real, formato (..., len(w)):
+    # Td*jw/(1 + jw*Td/N) = (Td^2*w^2/N + j*Td*w) / (1 + (w*Td/N)^2)
+    ganhos = np.asarray(ganhos, dtype=np.float64)
+    kp, ti, td = (ganhos[..., i, None] for i in range(3))
+    w = np.asarray(w, dtype=np.float64)
+    com_integral = (ti > 0) & np.isfinite(ti)
+    inverso_ti = np.divide(1.0, ti, out=np.zeros(ti.shape), where=com_integral)
+    if n_filtro is None:
+        real = np.repeat(kp, len(w), axis=-1)
+        imaginaria = td * w
+    else:
+        imaginaria = td * w
+        denominador = imaginaria / n_filtro
+        denominador *= denominador
+        denominador += 1
+        real = imaginaria * imaginaria
+        real /= n_filtro
+        real /= denominador
+        real += 1
+        real *= kp
+        imaginaria /= denominador
+    imaginaria -= inverso_ti / w
+    imaginaria *= kp
+    return real, imaginaria
+
+
+def resposta_pid(w, ganhos, n_filtro=N_FILTRO):
+    """C(jw) para ganhos (..., 3) = Kp, Ti, Td; resultado com formato (..., len(w)).
+
+    Ti <= 0 ou infinito desliga a ação integral, como na simulação.
+    n_filtro=None usa a derivada ideal Td*s.
+    """
+    real, imaginaria = _partes_pid(w, ganhos, n_filtro)
+    return real + 1j * imaginaria
+
+
+def _fase_planta(w, tau, theta):
+    return -np.arctan(w * tau) - w * theta
+
+
+def resposta_malha(w, k, tau, theta, ganhos, n_filtro=N_FILTRO):
+    """(L(jw), fase em rad) da malha aberta; a fase é contínua (sem saltos de 2*pi)."""
+    w = np.asarray(w, dtype=np.float64)
+    real, imaginaria = _partes_pid(w, ganhos, n_filtro)
+    # Re(C) > 0 para Kp > 0, então a fase do PID fica em (-pi/2, pi/2) sem ambiguidade
+    fase = np.arctan2(imaginaria, real) + _fase_planta(w, tau, theta)
+    return (real + 1j * imaginaria) * resposta_planta(w, k, tau, theta), fase
+
+
+def _primeiro_cruzamento(log_w, valores, limite):
+    # Frequência (interpolada em log w) em que `valores` fica abaixo de `limite`
+    # pela primeira vez, e a posição (índice, fração) para interpolar outras grandezas
+    abaixo = valores < limite
+    j = np.argmax(abaixo, axis=-1)
+    achou = np.take_along_axis(abaixo, j[..., None], axis=-1)[..., 0] & (j > 0)
+    j = np.maximum(j, 1)
+    antes = np.take_along_axis(valores, (j - 1)[..., None], axis=-1)[..., 0]
+    depois = np.take_along_axis(valores, j[..., None], axis=-1)[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fracao = np.clip((antes - limite) / (antes - depois), 0.0, 1.0)
+    w = np.exp(log_w[j - 1] + fracao * (log_w[j] - log_w[j - 1]))
+    return np.where(achou, w, np.nan), achou, j, fracao
+
+
+def _interpolar(valores, j, fracao):
+    antes = np.take_along_axis(valores, (j - 1)[..., None], axis=-1)[..., 0]
+    depois = np.take_along_axis(valores, j[..., None], axis=-1)[..., 0]
+    return antes + fracao * (depois - antes)
+
+
+def _margens_lote(w, log_w, planta, log_modulo_planta, fase_planta, ganhos, n_filtro):
+    # Só aritmética real, em grande parte no lugar, sobre as matrizes N x pontos;
+    # o que depende só de w (planta, log w) vem calculado uma vez por margens_pid
+    real_c, imag_c = _partes_pid(w, ganhos, n_filtro)
+    fase = np.arctan2(imag_c, real_c)
+    fase += fase_planta
+    log_modulo = real_c * real_c
+    log_modulo += imag_c * imag_c
+    np.log(log_modulo, out=log_modulo)
+    log_modulo *= 0.5
+    log_modulo += log_modulo_planta
+
+    # Cruzamento de ganho (|L| = 1) e margem de fase
+    w_ganho, achou_ganho, j, fracao = _primeiro_cruzamento(log_w, log_modulo, 0.0)
+    margem_fase = np.where(achou_ganho, 180.0 + np.degrees(_interpolar(fase, j, fracao)), np.inf)
+
+    # Cruzamento de fase (-180°) e margem de ganho
+    w_fase, achou_fase, j, fracao = _primeiro_cruzamento(log_w, fase, -np.pi)
+    margem_ganho = np.where(achou_fase, np.exp(-_interpolar(log_modulo, j, fracao)), np.inf)
+
+    # |1 + L|^2 = (1 + Re L)^2 + (Im L)^2, com L = C*G
+    retorno2 = real_c * planta.real
+    retorno2 -= imag_c * planta.imag
+    retorno2 += 1
+    retorno2 *= retorno2
+    imag_l = real_c * planta.imag
+    imag_l += imag_c * planta.real
+    imag_l *= imag_l
+    retorno2 += imag_l
+    ms = 1 / np.sqrt(retorno2.min(axis=-1))
+
+    # log|T| = log|L| - log|1 + L|; largura de banda em -3 dB do valor em baixa frequência
+    log_complementar = np.log(retorno2, out=retorno2)
+    log_complementar *= -0.5
+    log_complementar += log_modulo
+    mt = np.exp(log_complementar.max(axis=-1))
+    log_complementar -= log_complementar[..., :1] + np.log(_NIVEL_BANDA)
+    banda, _, _, _ = _primeiro_cruzamento(log_w, log_complementar, 0.0)
+    return {
+        'GainMargin': margem_ganho,
+        'PhaseMargin': margem_fase,
+        'PhaseCrossover': w_fase,
+        'GainCrossover': w_ganho,
+        'Ms': ms,
+        'Mt': mt,
+        'Bandwidth': banda,
+    }
+
+
+def margens_pid(k, tau, theta, ganhos, w=None, n_filtro=N_FILTRO, tamanho_lote=TAMANHO_LOTE):
+    """Margens de ganho e de fase, Ms, Mt e largura de banda de cada controlador.
+
+    ganhos tem formato (3,) ou (N, 3) (Kp, Ti, Td); w é a grade em rad/s
+    (padrão: grade_frequencias). Retorna um dicionário de arrays com
+    formato ganhos.shape[:-1]: GainMargin (razão), PhaseMargin (graus),
+    PhaseCrossover e GainCrossover (rad/s) com o mesmo significado que em
+    ctrl.stability_margins, além de Ms = max|S|, Mt = max|T| e Bandwidth
+    (rad/s, -3 dB de |T| em relação à baixa frequência). Os cruzamentos
+    são os de menor frequência; margens sem cruzamento na grade são inf e
+    as frequências correspondentes, nan.
+    """
+    ganhos = np.asarray(ganhos, dtype=np.float64)
+    w = grade_frequencias(tau, theta) if w is None else np.asarray(w, dtype=np.float64)
+    planta = resposta_planta(w, k, tau, theta)
+    constantes = (np.log(w), planta, np.log(np.abs(planta)), _fase_planta(w, tau, theta))
+    linhas = ganhos.reshape(-1, 3)
+    partes = [_margens_lote(w, *constantes, linhas[inicio:inicio + tamanho_lote], n_filtro)
+              for inicio in range(0, len(linhas), tamanho_lote)]
+    return {nome: np.concatenate([parte[nome] for parte in partes]).reshape(ganhos.shape[:-1])
+            for nome in partes[0]}
@@ -0,0 +1,175 @@
+"""Gráfico Matplotlib embutido na interface, atualizado sem recriar a figura.
+
+Cada aba mantém um GraficoIncremental. atualizar() reaproveita as Line2D
+existentes (set_data) e, quando os limites dos eixos, os rótulos e a legenda
+não mudam, redesenha só as curvas e a caixa de texto por blitting sobre o
+fundo guardado, sem renderizar a figura inteira de novo.
+
+As linhas recebem só a versão decimada (min-max por coluna de pixel, ver
+c213.decimacao) do trecho visível, refeita a cada zoom, pan ou
+redimensionamento; os dados completos ficam em GraficoIncremental.series.
+"""
+from PyQt5.QtCore import QSize
+from PyQt5.QtWidgets import QVBoxLayout, QWidget
+
+from c213.decimacao import SerieDecimada
+
+# Folga vertical em torno das curvas, como a margem automática do Matplotlib
+MARGEM_Y = 0.05
+
+# Resolução padrão das figuras do Matplotlib (rcParams['figure.dpi'])
+DPI_PADRAO = 100
+
+CAIXA_TEXTO = dict(boxstyle='round', facecolor='white', alpha=0.6)
+
+# Módulos carregados só no primeiro gráfico (ver pre_carregar em c213.tarefas)
+MODULOS_GRAFICO = ('matplotlib.figure', 'matplotlib.backends.backend_qt5agg')
+
+
+class GraficoIncremental(QWidget):
+    """Canvas persistente com barra de navegação (zoom/pan).
+
+    A figura só é criada no primeiro atualizar(): o Matplotlib não é
+    importado enquanto a janela abre.
+    """
+
+    def __init__(self, parent=None, figsize=(8, 4)):
+        super().__init__(parent)
+        self._figsize = figsize
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.figura = self.canvas = self.eixos = self.texto = None
+        self.linhas = []
+        self.series = []
+        self._fundo = None
+        self._legenda = None
+        self._assinatura = None
+
+    def sizeHint(self):
+        # Reserva o espaço da figura antes de ela existir: a janela já abre no tamanho final
+        if self.canvas is not None:
+            return super().sizeHint()
+        largura, altura = self._figsize
+        return QSize(int(largura * DPI_PADRAO), int(altura * DPI_PADRAO))
+
+    def _criar_figura(self):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
+        from matplotlib.figure import Figure
+
+        self.figura = Figure(figsize=self._figsize)
+        self.canvas = FigureCanvasQTAgg(self.figura)
+        self.eixos = self.figura.add_subplot(111)
+        self.eixos.grid(True)
+        self._layout.addWidget(NavigationToolbar2QT(self.canvas, self))
+        self._layout.addWidget(self.canvas)
+
+        # A caixa de texto fica em coordenadas dos eixos, no canto inferior direito
+        self.texto = self.eixos.text(0.98, 0.04, '', transform=self.eixos.transAxes, ha='right',
+                                     va='bottom', multialignment='left', fontsize=9,
+                                     bbox=CAIXA_TEXTO, animated=True)
+        self.texto.set_visible(False)
+        self.canvas.mpl_connect('draw_event', self._ao_desenhar)
+        # Zoom/pan da barra de navegação e mudança de tamanho: decima de novo
+        # antes da renderização que vem em seguida
+        self.eixos.callbacks.connect('xlim_changed', lambda eixos: self._decimar())
+        self.canvas.mpl_connect('resize_event', lambda evento: self._decimar())
+
+    def _ao_desenhar(self, evento):
+        # Depois de cada renderização completa guarda o fundo (sem os artistas animados)
+        self._fundo = self.canvas.copy_from_bbox(self.figura.bbox)
+        # A legenda só muda com uma renderização completa: guarda também seus
+        # pixels, para o blitting não ter de redesenhar o texto dela
+        self._legenda = None
+        legenda = self.eixos.get_legend()
+        if legenda is not None:
+            self.eixos.draw_artist(legenda)
+            self._legenda = self.canvas.copy_from_bbox(legenda.get_window_extent().padded(1))
+        self._desenhar_animados()
+
+    def _desenhar_animados(self):
+        for linha in self.linhas:
+            self.eixos.draw_artist(linha)
+        # Legenda e texto por cima das curvas
+        if self._legenda is not None:
+            self.canvas.restore_region(self._legenda)
+        self.eixos.draw_artist(self.texto)
+
+    def _decimar(self):
+        # Passa a cada linha só os pontos necessários para o intervalo visível
+        x_min, x_max = self.eixos.get_xlim()
+        colunas = max(int(self.eixos.bbox.width), 1)
+        for linha, serie in zip(self.linhas, self.series):
+            linha.set_data(*serie.janela(x_min, x_max, colunas))
+
+    def _ajustar_linhas(self, quantidade):
+        while len(self.linhas) < quantidade:
+            linha, = self.eixos.plot([], [], animated=True)
+            self.linhas.append(linha)
+        while len(self.linhas) > quantidade:
+            self.linhas.pop().remove()
+
+    @staticmethod
+    def _limites(series):
+        limites = [serie.limites() for serie in series]
+        x_min = min(lim[0] for lim in limites)
+        x_max = max(lim[1] for lim in limites)
+        y_min = min(lim[2] for lim in limites)
+        y_max = max(lim[3] for lim in limites)
+        folga = (y_max - y_min) * MARGEM_Y or 1.0
+        return (x_min, x_max), (y_min - folga, y_max + folga)
+
+    def atualizar(self, curvas, titulo='', xlabel='Tempo (s)', ylabel='', texto=None,
+                  fixar_limites=False):
+        """Mostra as curvas [(x, y, estilo, rótulo), ...] reaproveitando as linhas.
+
+        estilo é uma cor ('r', 'black') ou um dicionário de propriedades da
+        linha ({'color': 'b', 'linestyle': '--'}). Com fixar_limites=True os
+        eixos não são reescalados (útil durante ajustes contínuos, em que só
+        as curvas mudam).
+        """
+        if self.figura is None:
+            self._criar_figura()
+        self._ajustar_linhas(len(curvas))
+        self.series = [SerieDecimada(x, y) for x, y, _, _ in curvas]
+        for linha, (_, _, estilo, rotulo) in zip(self.linhas, curvas):
+            _aplicar_estilo(linha, estilo)
+            linha.set_label(rotulo)
+        if texto is not None:
+            self.texto.set_text(texto)
+        self.texto.set_visible(bool(texto))
+
+        limites = None if fixar_limites or not curvas else self._limites(self.series)
+        limites_atuais = limites if limites is not None else (self._assinatura or (None,))[-1]
+        assinatura = (titulo, xlabel, ylabel, [(c[2], c[3]) for c in curvas], limites_atuais)
+        if assinatura == self._assinatura and self._fundo is not None:
+            # Só os dados mudaram: restaura o fundo e redesenha as curvas
+            self._decimar()
+            self.canvas.restore_region(self._fundo)
+            self._desenhar_animados()
+            self.canvas.blit(self.figura.bbox)
+            return
+
+        self._assinatura = assinatura
+        self.eixos.set_title(titulo)
+        self.eixos.set_xlabel(xlabel)
+        self.eixos.set_ylabel(ylabel)
+        if limites is not None:
+            self.eixos.set_xlim(*limites[0], emit=False)
+            self.eixos.set_ylim(*limites[1])
+        self._decimar()
+        legenda = self.eixos.get_legend()
+        if legenda is not None:
+            legenda.remove()
+        if curvas:
+            self.eixos.legend(loc='upper left').set_animated(True)
+        # O fundo guardado fica inválido até a próxima renderização completa
+        self._fundo = None
+        self.canvas.draw_idle()
+
+
+def _aplicar_estilo(linha, estilo):
+    # estilo é uma cor ('r', 'black') ou um dicionário de propriedades da Line2D
+    if isinstance(estilo, dict):
+        linha.set(**{'linestyle': '-', **estilo})
+    else:
+        linha.set(color=estilo, linestyle='-')
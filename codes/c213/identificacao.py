@@ -0,0 +1,197 @@
+"""Identificação de modelos de primeira ordem com atraso pelos métodos de dois pontos.
+
+Modelo: G(s) = k * exp(-theta*s) / (tau * s + 1)
+"""
+import numpy as np
+
+from c213.dados import TAMANHO_BLOCO, ler_blocos
+
+# Frações do valor final usadas por cada método de dois pontos
+METODOS = {
+    'smith': (0.283, 0.632),
+    'sundaresan': (0.353, 0.853),
+}
+
+
+def parametros_dois_pontos(metodo, t1, t2):
+    """Calcula (tau, theta) a partir dos tempos t1 e t2 do método."""
+    if metodo == 'smith':
+        tau = 1.5 * (t2 - t1)
+        theta = t2 - tau
+    elif metodo == 'sundaresan':
+        tau = (2/3) * (t2 - t1)
+        theta = (1.3*t1) - (0.29*t2)
+    else:
+        raise ValueError(f'Método desconhecido: {metodo}')
+    return tau, theta
+
+
+def _interpolar(t_ant, y_ant, t, y, nivel):
+    # Instante em que a reta entre a amostra anterior e a do cruzamento atinge o nível
+    dy = y - y_ant
+    fracao = np.divide(nivel - y_ant, dy, out=np.ones_like(dy), where=dy > 0)
+    return t_ant + np.clip(fracao, 0.0, 1.0) * (t - t_ant)
+
+
+def _montar_resultados(metodos, k, valor_final, buscar_cruzamentos):
+    # Busca os níveis de todos os métodos de uma vez e aplica as fórmulas de cada um
+    niveis = [f * valor_final for metodo in metodos for f in METODOS[metodo]]
+    instantes = buscar_cruzamentos(niveis)
+    resultados = {}
+    for i, metodo in enumerate(metodos):
+        tau, theta = parametros_dois_pontos(metodo, instantes[2*i], instantes[2*i + 1])
+        resultados[metodo] = (k, float(tau), float(theta))
+    return resultados
+
+
+def cruzamentos(tempo, saida, niveis, interpolar=True):
+    """Instantes do primeiro cruzamento de cada nível, numa única varredura.
+
+    Equivale a tempo[np.where(saida >= nivel)[0][0]] para cada nível, mas
+    busca todos de uma vez (searchsorted no máximo acumulado, que é
+    monotônico) e, com interpolar=True, interpola linearmente entre a
+    amostra anterior e a do cruzamento. Níveis não atingidos dão nan.
+    """
+    tempo = np.asarray(tempo, dtype=np.float64)
+    saida = np.asarray(saida, dtype=np.float64)
+    niveis = np.atleast_1d(np.asarray(niveis, dtype=np.float64))
+    maximo = np.maximum.accumulate(saida)
+    idx = np.searchsorted(maximo, niveis, side='left')
+    achou = idx < len(saida)
+    idx = np.minimum(idx, len(saida) - 1)
+    if interpolar:
+        anterior = np.maximum(idx - 1, 0)
+        instantes = _interpolar(tempo[anterior], saida[anterior], tempo[idx], saida[idx], niveis)
+    else:
+        instantes = tempo[idx]
+    instantes[~achou] = np.nan
+    return instantes
+
+
+def identificar(tempo, entrada, saida, metodos=None, amplitude_degrau=None, interpolar=True,
+                valor_final=None):
+    """Retorna {método: (k, tau, theta)} de todos os métodos numa única varredura.
+
+    amplitude_degrau é a média da entrada e valor_final a última amostra
+    da saída quando não informados (ver c213.preprocessamento).
+    """
+    metodos = list(METODOS) if metodos is None else list(metodos)
+    if valor_final is None:
+        valor_final = saida[-1]
+    if amplitude_degrau is None:
+        amplitude_degrau = np.mean(entrada)
+    k = float((valor_final - saida[0]) / amplitude_degrau)
+    return _montar_resultados(metodos, k, valor_final,
+                              lambda niveis: cruzamentos(tempo, saida, niveis, interpolar))
+
+
+class IdentificacaoIncremental:
+    """Identifica k, tau e theta consumindo o registro bloco a bloco, numa só passada.
+
+    Em vez da curva inteira, guarda só os pontos em que a saída bate um novo
+    máximo (a "escada" do máximo acumulado) e a amostra anterior a cada um:
+    o primeiro cruzamento de um nível é sempre um desses pontos. Se a escada
+    passar de `capacidade` pontos ela é rarefeita por faixas de valor, o que
+    limita a memória com erro de no máximo uma faixa (~ amplitude/capacidade).
+    """
+
+    def __init__(self, capacidade=1 << 16):
+        self.capacidade = capacidade
+        self.n = 0
+        self.soma_entrada = 0.0
+        self.y_inicial = None
+        self.y_final = None
+        self._maximo = -np.inf
+        self._ultima = None  # (t, y) da última amostra do bloco anterior
+        self._blocos = []    # pontos da escada: matrizes (4, m) com t_ant, y_ant, t, y
+        self._n_pontos = 0
+
+    def atualizar(self, tempo, entrada, saida):
+        """Acrescenta um bloco de amostras."""
+        tempo = np.asarray(tempo, dtype=np.float64)
+        saida = np.asarray(saida, dtype=np.float64)
+        if not len(saida):
+            return
+        if self.y_inicial is None:
+            self.y_inicial = float(saida[0])
+            self._ultima = (float(tempo[0]), float(saida[0]))
+        self.n += len(saida)
+        self.soma_entrada += float(np.sum(entrada))
+        self.y_final = float(saida[-1])
+
+        # Máximo acumulado antes de cada amostra (incluindo os blocos anteriores)
+        acumulado = np.maximum.accumulate(saida)
+        antes = np.empty_like(acumulado)
+        antes[0] = self._maximo
+        np.maximum(acumulado[:-1], self._maximo, out=antes[1:])
+        novos = np.flatnonzero(saida > antes)
+        if len(novos):
+            anteriores = np.maximum(novos - 1, 0)
+            pontos = np.stack((tempo[anteriores], saida[anteriores], tempo[novos], saida[novos]))
+            if novos[0] == 0:
+                pontos[0, 0], pontos[1, 0] = self._ultima
+            self._blocos.append(pontos)
+            self._n_pontos += pontos.shape[1]
+            if self._n_pontos > self.capacidade:
+                self._rarefazer()
+        self._maximo = max(self._maximo, float(acumulado[-1]))
+        self._ultima = (float(tempo[-1]), float(saida[-1]))
+
+    def _rarefazer(self):
+        pontos = np.concatenate(self._blocos, axis=1)
+        valores = pontos[3]
+        faixa = (valores[-1] - valores[0]) / (self.capacidade // 2)
+        if faixa > 0:
+            # Mantém o primeiro ponto de cada faixa de valor
+            faixas = np.floor((valores - valores[0]) / faixa)
+            manter = np.concatenate(([True], faixas[1:] != faixas[:-1]))
+            pontos = pontos[:, manter]
+        self._blocos = [pontos]
+        self._n_pontos = pontos.shape[1]
+
+    def cruzamentos(self, niveis, interpolar=True):
+        """Instantes do primeiro cruzamento de cada nível (nan se não houver)."""
+        niveis = np.atleast_1d(np.asarray(niveis, dtype=np.float64))
+        if not self._n_pontos:
+            return np.full(niveis.shape, np.nan)
+        if len(self._blocos) > 1:
+            self._blocos = [np.concatenate(self._blocos, axis=1)]
+        t_ant, y_ant, t, y = self._blocos[0]
+        idx = np.searchsorted(y, niveis, side='left')
+        achou = idx < len(y)
+        idx = np.minimum(idx, len(y) - 1)
+        if interpolar:
+            instantes = _interpolar(t_ant[idx], y_ant[idx], t[idx], y[idx], niveis)
+        else:
+            instantes = t[idx].copy()
+        instantes[~achou] = np.nan
+        return instantes
+
+    def resultado(self, metodos=None, interpolar=True, valor_final=None):
+        """Retorna {método: (k, tau, theta)} com os dados acumulados até agora."""
+        if self.n == 0:
+            raise ValueError('Nenhuma amostra foi acumulada.')
+        metodos = list(METODOS) if metodos is None else list(metodos)
+        if valor_final is None:
+            valor_final = self.y_final
+        amplitude_degrau = self.soma_entrada / self.n
+        k = (valor_final - self.y_inicial) / amplitude_degrau
+        return _montar_resultados(metodos, k, valor_final,
+                                  lambda niveis: self.cruzamentos(niveis, interpolar))
+
+
+def identificar_arquivo(caminho, metodos=None, tamanho_bloco=TAMANHO_BLOCO, interpolar=True,
+                        preprocessamento=None):
+    """Identifica o modelo de um arquivo lendo-o em blocos (memória limitada).
+
+    preprocessamento (c213.preprocessamento.Preprocessamento) filtra os
+    blocos antes da busca e fornece o valor final.
+    """
+    acumulador = IdentificacaoIncremental()
+    blocos = ler_blocos(caminho, tamanho_bloco)
+    if preprocessamento is not None:
+        blocos = preprocessamento.blocos(blocos)
+    for tempo, entrada, saida in blocos:
+        acumulador.atualizar(tempo, entrada, saida)
+    valor_final = preprocessamento.valor_final if preprocessamento is not None else None
+    return acumulador.resultado(metodos, interpolar, valor_final)
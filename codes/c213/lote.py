@@ -0,0 +1,150 @@
+"""Identificação e sintonia em lote de todos os ensaios de um diretório.
+
+Para cada arquivo roda Smith, Sundaresan e mínimos quadrados (FOPDT e SOPDT),
+sintoniza IMC e CHR sobre cada modelo de primeira ordem e grava uma única
+tabela (CSV ou Parquet) com uma linha por arquivo e modelo. Os arquivos são
+processados em paralelo por um pool de processos:
+
+    python -m c213.lote ensaios/ resultados.csv --processos 8
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from c213.ajuste import ajustar_fopdt, ajustar_sopdt, eqm
+from c213.dados import ler_registro
+from c213.identificacao import identificar
+from c213.metricas import metricas_degrau
+from c213.simulacao import resposta_degrau_fopdt, resposta_degrau_sopdt, simular_ate_acomodar
+from c213.sintonia import sintonia_chr, sintonia_imc
+
+# Lambda do IMC em múltiplos de theta quando não é dado em segundos
+LAMBDA_RELATIVO_PADRAO = 1.0
+
+# Métricas de malha fechada gravadas para cada sintonia
+METRICAS_TABELA = ('RiseTime', 'SettlingTime', 'Overshoot', 'IAE', 'ITAE')
+
+
+def _metricas_abertas(tempo, resposta, amplitude, k):
+    info = metricas_degrau(tempo, resposta / amplitude, valor_final=k)
+    return {'RiseTime': info['RiseTime'], 'SettlingTime': info['SettlingTime']}
+
+
+def _sintonias(tempo, k, tau, theta, lamb):
+    linha = {}
+    for nome, ganhos in (('IMC', sintonia_imc(k, tau, theta, lamb)), ('CHR', sintonia_chr(k, tau, theta))):
+        t, y = simular_ate_acomodar(tempo, k, tau, theta, *ganhos)
+        info = metricas_degrau(t, y, valor_final=1.0, referencia=1.0)
+        linha.update({f'{nome}_{g}': float(v) for g, v in zip(('Kp', 'Ti', 'Td'), ganhos)})
+        linha.update({f'{nome}_{m}': info[m] for m in METRICAS_TABELA})
+    return linha
+
+
+def processar_arquivo(caminho, lambda_imc=None, lambda_relativo=LAMBDA_RELATIVO_PADRAO):
+    """Linhas da tabela de resultados para um arquivo (uma por modelo).
+
+    lambda_imc em segundos; se não for dado, usa lambda_relativo * theta.
+    Um erro de leitura ou ajuste vira uma única linha com a coluna 'erro'.
+    """
+    try:
+        tempo, entrada, saida = ler_registro(caminho)
+        amplitude = float(np.mean(entrada))
+        modelos = identificar(tempo, entrada, saida, amplitude_degrau=amplitude)
+        modelos['minimos_quadrados'] = ajustar_fopdt(tempo, entrada, saida, amplitude_degrau=amplitude)
+
+        linhas = []
+        for metodo, (k, tau, theta) in modelos.items():
+            resposta = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude)
+            linha = {'arquivo': str(caminho), 'metodo': metodo, 'modelo': 'FOPDT',
+                     'k': k, 'tau': tau, 'tau2': np.nan, 'theta': theta, 'EQM': eqm(saida, resposta)}
+            linha.update(_metricas_abertas(tempo, resposta, amplitude, k))
+            lamb = lambda_imc if lambda_imc is not None else lambda_relativo * theta
+            linha['Lambda'] = lamb
+            linha.update(_sintonias(tempo, k, tau, theta, lamb))
+            linhas.append(linha)
+
+        # O SOPDT não tem regra IMC/CHR de primeira ordem: só identificação
+        k, tau1, tau2, theta = ajustar_sopdt(tempo, entrada, saida, amplitude_degrau=amplitude)
+        resposta = resposta_degrau_sopdt(tempo, k, tau1, tau2, theta, amplitude)
+        linha = {'arquivo': str(caminho), 'metodo': 'minimos_quadrados', 'modelo': 'SOPDT',
+                 'k': k, 'tau': tau1, 'tau2': tau2, 'theta': theta, 'EQM': eqm(saida, resposta)}
+        linha.update(_metricas_abertas(tempo, resposta, amplitude, k))
+        linhas.append(linha)
+        return linhas
+    except Exception as erro:  # um arquivo ruim não interrompe o lote
+        return [{'arquivo': str(caminho), 'erro': f'{type(erro).__name__}: {erro}'}]
+
+
+def listar_arquivos(diretorio, padrao='*.mat', recursivo=False):
+    """Arquivos do diretório que casam com o padrão, em ordem alfabética."""
+    diretorio = Path(diretorio)
+    return sorted(diretorio.rglob(padrao) if recursivo else diretorio.glob(padrao))
+
+
+def processar_diretorio(diretorio, padrao='*.mat', recursivo=False, processos=None,
+                        lambda_imc=None, lambda_relativo=LAMBDA_RELATIVO_PADRAO):
+    """Processa todos os arquivos do diretório e retorna um pandas.DataFrame.
+
+    processos=1 roda tudo no processo atual; None usa um processo por CPU.
+    """
+    import pandas as pd
+
+    arquivos = listar_arquivos(diretorio, padrao, recursivo)
+    argumentos = ([lambda_imc] * len(arquivos), [lambda_relativo] * len(arquivos))
+    if processos == 1 or len(arquivos) <= 1:
+        resultados = map(processar_arquivo, arquivos, *argumentos)
+        linhas = [linha for parte in resultados for linha in parte]
+    else:
+        processos = processos or os.cpu_count() or 1
+        # chunksize agrupa arquivos por tarefa para diluir o custo de comunicação
+        tamanho = max(1, len(arquivos) // (4 * processos))
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resultados = executor.map(processar_arquivo, arquivos, *argumentos, chunksize=tamanho)
+            linhas = [linha for parte in resultados for linha in parte]
+    tabela = pd.DataFrame(linhas)
+    if 'erro' not in tabela:
+        tabela['erro'] = None
+    return tabela
+
+
+def salvar_tabela(tabela, destino):
+    """Grava em Parquet se a extensão for .parquet, senão em CSV."""
+    destino = Path(destino)
+    if destino.suffix.lower() == '.parquet':
+        try:
+            tabela.to_parquet(destino, index=False)
+        except ImportError as erro:
+            raise ImportError('A gravação em Parquet requer o pacote pyarrow (ou fastparquet).') from erro
+    else:
+        tabela.to_csv(destino, index=False)
+    return destino
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Identificação e sintonia de todos os ensaios de um diretório.')
+    parser.add_argument('diretorio')
+    parser.add_argument('destino', help='tabela de saída (.csv ou .parquet)')
+    parser.add_argument('--padrao', default='*.mat', help='padrão dos arquivos (padrão: *.mat)')
+    parser.add_argument('--recursivo', action='store_true', help='inclui subdiretórios')
+    parser.add_argument('--processos', type=int, help='processos em paralelo (padrão: um por CPU)')
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--lambda-imc', type=float, help='lambda do IMC em segundos')
+    grupo.add_argument('--lambda-relativo', type=float, default=LAMBDA_RELATIVO_PADRAO,
+                       help='lambda do IMC como múltiplo de theta (padrão: %(default)s)')
+    args = parser.parse_args(argv)
+
+    tabela = processar_diretorio(args.diretorio, args.padrao, args.recursivo, args.processos,
+                                 args.lambda_imc, args.lambda_relativo)
+    if tabela.empty:
+        parser.error(f'nenhum arquivo {args.padrao} em {args.diretorio}')
+    destino = salvar_tabela(tabela, args.destino)
+    falhas = int(tabela['erro'].notna().sum())
+    print(f'{tabela["arquivo"].nunique()} arquivos, {len(tabela)} linhas gravadas em {destino}'
+          + (f' ({falhas} com erro)' if falhas else ''))
+
+
+if __name__ == '__main__':
+    main()
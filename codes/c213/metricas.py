@@ -0,0 +1,82 @@
+"""Métricas da resposta ao degrau calculadas direto dos arrays simulados.
+
+Todas as funções aceitam uma resposta (n,) ou várias em uma matriz (N, n),
+sempre ao longo do último eixo, e não simulam o sistema de novo.
+"""
+import numpy as np
+
+# Faixas usadas por ctrl.step_info
+FAIXA_SUBIDA = (0.1, 0.9)
+FAIXA_ACOMODACAO = 0.02
+
+
+def _primeiro_indice(condicao):
+    # Índice da primeira ocorrência ao longo do último eixo (-1 se nunca ocorre)
+    idx = np.argmax(condicao, axis=-1)
+    return np.where(np.take_along_axis(condicao, idx[..., None], axis=-1)[..., 0], idx, -1)
+
+
+def _no_tempo(tempo, idx):
+    return np.where(idx >= 0, tempo[np.maximum(idx, 0)], np.nan)
+
+
+def metricas_degrau(tempo, respostas, valor_final=None, referencia=None):
+    """Tempo de subida, tempo de acomodação, sobressinal, IAE, ISE e ITAE.
+
+    valor_final é o valor de regime usado nas faixas (padrão: última amostra);
+    referencia é o alvo para os índices de erro (padrão: valor_final).
+    Retorna um dicionário de arrays com formato respostas.shape[:-1]:
+    RiseTime, SettlingTime, Overshoot (%), Peak, PeakTime, IAE, ISE e ITAE
+    (as chaves comuns têm o mesmo significado que em ctrl.step_info).
+    """
+    tempo = np.asarray(tempo, dtype=np.float64)
+    respostas = np.asarray(respostas, dtype=np.float64)
+    if valor_final is None:
+        valor_final = respostas[..., -1]
+    valor_final = np.broadcast_to(np.asarray(valor_final, dtype=np.float64), respostas.shape[:-1])
+    if referencia is None:
+        referencia = valor_final
+    final = valor_final[..., None]
+    # Subida e pico no sentido do valor final (malhas de ação reversa terminam abaixo de 0)
+    sentido = np.where(valor_final < 0, -1.0, 1.0)
+    orientadas = respostas * sentido[..., None]
+
+    # Tempo de subida: de 10% a 90% do valor final
+    inicio = _primeiro_indice(orientadas >= FAIXA_SUBIDA[0] * np.abs(final))
+    fim = _primeiro_indice(orientadas >= FAIXA_SUBIDA[1] * np.abs(final))
+    subida = _no_tempo(tempo, fim) - _no_tempo(tempo, inicio)
+
+    # Tempo de acomodação: instante após a última saída da faixa de 2%
+    fora = np.abs(respostas - final) > FAIXA_ACOMODACAO * np.abs(final)
+    ultima_fora = np.where(fora.any(axis=-1),
+                           respostas.shape[-1] - 1 - np.argmax(fora[..., ::-1], axis=-1), -1)
+    acomodacao = tempo[np.minimum(ultima_fora + 1, len(tempo) - 1)]
+    acomodacao = np.where(ultima_fora == len(tempo) - 1, np.nan, acomodacao)
+
+    indice_pico = np.argmax(orientadas, axis=-1)
+    pico = np.take_along_axis(respostas, indice_pico[..., None], axis=-1)[..., 0]
+    # Relativo a |valor_final|; sem valor final (ex.: rejeição de perturbação) fica nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sobressinal = np.maximum(0.0, (pico - valor_final) * sentido / np.abs(valor_final) * 100)
+    sobressinal = np.where(valor_final == 0, np.nan, sobressinal)
+
+    # Índices de erro por integração retangular (a entrada é constante entre amostras)
+    erro = np.asarray(referencia, dtype=np.float64)[..., None] - respostas
+    dt = np.diff(tempo)
+    iae = np.abs(erro[..., :-1]) @ dt
+    ise = (erro[..., :-1] ** 2) @ dt
+    itae = np.abs(erro[..., :-1]) @ ((tempo[:-1] - tempo[0]) * dt)
+
+    metricas = {
+        'RiseTime': subida,
+        'SettlingTime': acomodacao,
+        'Overshoot': sobressinal,
+        'Peak': pico,
+        'PeakTime': tempo[indice_pico],
+        'IAE': iae,
+        'ISE': ise,
+        'ITAE': itae,
+    }
+    if respostas.ndim == 1:
+        return {nome: float(valor) for nome, valor in metricas.items()}
+    return metricas
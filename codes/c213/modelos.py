@@ -0,0 +1,121 @@
+"""Construção memorizada dos modelos do python-control (Padé, FTs e malhas).
+
+ctrl.pade, ctrl.tf, ctrl.series e ctrl.feedback custam caro comparados ao
+uso que se faz deles (uma resposta ao degrau por gráfico). As funções
+daqui guardam cada sistema construído num cache LRU indexado pelos
+parâmetros arredondados, então repetir um gráfico ou uma comparação com o
+mesmo modelo reaproveita os objetos. Os sistemas retornados são
+compartilhados: operações como G * amplitude criam objetos novos, mas eles
+não devem ser modificados no lugar.
+"""
+from collections import OrderedDict
+import threading
+
+import control as ctrl
+
+# Ordem padrão da aproximação de Padé do atraso
+ORDEM_PADE = 5
+
+# Algarismos significativos das chaves: parâmetros que só diferem além
+# disso (ruído de ponto flutuante) compartilham o mesmo sistema
+ALGARISMOS_CHAVE = 10
+
+# Quantidade máxima de sistemas mantidos em memória (descarte LRU)
+MAX_MODELOS_CACHE = 256
+
+_cache = OrderedDict()
+_trava = threading.Lock()
+_estatisticas = {'acertos': 0, 'faltas': 0}
+
+
+def _arredondar(valor):
+    return float(f'{float(valor):.{ALGARISMOS_CHAVE}g}')
+
+
+def _memorizado(tipo, parametros, construir):
+    # Constrói fora da trava (como carregar_dataset); se duas threads pedirem
+    # o mesmo sistema ao mesmo tempo, a primeira a terminar fica no cache
+    chave = (tipo,) + tuple(_arredondar(p) if isinstance(p, float) else p for p in parametros)
+    with _trava:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            _estatisticas['acertos'] += 1
+            return _cache[chave]
+        _estatisticas['faltas'] += 1
+
+    sistema = construir()
+
+    with _trava:
+        sistema = _cache.setdefault(chave, sistema)
+        _cache.move_to_end(chave)
+        while len(_cache) > MAX_MODELOS_CACHE:
+            _cache.popitem(last=False)
+    return sistema
+
+
+def pade(theta, ordem=ORDEM_PADE):
+    """Aproximação de Padé de exp(-theta*s) como função de transferência."""
+    def construir():
+        return ctrl.tf(*ctrl.pade(theta, ordem))
+    return _memorizado('pade', (float(theta), int(ordem)), construir)
+
+
+def primeira_ordem(k, tau):
+    """G(s) = k / (tau*s + 1)."""
+    return _memorizado('primeira_ordem', (float(k), float(tau)), lambda: ctrl.tf([k], [tau, 1]))
+
+
+def malha_aberta(k, tau, theta, ordem=ORDEM_PADE):
+    """G(s) * Padé(theta): modelo FOPDT em malha aberta."""
+    def construir():
+        return ctrl.series(primeira_ordem(k, tau), pade(theta, ordem))
+    return _memorizado('malha_aberta', (float(k), float(tau), float(theta), int(ordem)), construir)
+
+
+def malha_fechada(k, tau, theta, ordem=ORDEM_PADE):
+    """feedback(G, 1) * Padé(theta), a convenção "malha fechada" dos scripts."""
+    def construir():
+        return ctrl.series(ctrl.feedback(primeira_ordem(k, tau), 1), pade(theta, ordem))
+    return _memorizado('malha_fechada', (float(k), float(tau), float(theta), int(ordem)), construir)
+
+
+def pid(kp, ti, td):
+    """C(s) = Kp*(Td*s^2 + s + 1/Ti)/s, o PID ideal dos scripts."""
+    def construir():
+        return ctrl.tf([kp * td, kp, kp / ti], [1, 0])
+    return _memorizado('pid', (float(kp), float(ti), float(td)), construir)
+
+
+def controlador_imc(k, tau):
+    """C(s) = (tau*s + 1)/(k*tau), como em 9_interface."""
+    return _memorizado('controlador_imc', (float(k), float(tau)), lambda: ctrl.tf([tau, 1], [k * tau]))
+
+
+def malha_pid(k, tau, theta, kp, ti, td, ordem=ORDEM_PADE):
+    """feedback(C*G*Padé, 1) com o PID de parâmetros kp, ti, td."""
+    def construir():
+        laco = ctrl.series(pid(kp, ti, td), primeira_ordem(k, tau), pade(theta, ordem))
+        return ctrl.feedback(laco, 1)
+    parametros = (float(k), float(tau), float(theta), float(kp), float(ti), float(td), int(ordem))
+    return _memorizado('malha_pid', parametros, construir)
+
+
+def malha_imc(k, tau, theta, ordem=ORDEM_PADE):
+    """feedback(C*G*Padé, 1) com o controlador de controlador_imc."""
+    def construir():
+        laco = ctrl.series(controlador_imc(k, tau), primeira_ordem(k, tau), pade(theta, ordem))
+        return ctrl.feedback(laco, 1)
+    return _memorizado('malha_imc', (float(k), float(tau), float(theta), int(ordem)), construir)
+
+
+def estatisticas_cache():
+    """Dicionário com acertos, faltas e tamanho atual do cache."""
+    with _trava:
+        return dict(_estatisticas, tamanho=len(_cache))
+
+
+def limpar_cache():
+    """Esvazia o cache de sistemas e zera as estatísticas."""
+    with _trava:
+        _cache.clear()
+        _estatisticas.update(acertos=0, faltas=0)
@@ -0,0 +1,99 @@
+"""Planta FOPDT simulada em tempo real, num processo separado (substituta do hardware).
+
+O processo guarda o estado da planta discretizada (mesma discretização
+exata de c213.simulacao, em passos de `passo` segundos de planta) e a faz
+avançar pelo relógio: o tempo de planta é (agora - início)*escala, então
+com escala=100 uma planta de minutos roda em segundos. A entrada é mantida
+constante entre escritas (segurador de ordem zero), como numa placa de
+aquisição.
+
+Protocolo de linhas na entrada/saída padrão:
+
+    i        reinicia o relógio (t = 0) e responde "ok"
+    l        responde a saída atual da planta
+    e <u>    aplica a entrada u a partir de agora (sem resposta)
+    f        encerra
+
+    python -m c213.planta_simulada --k 4.9 --tau 3380 --theta 1630 --passo 0.5 --escala 1000
+"""
+import argparse
+import sys
+import time
+
+from c213.simulacao import coeficientes_discretos
+
+
+class PlantaTempoReal:
+    """Planta FOPDT cujo estado avança com o relógio (time.monotonic)."""
+
+    def __init__(self, k, tau, theta, passo, escala=1.0, saida_inicial=0.0):
+        self.a, self.b1, self.b2, self.m = coeficientes_discretos(k, tau, theta, passo)
+        self.passo = float(passo)
+        self.escala = float(escala)
+        self.saida_inicial = float(saida_inicial)
+        self.iniciar()
+
+    def iniciar(self, agora=None):
+        """Planta em repouso (entrada 0) a partir de agora."""
+        self._inicio = time.monotonic() if agora is None else agora
+        self._tamanho = self.m + 2
+        self._buffer = [0.0] * self._tamanho
+        self.passos = 0
+        self.y = 0.0
+        self.u = 0.0
+
+    def avancar(self, agora=None):
+        """Avança a planta até o instante `agora` com a entrada atual."""
+        agora = time.monotonic() if agora is None else agora
+        alvo = int((agora - self._inicio) * self.escala / self.passo)
+        a, b1, b2, m, tamanho, buffer = self.a, self.b1, self.b2, self.m, self._tamanho, self._buffer
+        y, u = self.y, self.u
+        for i in range(self.passos, alvo):
+            buffer[i % tamanho] = u
+            y = a*y + b1*buffer[(i - m) % tamanho] + b2*buffer[(i - m - 1) % tamanho]
+        self.y = y
+        self.passos = max(self.passos, alvo)
+
+    def ler(self):
+        self.avancar()
+        return self.saida_inicial + self.y
+
+    def escrever(self, u):
+        self.avancar()
+        self.u = float(u)
+
+
+def servir(planta, entrada=None, saida=None):
+    """Atende o protocolo de linhas até "f" ou o fim da entrada."""
+    entrada = entrada or sys.stdin.buffer
+    saida = saida or sys.stdout.buffer
+    for linha in iter(entrada.readline, b''):
+        comando = linha[:1]
+        if comando == b'l':
+            saida.write(b'%r\n' % planta.ler())
+            saida.flush()
+        elif comando == b'e':
+            planta.escrever(float(linha[1:]))
+        elif comando == b'i':
+            planta.iniciar()
+            saida.write(b'ok\n')
+            saida.flush()
+        elif comando == b'f':
+            break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m c213.planta_simulada',
+                                     description='Planta FOPDT em tempo real (protocolo de linhas).')
+    parser.add_argument('--k', type=float, required=True)
+    parser.add_argument('--tau', type=float, required=True, help='constante de tempo (s)')
+    parser.add_argument('--theta', type=float, required=True, help='atraso (s)')
+    parser.add_argument('--passo', type=float, required=True, help='passo de integração (s de planta)')
+    parser.add_argument('--escala', type=float, default=1.0, help='segundos de planta por segundo de relógio')
+    parser.add_argument('--saida-inicial', type=float, default=0.0, help='saída com a planta em repouso')
+    args = parser.parse_args(argv)
+    servir(PlantaTempoReal(args.k, args.tau, args.theta, args.passo, args.escala, args.saida_inicial))
+
+
+if __name__ == '__main__':
+    main()
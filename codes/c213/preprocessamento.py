@@ -0,0 +1,157 @@
+"""Pré-processamento da saída medida antes da identificação.
+
+Os métodos de dois pontos usam a última amostra como valor final e o
+primeiro cruzamento de cada nível, então uma única amostra ruidosa muda
+k, tau e theta. Aqui a saída passa por rejeição de outliers (filtro de
+Hampel: amostras a mais de `limite_outlier` desvios da mediana móvel
+viram a mediana; o desvio não fica abaixo da resolução de um sinal
+quantizado) e por um filtro de fase zero (média móvel,
+Savitzky–Golay ou mediana), e o valor final é a mediana de uma janela no
+fim do registro.
+
+Preprocessamento processa o registro bloco a bloco (memória de um bloco
+mais uma janela) e dá o mesmo resultado que filtrar o registro inteiro:
+como os filtros são centrados, cada bloco só é emitido quando a janela à
+direita chega, com atraso de `contexto` amostras. A exceção é o nível de
+ruído da rejeição de outliers, estimado a cada bloco.
+"""
+import numpy as np
+
+FILTROS = ('media', 'savgol', 'mediana')
+
+# Amostras da janela do filtro (ímpar) e do polinômio do Savitzky–Golay
+JANELA_PADRAO = 21
+ORDEM_SAVGOL = 2
+
+# Amostras do fim do registro usadas para estimar o regime permanente
+JANELA_FINAL = 1000
+
+# Fator que converte o desvio absoluto mediano em desvio padrão (gaussiano)
+_MAD_PARA_SIGMA = 1.4826
+
+
+def _quantum(x):
+    # Menor passo não nulo entre amostras vizinhas: a resolução de um sinal
+    # quantizado, abaixo da qual o desvio mediano (muitas vezes 0) não vale
+    passos = np.abs(np.diff(x))
+    passos = passos[passos > 0]
+    return float(passos.min()) if len(passos) else 0.0
+
+
+def _janela_impar(janela):
+    janela = int(janela)
+    if janela < 1:
+        raise ValueError('A janela do filtro deve ter pelo menos 1 amostra.')
+    return janela if janela % 2 else janela + 1
+
+
+class Preprocessamento:
+    """Rejeição de outliers + filtro + valor final, em streaming.
+
+    filtro: 'media', 'savgol', 'mediana' ou None (só outliers/valor final);
+    limite_outlier: None desliga a rejeição. Use atualizar() para cada bloco
+    e finalizar() no fim; cada chamada devolve o trecho filtrado pronto.
+    """
+
+    def __init__(self, filtro='media', janela=JANELA_PADRAO, ordem=ORDEM_SAVGOL,
+                 limite_outlier=None, janela_final=JANELA_FINAL):
+        if filtro is not None and filtro not in FILTROS:
+            raise ValueError(f'Filtro desconhecido: {filtro}')
+        self.filtro = filtro
+        self.janela = _janela_impar(janela)
+        if filtro == 'savgol' and ordem >= self.janela:
+            raise ValueError('A ordem do Savitzky–Golay deve ser menor que a janela.')
+        self.ordem = ordem
+        self.limite_outlier = limite_outlier
+        self.janela_final = int(janela_final)
+        # Amostras de cada lado necessárias para filtrar uma amostra
+        meia = self.janela // 2
+        self.contexto = (meia if filtro else 0) + (meia if limite_outlier is not None else 0)
+        self.outliers = 0
+        self._sigma = None
+        self._bruto = [np.empty(0), np.empty(0), np.empty(0)]  # tempo, entrada, saída ainda retidos
+        self._emitidos = 0  # quantos dos retidos já foram emitidos
+        self._final = np.empty(0)
+
+    def _rejeitar(self, x):
+        from scipy.ndimage import median_filter
+
+        mediana = median_filter(x, size=self.janela, mode='nearest')
+        residuo = x - mediana
+        # O nível de ruído vem de blocos grandes; o resto final reaproveita o último
+        if self._sigma is None or len(x) >= 4 * self.janela:
+            self._sigma = max(_MAD_PARA_SIGMA * float(np.median(np.abs(residuo))), _quantum(x))
+        if self._sigma == 0:
+            # Bloco constante: não há escala de ruído para comparar
+            return x, np.zeros(len(x), dtype=bool)
+        fora = np.abs(residuo) > self.limite_outlier * self._sigma
+        return np.where(fora, mediana, x), fora
+
+    def _filtrar(self, x):
+        if self.filtro == 'media':
+            from scipy.ndimage import uniform_filter1d
+            return uniform_filter1d(x, self.janela, mode='nearest')
+        if self.filtro == 'mediana':
+            from scipy.ndimage import median_filter
+            return median_filter(x, size=self.janela, mode='nearest')
+        if self.filtro == 'savgol':
+            from scipy.signal import savgol_filter
+            return savgol_filter(x, self.janela, self.ordem, mode='nearest')
+        return x
+
+    def _processar(self, fim):
+        # Filtra o trecho retido e emite as amostras [emitidos, fim)
+        tempo, entrada, saida = self._bruto
+        if fim <= self._emitidos:
+            return tempo[:0], entrada[:0], saida[:0]
+        x = saida
+        if self.limite_outlier is not None:
+            x, fora = self._rejeitar(x)
+            self.outliers += int(np.count_nonzero(fora[self._emitidos:fim]))
+        filtrada = self._filtrar(x)[self._emitidos:fim]
+        self._final = np.concatenate((self._final, filtrada))[-self.janela_final:]
+        return tempo[self._emitidos:fim], entrada[self._emitidos:fim], filtrada
+
+    def atualizar(self, tempo, entrada, saida):
+        """Acrescenta um bloco e devolve (tempo, entrada, saida_filtrada) já prontos."""
+        self._bruto = [np.concatenate((retido, np.asarray(novo, dtype=np.float64)))
+                       for retido, novo in zip(self._bruto, (tempo, entrada, saida))]
+        n = len(self._bruto[0])
+        pronto = self._processar(n - self.contexto)
+        # Mantém o contexto à esquerda das amostras ainda não emitidas
+        self._emitidos += len(pronto[0])
+        descarte = max(0, self._emitidos - self.contexto)
+        self._bruto = [campo[descarte:] for campo in self._bruto]
+        self._emitidos -= descarte
+        return pronto
+
+    def finalizar(self):
+        """Emite as últimas amostras (sem contexto à direita, como nas bordas)."""
+        pronto = self._processar(len(self._bruto[0]))
+        self._bruto = [campo[:0] for campo in self._bruto]
+        self._emitidos = 0
+        return pronto
+
+    def blocos(self, blocos):
+        """Aplica o pré-processamento a um iterável de blocos (tempo, entrada, saida)."""
+        for bloco in blocos:
+            pronto = self.atualizar(*bloco)
+            if len(pronto[0]):
+                yield pronto
+        pronto = self.finalizar()
+        if len(pronto[0]):
+            yield pronto
+
+    @property
+    def valor_final(self):
+        """Mediana da saída filtrada nas últimas janela_final amostras emitidas."""
+        if not len(self._final):
+            raise ValueError('Nenhuma amostra foi processada.')
+        return float(np.median(self._final))
+
+
+def preprocessar(tempo, entrada, saida, **opcoes):
+    """(saida_filtrada, valor_final) do registro em memória (opções de Preprocessamento)."""
+    etapa = Preprocessamento(**opcoes)
+    partes = [etapa.atualizar(tempo, entrada, saida)[2], etapa.finalizar()[2]]
+    return np.concatenate(partes), etapa.valor_final
@@ -0,0 +1,192 @@
+"""Identificação recursiva (online) de k, tau e theta com mínimos quadrados recursivos.
+
+Os métodos de dois pontos precisam do registro completo (valor final). Aqui
+o modelo é o ARX da planta FOPDT discretizada com segurador de ordem zero:
+
+    y[n] = a*y[n-1] + b*u[n-1-d] + c
+
+com d o atraso em amostras e c o nível de repouso da saída. Para cada
+atraso candidato (uma grade fixa de theta_min a theta_max) um estimador de mínimos
+quadrados recursivos com fator de esquecimento ajusta (a, b, c); o atraso
+escolhido é o de menor erro de predição (a priori), ponderado com o mesmo
+esquecimento e refinado por interpolação parabólica entre os candidatos
+vizinhos. Daí k = b/(1 - a), tau = -dt/ln(a) e theta = d*dt.
+
+Cada amostra custa O(atrasos), independente do tamanho do registro, e a
+memória é a das entradas dos últimos theta_max segundos: o estimador
+acompanha mudanças da planta durante a operação (o esquecimento define a
+memória, ~1/(1 - esquecimento) amostras) e pode alimentar as regras de
+sintonia a qualquer momento. Acompanhar a planta exige excitação (degraus,
+mudanças de setpoint): num ensaio de um único degrau, depois do regime o
+esquecimento apaga o transitório, e o registro deve ser processado com
+esquecimento=1 (mínimos quadrados sem esquecimento).
+
+O ARX por erro de equação é polarizado pelo ruído da saída quando cada
+passo muda pouco a saída (tau muito maior que dt): com decimacao > 1 cada
+passo do estimador usa a média de `decimacao` amostras consecutivas, o
+que reduz o ruído e aumenta a variação da saída por passo.
+"""
+import numpy as np
+
+# Fator de esquecimento padrão (memória de ~1000 amostras)
+ESQUECIMENTO_PADRAO = 0.999
+
+# Atrasos candidatos avaliados em paralelo (grade uniforme de theta_min a theta_max)
+ATRASOS_PADRAO = 64
+
+# Covariância inicial (P = P_INICIAL*I: sem confiança nos parâmetros iniciais)
+P_INICIAL = 1e6
+
+# Acima deste traço de P o esquecimento é suspenso (entrada sem excitação:
+# evita que P cresça sem limite e o estimador "exploda" no próximo degrau)
+TRACO_MAXIMO = 1e8
+
+
+class IdentificacaoRecursiva:
+    """Estimativa online de (k, tau, theta) amostra a amostra ou bloco a bloco.
+
+    theta_min e theta_max limitam o atraso procurado (s); o theta_min
+    padrão é uma amostra, porque no candidato sem atraso o ruído da entrada
+    medida, simultâneo ao da saída, se confunde com a dinâmica. dt (s) vem
+    das duas primeiras amostras quando não informado. entrada_inicial é a
+    entrada antes da primeira amostra (0: degrau aplicado em t = 0 com a
+    planta em repouso, como nos ensaios de reação). Com decimacao > 1 os
+    atrasos, dt e n se referem aos passos do estimador (médias das amostras).
+    """
+
+    def __init__(self, theta_max, dt=None, esquecimento=ESQUECIMENTO_PADRAO, atrasos=ATRASOS_PADRAO,
+                 entrada_inicial=0.0, theta_min=None, decimacao=1):
+        if not 0 < esquecimento <= 1:
+            raise ValueError('O fator de esquecimento deve estar em (0, 1].')
+        self.theta_max = float(theta_max)
+        self.theta_min = theta_min
+        self.dt = dt
+        self.esquecimento = float(esquecimento)
+        self.quantidade_atrasos = int(atrasos)
+        self.entrada_inicial = float(entrada_inicial)
+        self.decimacao = max(int(decimacao), 1)
+        self._grupo = [0, 0.0, 0.0]  # amostras, soma da entrada e da saída do passo em formação
+        self.n = 0
+        self.atrasos = None
+        self._y_anterior = None
+        self._primeira = None
+        if dt is not None:
+            self._iniciar(dt * self.decimacao)
+
+    def _iniciar(self, dt):
+        self.dt = float(dt)
+        minimo = 1 if self.theta_min is None else int(round(self.theta_min / self.dt))
+        maximo = max(int(round(self.theta_max / self.dt)), minimo)
+        # Passo inteiro: grade uniforme em amostras (a interpolação parabólica supõe isso)
+        passo = max(-(-(maximo - minimo) // max(self.quantidade_atrasos - 1, 1)), 1)
+        self.atrasos = np.arange(minimo, maximo + 1, passo, dtype=np.int64)
+        quantidade = len(self.atrasos)
+        # Entradas u[n-1-d] dos últimos max(d)+1 instantes (buffer circular)
+        self._tamanho = int(self.atrasos[-1]) + 1
+        self._entradas = np.full(self._tamanho, self.entrada_inicial)
+        self._parametros = np.zeros((quantidade, 3))
+        self._parametros[:, 0] = 0.5
+        self._covariancia = np.tile(P_INICIAL * np.eye(3), (quantidade, 1, 1))
+        self._custo = np.zeros(quantidade)
+        self._regressor = np.ones((quantidade, 3))
+
+    def amostra(self, t, u, y):
+        """Acrescenta uma amostra (instante, entrada, saída)."""
+        t, u, y = float(t), float(u), float(y)
+        if self.decimacao > 1:
+            grupo = self._grupo
+            grupo[0] += 1
+            grupo[1] += u
+            grupo[2] += y
+            if grupo[0] < self.decimacao:
+                return
+            u, y = grupo[1] / self.decimacao, grupo[2] / self.decimacao
+            self._grupo = [0, 0.0, 0.0]
+        self._passo(t, u, y)
+
+    def _passo(self, t, u, y):
+        if self._y_anterior is None:
+            # A primeira amostra só fornece y[n-1] (e, sem dt, o instante inicial)
+            if self.dt is not None:
+                self._comecar(u, y)
+                return
+            if self._primeira is None:
+                self._primeira = (t, u, y)
+                return
+            self._iniciar(t - self._primeira[0])
+            self._comecar(*self._primeira[1:])
+        self._atualizar(y)
+        self._empurrar(u)
+        self._y_anterior = y
+        self.n += 1
+
+    def _comecar(self, u, y):
+        self._empurrar(u)
+        self._y_anterior = y
+        self.n = 1
+
+    def atualizar(self, tempo, entrada, saida):
+        """Acrescenta um bloco de amostras (mesmo resultado que uma a uma)."""
+        for t, u, y in zip(np.asarray(tempo, dtype=np.float64).tolist(),
+                           np.asarray(entrada, dtype=np.float64).tolist(),
+                           np.asarray(saida, dtype=np.float64).tolist()):
+            self.amostra(t, u, y)
+
+    def _empurrar(self, u):
+        # u[n] entra na posição n do buffer circular
+        self._entradas[self.n % self._tamanho] = u
+
+    def _atualizar(self, y):
+        # Um passo de RLS para todos os atrasos candidatos ao mesmo tempo
+        lamb = self.esquecimento
+        phi = self._regressor
+        phi[:, 0] = self._y_anterior
+        phi[:, 1] = self._entradas[(self.n - 1 - self.atrasos) % self._tamanho]
+        erro = y - np.einsum('ij,ij->i', self._parametros, phi)
+        p_phi = np.einsum('ijk,ik->ij', self._covariancia, phi)
+        ganho = p_phi / (lamb + np.einsum('ij,ij->i', phi, p_phi))[:, None]
+        self._parametros += ganho * erro[:, None]
+        self._covariancia -= ganho[:, :, None] * p_phi[:, None, :]
+        # Esquecimento suspenso onde P já é grande (sem excitação)
+        traco = np.einsum('ijj->i', self._covariancia)
+        self._covariancia /= np.where(traco < TRACO_MAXIMO, lamb, 1.0)[:, None, None]
+        self._custo *= lamb
+        self._custo += erro * erro
+
+    def custos(self):
+        """(atrasos em s, erro de predição ponderado de cada candidato)."""
+        if self.atrasos is None:
+            raise ValueError('Nenhuma amostra foi acumulada.')
+        return self.atrasos * self.dt, self._custo.copy()
+
+    def resultado(self):
+        """(k, tau, theta) da melhor estimativa até agora (nan se a planta estimada não for estável)."""
+        if self.n < 2:
+            raise ValueError('São necessárias pelo menos duas amostras.')
+        melhor = int(np.argmin(self._custo))
+        a, b, _ = self._parametros[melhor]
+        atraso = float(self.atrasos[melhor])
+        if 0 < melhor < len(self.atrasos) - 1:
+            # Vértice da parábola pelos três candidatos em torno do mínimo
+            esquerda, centro, direita = self._custo[melhor - 1:melhor + 2]
+            curvatura = esquerda - 2 * centro + direita
+            if curvatura > 0:
+                passo = self.atrasos[1] - self.atrasos[0]
+                atraso += 0.5 * (esquerda - direita) / curvatura * passo
+        if not 0 < a < 1:
+            return np.nan, np.nan, np.nan
+        return float(b / (1 - a)), float(-self.dt / np.log(a)), float(atraso * self.dt)
+
+
+def identificar_recursivo(tempo, entrada, saida, theta_max=None, **opcoes):
+    """(k, tau, theta) do registro em memória pela identificação recursiva.
+
+    theta_max padrão: metade da duração do registro. Sem esquecimento
+    (esquecimento=1) a menos que informado, como convém a um ensaio de degrau.
+    """
+    if theta_max is None:
+        theta_max = 0.5 * (tempo[-1] - tempo[0])
+    opcoes.setdefault('esquecimento', 1.0)
+    estimador = IdentificacaoRecursiva(theta_max, **opcoes)
+    estimador.atualizar(tempo, entrada, saida)
+    return estimador.resultado()
@@ -0,0 +1,131 @@
+"""Análise de robustez por Monte Carlo: um controlador contra milhares de plantas.
+
+Os métodos de identificação dão k, tau e theta diferentes para o mesmo
+ensaio, mas os ganhos IMC/CHR saem de uma única estimativa. Aqui sorteamos
+perturbações da planta em torno da estimativa, simulamos o mesmo PID contra
+todas (em lotes vetorizados por simular_malha_fechada_lote, divididos entre
+processos) e resumimos as distribuições de sobressinal e acomodação e os
+piores casos.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from c213.metricas import metricas_degrau
+from c213.simulacao import simular_malha_fechada_lote
+from c213.sintonia import TAMANHO_LOTE
+
+DISTRIBUICOES = ('uniforme', 'normal')
+
+# Variação relativa padrão de k, tau e theta (theta costuma ser o menos confiável)
+VARIACAO_PADRAO = (0.1, 0.1, 0.2)
+
+AMOSTRAS_PADRAO = 2000
+
+# Percentis das distribuições no resumo
+PERCENTIS = (5, 50, 95)
+
+# Métricas resumidas (em todas, o pior caso é o maior valor)
+METRICAS_RESUMO = ('Overshoot', 'SettlingTime', 'RiseTime', 'ITAE')
+
+
+def amostrar_plantas(k, tau, theta, amostras=AMOSTRAS_PADRAO, variacao=VARIACAO_PADRAO,
+                     distribuicao='uniforme', semente=0):
+    """Sorteia (k, tau, theta), cada um um array de `amostras` plantas.
+
+    variacao é a variação relativa de cada parâmetro: 'uniforme' sorteia
+    em p*(1 +- v) e 'normal' em p*exp(N(0, v)) (sempre positivo). A
+    primeira amostra é sempre a planta nominal.
+    """
+    if distribuicao not in DISTRIBUICOES:
+        raise ValueError(f'Distribuição desconhecida: {distribuicao}')
+    nominal = np.array([k, tau, theta], dtype=np.float64)
+    variacao = np.broadcast_to(np.asarray(variacao, dtype=np.float64), (3,))
+    rng = np.random.default_rng(semente)
+    if distribuicao == 'uniforme':
+        fatores = 1 + rng.uniform(-variacao, variacao, size=(int(amostras), 3))
+    else:
+        fatores = np.exp(rng.normal(0.0, variacao, size=(int(amostras), 3)))
+    fatores[0] = 1.0
+    plantas = nominal * fatores
+    return plantas[:, 0], plantas[:, 1], plantas[:, 2]
+
+
+def variacao_entre_metodos(modelos):
+    """Variação relativa (k, tau, theta) que cobre as estimativas de vários métodos.
+
+    modelos é {método: (k, tau, theta)}, como o retorno de identificar;
+    resulta a meia amplitude entre as estimativas sobre a média de cada
+    parâmetro.
+    """
+    valores = np.array(list(modelos.values()), dtype=np.float64)
+    media = valores.mean(axis=0)
+    return tuple(float(v) for v in (valores.max(axis=0) - valores.min(axis=0)) / 2 / media)
+
+
+def _avaliar_lote(tempo, k, tau, theta, ganhos, setpoint, percentis):
+    respostas = simular_malha_fechada_lote(tempo, k, tau, theta, ganhos, setpoint)
+    metricas = metricas_degrau(tempo, respostas, valor_final=setpoint, referencia=setpoint)
+    # Só as faixas do lote voltam do processo, não as respostas (N x len(tempo))
+    return metricas, None if percentis is None else faixas(respostas, percentis)
+
+
+def avaliar_robustez(tempo, ganhos, k, tau, theta, setpoint=1.0, processos=None,
+                     tamanho_lote=TAMANHO_LOTE, percentis_faixas=None, contexto=None):
+    """Simula o PID `ganhos` (Kp, Ti, Td) contra cada planta (k[i], tau[i], theta[i]).
+
+    Retorna o dicionário de arrays de metricas_degrau (um valor por
+    planta). Com percentis_faixas retorna também as faixas das respostas
+    (len(percentis_faixas), len(tempo)), calculadas em cada lote e
+    combinadas pela média ponderada pelo tamanho dos lotes (exatas com um
+    só lote). Com processos > 1 os lotes são divididos entre processos
+    (contexto é o contexto do multiprocessing, ex.: 'spawn' dentro de
+    aplicações com threads).
+    """
+    k, tau, theta = (np.asarray(v, dtype=np.float64) for v in np.broadcast_arrays(k, tau, theta))
+    lotes = [(tempo, k[i:i + tamanho_lote], tau[i:i + tamanho_lote], theta[i:i + tamanho_lote],
+              ganhos, setpoint, percentis_faixas) for i in range(0, len(k), tamanho_lote)]
+    if processos and processos > 1 and len(lotes) > 1:
+        if isinstance(contexto, str):
+            import multiprocessing
+            contexto = multiprocessing.get_context(contexto)
+        with ProcessPoolExecutor(processos, mp_context=contexto) as executor:
+            resultados = list(executor.map(_avaliar_lote, *zip(*lotes)))
+    else:
+        resultados = [_avaliar_lote(*lote) for lote in lotes]
+    metricas = {nome: np.concatenate([r[0][nome] for r in resultados]) for nome in resultados[0][0]}
+    if percentis_faixas is not None:
+        pesos = [len(lote[1]) for lote in lotes]
+        return metricas, np.average([r[1] for r in resultados], axis=0, weights=pesos)
+    return metricas
+
+
+def resumir(metricas, k, tau, theta, percentis=PERCENTIS):
+    """Resumo das distribuições e piores casos.
+
+    Para cada métrica de METRICAS_RESUMO: média, percentis e o pior caso
+    (valor e planta). Malhas que não acomodam dentro da simulação (tempo de
+    acomodação nan, inclusive as instáveis) são contadas em
+    'nao_acomodam' e tratadas como pior caso de acomodação.
+    """
+    k, tau, theta = (np.asarray(v, dtype=np.float64) for v in np.broadcast_arrays(k, tau, theta))
+    resumo = {'amostras': len(k)}
+    for nome in METRICAS_RESUMO:
+        valores = np.asarray(metricas[nome], dtype=np.float64)
+        finitos = np.isfinite(valores)
+        distribuicao = {'media': float(np.mean(valores[finitos])) if finitos.any() else None}
+        if finitos.any():
+            quantis = np.percentile(valores[finitos], percentis)
+            distribuicao.update({f'p{p}': float(v) for p, v in zip(percentis, quantis)})
+        # O pior caso prefere as malhas sem valor definido (não acomodam)
+        pior = int(np.argmax(np.where(finitos, valores, np.inf)))
+        distribuicao['pior'] = {'valor': float(valores[pior]) if finitos[pior] else None,
+                                'k': float(k[pior]), 'tau': float(tau[pior]), 'theta': float(theta[pior])}
+        resumo[nome] = distribuicao
+    resumo['nao_acomodam'] = float(np.mean(~np.isfinite(metricas['SettlingTime'])))
+    return resumo
+
+
+def faixas(respostas, percentis=PERCENTIS):
+    """Percentis das respostas em cada instante: matriz (len(percentis), len(tempo))."""
+    return np.percentile(respostas, percentis, axis=0)
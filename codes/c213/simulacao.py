@@ -0,0 +1,252 @@
+"""Simulação de modelos de primeira ordem com atraso (FOPDT) com atraso exato.
+
+Modelo: G(s) = k * exp(-theta*s) / (tau * s + 1)
+
+Substitui a aproximação de Padé + ctrl.step_response: a resposta ao degrau
+tem forma fechada e o atraso é aplicado exatamente, sem erro de aproximação.
+"""
+import numpy as np
+
+
+def resposta_degrau_fopdt(tempo, k, tau, theta, amplitude=1.0):
+    """Resposta exata ao degrau de amplitude `amplitude` aplicado em t = 0.
+
+    y(t) = amplitude * k * (1 - exp(-(t - theta)/tau)) para t > theta, 0 antes.
+    k, tau e theta podem ser arrays (ex.: formato (N, 1)) para simular vários
+    modelos de uma vez por broadcasting.
+    """
+    tempo = np.asarray(tempo, dtype=np.float64)
+    decorrido = np.maximum(tempo - theta, 0.0)
+    return -amplitude * k * np.expm1(-decorrido / tau)
+
+
+def resposta_degrau_sopdt(tempo, k, tau1, tau2, theta, amplitude=1.0):
+    """Resposta exata ao degrau de k * exp(-theta*s) / ((tau1*s + 1)(tau2*s + 1)).
+
+    Para tau1 == tau2 usa a forma do polo duplo.
+    """
+    tempo = np.asarray(tempo, dtype=np.float64)
+    decorrido = np.maximum(tempo - theta, 0.0)
+    if np.isclose(tau1, tau2, rtol=1e-9, atol=0.0):
+        forma = 1 - (1 + decorrido/tau1) * np.exp(-decorrido/tau1)
+    else:
+        forma = 1 - (tau1*np.exp(-decorrido/tau1) - tau2*np.exp(-decorrido/tau2)) / (tau1 - tau2)
+    return amplitude * k * forma
+
+
+def malha_fechada_unitaria(k, tau):
+    """(k, tau) de feedback(G, 1) para G = k/(tau*s + 1), que continua de 1ª ordem."""
+    return k / (1 + k), tau / (1 + k)
+
+
+def coeficientes_discretos(k, tau, theta, dt):
+    """Discretização exata (segurador de ordem zero) com atraso fracionário.
+
+    Retorna (a, b1, b2, m) de y[n+1] = a*y[n] + b1*u[n-m] + b2*u[n-m-1],
+    com theta = m*dt + delta, 0 <= delta < dt. Aceita escalares ou arrays.
+    """
+    k, tau, theta = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (k, tau, theta)))
+    theta = np.maximum(theta, 0.0)
+    m = np.floor(theta / dt + 1e-9).astype(np.int64)
+    delta = np.maximum(theta - m*dt, 0.0)
+    a = np.exp(-dt / tau)
+    resto = np.exp(-(dt - delta) / tau)
+    b1 = k * (1 - resto)
+    b2 = k * (resto - a)
+    if m.ndim == 0:
+        return float(a), float(b1), float(b2), int(m)
+    return a, b1, b2, m
+
+
+def simular_fopdt(tempo, entrada, k, tau, theta):
+    """Resposta a uma entrada qualquer (constante entre amostras, grade uniforme)."""
+    from scipy.signal import lfilter  # adiado: o scipy.signal é lento de importar
+
+    tempo = np.asarray(tempo, dtype=np.float64)
+    entrada = np.asarray(entrada, dtype=np.float64)
+    dt = tempo[1] - tempo[0]
+    a, b1, b2, m = coeficientes_discretos(k, tau, theta, dt)
+    numerador = np.zeros(m + 3)
+    numerador[m + 1] = b1
+    numerador[m + 2] = b2
+    return lfilter(numerador, [1.0, -a], entrada)
+
+
+# ---------------------------------------------------------------------------
+# Malha fechada PID + FOPDT
+# ---------------------------------------------------------------------------
+
+# Razão Td/(constante do filtro derivativo), como em Kp*Td*s/(Td/N*s + 1)
+N_FILTRO = 10
+
+
+def coeficientes_pid(kp, ti, td, dt, n_filtro=N_FILTRO):
+    """Coeficientes do PID discreto (integral por Euler, derivada filtrada).
+
+    Retorna (ki, kd, cd) de:
+        I[n+1] = I[n] + ki*e[n]
+        D[n]   = cd*D[n-1] + kd*(e[n] - e[n-1])
+    Ti <= 0 ou infinito desliga a ação integral. Aceita escalares ou arrays.
+    """
+    kp, ti, td = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (kp, ti, td)))
+    com_integral = (ti > 0) & np.isfinite(ti)
+    ki = np.divide(kp * dt, ti, out=np.zeros(kp.shape), where=com_integral)
+    cd = td / (td + n_filtro*dt)
+    kd = kp * td * n_filtro / (td + n_filtro*dt)
+    if ki.ndim == 0:
+        return float(ki), float(kd), float(cd)
+    return ki, kd, cd
+
+
+# A partir deste atraso (em amostras) a simulação em blocos compensa
+ATRASO_MINIMO_BLOCOS = 32
+
+
+def simular_malha_fechada(tempo, k, tau, theta, kp, ti, td, setpoint=1.0, n_filtro=N_FILTRO):
+    """Resposta da malha PID + FOPDT a um degrau de setpoint em t = 0.
+
+    A planta é discretizada exatamente (segurador de ordem zero) e o atraso
+    theta é aplicado em amostras, sem aproximação de Padé. O PID é
+    Kp*(1 + 1/(Ti*s) + Td*s/(Td/N*s + 1)) com derivada filtrada. A grade de
+    tempo deve ser uniforme.
+    """
+    tempo = np.asarray(tempo, dtype=np.float64)
+    dt = tempo[1] - tempo[0]
+    planta = coeficientes_discretos(k, tau, theta, dt)
+    pid = (kp,) + coeficientes_pid(kp, ti, td, dt, n_filtro)
+    if planta[3] >= ATRASO_MINIMO_BLOCOS:
+        return _simular_em_blocos(len(tempo), planta, pid, setpoint)
+    return _simular_por_amostra(len(tempo), planta, pid, setpoint)
+
+
+def _simular_por_amostra(n, planta, pid, setpoint):
+    a, b1, b2, m = planta
+    kp, ki, kd, cd = pid
+    # Buffer circular com u[n-m-1] ... u[n]; a planta está em repouso antes de t = 0
+    tamanho = m + 2
+    buffer = [0.0] * tamanho
+    saida = np.empty(n)
+    y = integral = derivada = erro_anterior = 0.0
+    for i in range(n):
+        saida[i] = y
+        erro = setpoint - y
+        derivada = cd*derivada + kd*(erro - erro_anterior)
+        buffer[i % tamanho] = kp*erro + integral + derivada
+        integral += ki*erro
+        erro_anterior = erro
+        y = a*y + b1*buffer[(i - m) % tamanho] + b2*buffer[(i - m - 1) % tamanho]
+    return saida
+
+
+def _simular_em_blocos(n, planta, pid, setpoint):
+    # Com atraso de m amostras, as saídas de um bloco de m amostras só dependem
+    # de controles já calculados em blocos anteriores: cada bloco é resolvido
+    # de forma vetorizada (lfilter) e o laço em Python faz só n/m iterações.
+    from scipy.signal import lfilter
+
+    a, b1, b2, m = planta
+    kp, ki, kd, cd = pid
+    controle = np.zeros(n + m + 1)  # u[j] fica em controle[j + m + 1]; zeros antes de t = 0
+    saida = np.empty(n)
+    y = integral = estado_derivada = 0.0
+    for inicio in range(0, n, m):
+        fim = min(inicio + m, n)
+        forcamento = b1*controle[inicio + 1:fim + 1] + b2*controle[inicio:fim]
+        proximas, _ = lfilter([1.0], [1.0, -a], forcamento, zi=[a*y])
+        bloco = saida[inicio:fim]
+        bloco[0] = y
+        bloco[1:] = proximas[:-1]
+        y = proximas[-1]
+
+        erro = setpoint - bloco
+        derivada, estado = lfilter([kd, -kd], [1.0, -cd], erro, zi=[estado_derivada])
+        estado_derivada = estado[0]
+        acumulado = np.cumsum(erro)
+        controle[inicio + m + 1:fim + m + 1] = kp*erro + integral + ki*(acumulado - erro) + derivada
+        integral += ki*acumulado[-1]
+    return saida
+
+
+def simular_malha_fechada_lote(tempo, k, tau, theta, ganhos, setpoint=1.0, n_filtro=N_FILTRO):
+    """Simula de uma vez N malhas PID + FOPDT.
+
+    ganhos é uma matriz (N, 3) com colunas Kp, Ti, Td (ou um vetor (3,),
+    comum a todas as malhas); k, tau e theta são escalares ou arrays de
+    tamanho N, uma planta por malha (ex.: perturbações do modelo). Os
+    estados do PID e o buffer do atraso são arrays de tamanho N, então cada
+    passo de tempo avança todas as malhas juntas. Retorna as respostas em
+    uma matriz (N, len(tempo)), equivalente a chamar simular_malha_fechada
+    N vezes.
+    """
+    tempo = np.asarray(tempo, dtype=np.float64)
+    ganhos = np.asarray(ganhos, dtype=np.float64)
+    n = len(tempo)
+    dt = tempo[1] - tempo[0]
+    a, b1, b2, m = coeficientes_discretos(k, tau, theta, dt)
+    quantidade = max(len(np.atleast_2d(ganhos)), np.size(m))
+    ganhos = np.broadcast_to(ganhos, (quantidade, 3))
+    kp = ganhos[:, 0]
+    ki, kd, cd = coeficientes_pid(kp, ganhos[:, 1], ganhos[:, 2], dt, n_filtro)
+
+    # Com uma planta por malha o atraso m varia: as leituras do buffer viram
+    # índices (linha do atraso de cada malha, coluna da malha)
+    por_planta = np.ndim(m) > 0
+    tamanho = int(np.max(m)) + 2
+    colunas = np.arange(quantidade)
+    buffer = np.zeros((tamanho, quantidade))
+    saida = np.empty((n, quantidade))
+    y = np.zeros(quantidade)
+    integral = np.zeros_like(y)
+    derivada = np.zeros_like(y)
+    erro_anterior = np.zeros_like(y)
+    erro = np.empty_like(y)
+    for i in range(n):
+        saida[i] = y
+        np.subtract(setpoint, y, out=erro)
+        derivada *= cd
+        derivada += kd*(erro - erro_anterior)
+        controle = buffer[i % tamanho]
+        np.multiply(kp, erro, out=controle)
+        controle += integral
+        controle += derivada
+        integral += ki*erro
+        erro, erro_anterior = erro_anterior, erro
+        if por_planta:
+            y = a*y + b1*buffer[(i - m) % tamanho, colunas] + b2*buffer[(i - m - 1) % tamanho, colunas]
+        else:
+            y = a*y + b1*buffer[(i - m) % tamanho] + b2*buffer[(i - m - 1) % tamanho]
+    return saida.T
+
+
+# ---------------------------------------------------------------------------
+# Horizonte da malha fechada
+# ---------------------------------------------------------------------------
+
+# Maior horizonte das simulações de malha fechada, em durações do ensaio
+HORIZONTE_MAXIMO = 16
+
+
+def simular_ate_acomodar(tempo, k, tau, theta, kp, ti, td, setpoint=1.0, horizonte_maximo=HORIZONTE_MAXIMO):
+    """(t, y) da malha PID + FOPDT numa grade longa o bastante para acomodar.
+
+    Política de horizonte de todas as simulações de malha fechada (scripts,
+    interface e linha de comando): a grade do ensaio, com o mesmo dt, é
+    dobrada até a resposta passar a metade final dentro da faixa de
+    acomodação, até no máximo horizonte_maximo vezes a duração do ensaio.
+    Se o desvio da metade final não diminui em relação ao da primeira
+    (malha instável ou oscilação mantida), a grade não cresce mais.
+    """
+    from c213.metricas import FAIXA_ACOMODACAO
+
+    tempo = np.asarray(tempo, dtype=np.float64)
+    dt = tempo[1] - tempo[0]
+    t = tempo
+    while True:
+        y = simular_malha_fechada(t, k, tau, theta, kp, ti, td, setpoint)
+        desvio = np.abs(y - setpoint)
+        meio = len(t) // 2
+        if (np.all(desvio[meio:] <= FAIXA_ACOMODACAO * abs(setpoint))
+                or not np.max(desvio[meio:]) < np.max(desvio[:meio])
+                or 2 * len(t) > horizonte_maximo * len(tempo)):
+            return t, y
+        t = tempo[0] + dt * np.arange(2 * len(t))
@@ -0,0 +1,245 @@
+"""Geração de ensaios sintéticos no formato reactionExperiment.
+
+Simula o degrau numa planta FOPDT (ou SOPDT, com tau2) de parâmetros
+conhecidos, com ruído gaussiano na saída, e grava o resultado em .mat v5
+ou .mat v7.3 (HDF5) bloco a bloco: a memória usada é a de um bloco, não a
+do registro, então dá para gerar centenas de milhões de amostras. Os
+arquivos são lidos por carregar_dataset/ler_blocos como o ensaio real:
+
+    python -m c213.sintetico ensaio.mat --amostras 1e8 --k 2 --tau 3000 --theta 1500 --ruido 0.5
+    python -m c213.sintetico ensaio.mat --amostras 1e6 --formato v5 --tau2 800 --avaliar
+
+A saída (JSON) traz os parâmetros usados e, com --avaliar, o erro de cada
+método de identificação em relação a eles e a vazão da leitura.
+"""
+import argparse
+import json
+from pathlib import Path
+import struct
+import sys
+import time
+
+import numpy as np
+
+from c213.dados import CAMPOS, TAMANHO_BLOCO, _importar_h5py
+from c213.simulacao import resposta_degrau_fopdt, resposta_degrau_sopdt
+
+FORMATOS = ('v7.3', 'v5')
+
+# Um elemento miMATRIX do .mat v5 tem tamanho em 32 bits: acima disso, só v7.3
+_LIMITE_V5 = 2**32 - 1
+
+# Tipos e classes do formato .mat v5
+_MI_INT8, _MI_INT32, _MI_UINT32, _MI_DOUBLE, _MI_MATRIX = 1, 5, 6, 9, 14
+_MX_STRUCT, _MX_DOUBLE = 2, 6
+_TAMANHO_NOME_CAMPO = 32
+
+
+def gerar_blocos(n, k, tau, theta, tau2=None, dt=1.0, amplitude=1.0, ruido=0.0,
+                 saida_inicial=0.0, semente=0, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera blocos (tempo, entrada, saida) de um degrau de `amplitude` em t = 0.
+
+    A resposta é exata (forma fechada) em cada bloco, então o resultado não
+    depende do tamanho do bloco, nem o ruído (desvio padrão `ruido`, na
+    unidade da saída), que vem de um único gerador com a `semente` dada.
+    """
+    n = int(n)
+    gerador = np.random.default_rng(semente)
+    for inicio in range(0, n, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, n)
+        tempo = np.arange(inicio, fim, dtype=np.float64) * dt
+        entrada = np.full(fim - inicio, float(amplitude))
+        if tau2 is None:
+            saida = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude)
+        else:
+            saida = resposta_degrau_sopdt(tempo, k, tau, tau2, theta, amplitude)
+        saida += saida_inicial
+        if ruido:
+            saida += gerador.normal(0.0, ruido, fim - inicio)
+        yield tempo, entrada, saida
+
+
+def gerar_registro(n, k, tau, theta, **opcoes):
+    """(tempo, entrada, saida) inteiros em memória (mesmas opções de gerar_blocos)."""
+    opcoes.setdefault('tamanho_bloco', max(int(n), 1))
+    blocos = list(gerar_blocos(n, k, tau, theta, **opcoes))
+    if len(blocos) == 1:
+        return blocos[0]
+    return tuple(np.concatenate(campo) for campo in zip(*blocos))
+
+
+# ---------------------------------------------------------------------------
+# Gravação
+# ---------------------------------------------------------------------------
+
+def _cabecalho_mat(versao, texto):
+    # 116 bytes de texto, 8 de deslocamento de subsistema, versão e indicador de endianness
+    texto = texto.encode('ascii')[:116].ljust(116, b' ')
+    return texto + b'\0' * 8 + struct.pack('<H', versao) + b'IM'
+
+
+def _texto_cabecalho(versao):
+    return f'MATLAB {versao} MAT-file, Platform: c213.sintetico, Created on: {time.asctime()}'
+
+
+def _gravar_hdf5(caminho, n, parametros, opcoes):
+    h5py = _importar_h5py()
+    tamanho_bloco = opcoes.get('tamanho_bloco', TAMANHO_BLOCO)
+    # O MATLAB grava o vetor 1xN como dataset (N, 1); o bloco de usuário de 512
+    # bytes recebe o cabeçalho do .mat, como nos arquivos salvos com -v7.3
+    with h5py.File(caminho, 'w', userblock_size=512) as arquivo:
+        grupo = arquivo.create_group('reactionExperiment')
+        grupo.attrs['MATLAB_class'] = np.bytes_('struct')
+        grupo.attrs['parametros_sinteticos'] = json.dumps(parametros)
+        campos = []
+        for nome in CAMPOS:
+            dataset = grupo.create_dataset(nome, shape=(n, 1), dtype=np.float64,
+                                           chunks=(min(tamanho_bloco, max(n, 1)), 1))
+            dataset.attrs['MATLAB_class'] = np.bytes_('double')
+            campos.append(dataset)
+        inicio = 0
+        for bloco in gerar_blocos(n, **opcoes):
+            fim = inicio + len(bloco[0])
+            for dataset, valores in zip(campos, bloco):
+                dataset[inicio:fim, 0] = valores
+            inicio = fim
+    with open(caminho, 'r+b') as arquivo:
+        arquivo.write(_cabecalho_mat(0x0200, _texto_cabecalho('7.3')).ljust(512, b'\0'))
+
+
+def _elemento(tipo, dados):
+    # Tag (tipo, tamanho) + dados com preenchimento até múltiplo de 8 bytes
+    return struct.pack('<II', tipo, len(dados)) + dados + b'\0' * (-len(dados) % 8)
+
+
+def _inicio_matriz(classe, dimensoes, nome, tamanho_dados):
+    # Tag miMATRIX + flags, dimensões e nome; os dados (tamanho_dados bytes) vêm em seguida
+    corpo = (_elemento(_MI_UINT32, struct.pack('<II', classe, 0))
+             + _elemento(_MI_INT32, struct.pack('<%di' % len(dimensoes), *dimensoes))
+             + _elemento(_MI_INT8, nome.encode('ascii')))
+    return struct.pack('<II', _MI_MATRIX, len(corpo) + tamanho_dados) + corpo
+
+
+def _gravar_v5(caminho, n, opcoes):
+    bytes_campo = 8 * n
+    # Cada campo: tag miMATRIX (8) + flags (16) + dimensões (16) + nome vazio (8) + tag miDOUBLE (8) + dados
+    tamanho_campo = 8 + 48 + bytes_campo
+    nomes = b''.join(nome.encode('ascii').ljust(_TAMANHO_NOME_CAMPO, b'\0') for nome in CAMPOS)
+    cabecalho_struct = (struct.pack('<HHi', _MI_INT32, 4, _TAMANHO_NOME_CAMPO)  # elemento compacto
+                        + _elemento(_MI_INT8, nomes))
+    tamanho_struct = len(cabecalho_struct) + len(CAMPOS) * tamanho_campo
+    inicio_struct = _inicio_matriz(_MX_STRUCT, (1, 1), 'reactionExperiment', tamanho_struct)
+    if len(inicio_struct) - 8 + tamanho_struct > _LIMITE_V5:
+        raise ValueError(f'{n} amostras não cabem num .mat v5 (limite de 4 GiB por variável); '
+                         'use o formato v7.3.')
+
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(_cabecalho_mat(0x0100, _texto_cabecalho('5.0')))
+        arquivo.write(inicio_struct + cabecalho_struct)
+        # Os campos ficam em sequência no arquivo: tempo e entrada são gerados
+        # de novo (são baratos); o ruído da saída sai de uma única passada
+        for indice in range(len(CAMPOS)):
+            arquivo.write(_inicio_matriz(_MX_DOUBLE, (1, n), '', 8 + bytes_campo))
+            arquivo.write(struct.pack('<II', _MI_DOUBLE, bytes_campo))
+            if indice < 2:
+                blocos = gerar_blocos(n, **dict(opcoes, ruido=0.0))
+            else:
+                blocos = gerar_blocos(n, **opcoes)
+            for bloco in blocos:
+                arquivo.write(np.ascontiguousarray(bloco[indice], dtype='<f8').tobytes())
+
+
+def gravar(caminho, n, k, tau, theta, formato='v7.3', **opcoes):
+    """Grava o ensaio sintético em `caminho` e retorna os parâmetros usados.
+
+    formato 'v7.3' (HDF5, requer h5py) ou 'v5' (limitado a ~178 milhões de
+    amostras). As demais opções são as de gerar_blocos.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f'Formato desconhecido: {formato}')
+    n = int(n)
+    opcoes.update(k=k, tau=tau, theta=theta)
+    parametros = {chave: valor for chave, valor in opcoes.items() if chave != 'tamanho_bloco'}
+    parametros.update(amostras=n, formato=formato)
+    if formato == 'v7.3':
+        _gravar_hdf5(caminho, n, parametros, opcoes)
+    else:
+        _gravar_v5(caminho, n, opcoes)
+    return parametros
+
+
+def parametros_gravados(caminho):
+    """Parâmetros de um .mat v7.3 gerado por gravar (None se não houver)."""
+    h5py = _importar_h5py()
+    with h5py.File(caminho, 'r') as arquivo:
+        texto = arquivo['reactionExperiment'].attrs.get('parametros_sinteticos')
+    return json.loads(texto) if texto is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Avaliação
+# ---------------------------------------------------------------------------
+
+def avaliar_identificacao(caminho, k, tau, theta, metodos=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Identifica o arquivo em blocos e compara com os parâmetros verdadeiros.
+
+    Retorna {'segundos', 'amostras_por_s', 'metodos': {método: {k, tau,
+    theta, erro_k, erro_tau, erro_theta}}} com os erros relativos.
+    """
+    from c213.dados import contar_amostras
+    from c213.identificacao import identificar_arquivo
+
+    inicio = time.perf_counter()
+    resultados = identificar_arquivo(caminho, metodos, tamanho_bloco)
+    segundos = time.perf_counter() - inicio
+    verdadeiros = {'k': k, 'tau': tau, 'theta': theta}
+    metodos_avaliados = {}
+    for metodo, estimados in resultados.items():
+        avaliado = dict(zip(verdadeiros, estimados))
+        for nome, verdadeiro in verdadeiros.items():
+            avaliado[f'erro_{nome}'] = (avaliado[nome] - verdadeiro) / verdadeiro if verdadeiro else None
+        metodos_avaliados[metodo] = avaliado
+    return {'segundos': segundos, 'amostras_por_s': contar_amostras(caminho, tamanho_bloco) / segundos,
+            'metodos': metodos_avaliados}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera um ensaio reactionExperiment sintético.')
+    parser.add_argument('arquivo', help='arquivo .mat de saída')
+    parser.add_argument('--amostras', type=float, default=1e6, help='número de amostras (ex.: 1e8)')
+    parser.add_argument('--k', type=float, default=5.0, help='ganho estático')
+    parser.add_argument('--tau', type=float, default=3500.0, help='constante de tempo (s)')
+    parser.add_argument('--tau2', type=float, help='segunda constante de tempo (s): planta SOPDT')
+    parser.add_argument('--theta', type=float, default=1500.0, help='atraso (s)')
+    parser.add_argument('--dt', type=float, help='período de amostragem (s); padrão: 10*(tau+theta)/amostras')
+    parser.add_argument('--amplitude', type=float, default=1.0, help='amplitude do degrau de entrada')
+    parser.add_argument('--ruido', type=float, default=0.0, help='desvio padrão do ruído na saída')
+    parser.add_argument('--saida-inicial', type=float, default=0.0, help='valor da saída antes do degrau')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--formato', choices=FORMATOS, default='v7.3')
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO)
+    parser.add_argument('--avaliar', action='store_true',
+                        help='identifica o arquivo gerado e mede o erro e a vazão')
+    args = parser.parse_args(argv)
+
+    n = int(args.amostras)
+    dt = args.dt if args.dt is not None else 10 * (args.tau + (args.tau2 or 0.0) + args.theta) / n
+    inicio = time.perf_counter()
+    try:
+        parametros = gravar(args.arquivo, n, args.k, args.tau, args.theta, args.formato, tau2=args.tau2,
+                            dt=dt, amplitude=args.amplitude, ruido=args.ruido,
+                            saida_inicial=args.saida_inicial, semente=args.semente,
+                            tamanho_bloco=args.tamanho_bloco)
+    except (ImportError, ValueError) as erro:
+        parser.exit(1, f'{parser.prog}: erro: {erro}\n')
+    segundos = time.perf_counter() - inicio
+    resultado = {'arquivo': str(Path(args.arquivo)), 'parametros': parametros,
+                 'gravacao': {'segundos': segundos, 'amostras_por_s': n / segundos}}
+    if args.avaliar:
+        resultado['identificacao'] = avaliar_identificacao(args.arquivo, args.k, args.tau, args.theta,
+                                                           tamanho_bloco=args.tamanho_bloco)
+    sys.stdout.write(json.dumps(resultado, indent=2, ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Sintonia de controladores PID para o modelo FOPDT identificado.
+
+Além das regras IMC e CHR, oferece uma otimização que busca Kp, Ti e Td (ou o
+lambda do IMC) minimizando IAE/ISE/ITAE com restrições de sobressinal e tempo
+de acomodação. Pela linha de comando (c213.cli):
+
+    python -m c213 tune Dataset_Grupo9.mat --regras otimo --custo ITAE --sobressinal-max 5
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from c213.metricas import metricas_degrau
+from c213.simulacao import simular_malha_fechada_lote
+
+# Candidatos simulados por vez (limita a memória das respostas N x n)
+TAMANHO_LOTE = 512
+
+
+def avaliar_pid_lote(tempo, k, tau, theta, ganhos, setpoint=1.0, tamanho_lote=TAMANHO_LOTE):
+    """Simula e avalia uma matriz (N, 3) de ganhos Kp, Ti, Td de uma vez.
+
+    Retorna um dicionário de arrays de tamanho N com as métricas de
+    metricas_degrau de cada candidato (em relação ao setpoint).
+    """
+    ganhos = np.atleast_2d(np.asarray(ganhos, dtype=np.float64))
+    partes = []
+    for inicio in range(0, len(ganhos), tamanho_lote):
+        respostas = simular_malha_fechada_lote(tempo, k, tau, theta,
+                                               ganhos[inicio:inicio + tamanho_lote], setpoint)
+        partes.append(metricas_degrau(tempo, respostas, valor_final=setpoint, referencia=setpoint))
+    return {nome: np.concatenate([parte[nome] for parte in partes]) for nome in partes[0]}
+
+
+# ---------------------------------------------------------------------------
+# Regras de sintonia
+# ---------------------------------------------------------------------------
+
+def sintonia_imc(k, tau, theta, lamb):
+    """Kp, Ti, Td pela regra IMC (lamb é a constante de tempo de malha fechada)."""
+    kp = ((2*tau)+theta)/(k*((2*lamb)+theta))
+    ti = tau+(theta/2)
+    td = (tau*theta)/((2*tau)+theta)
+    return kp, ti, td
+
+
+def sintonia_chr(k, tau, theta):
+    """Kp, Ti, Td pela regra CHR sem sobrevalor."""
+    return 0.95 * tau / (k * theta), 2.4 * tau, 0.42 * tau
+
+
+# ---------------------------------------------------------------------------
+# Otimização
+# ---------------------------------------------------------------------------
+
+CUSTOS = ('IAE', 'ISE', 'ITAE')
+
+# Peso das violações de restrição no custo
+PENALIDADE = 100.0
+
+
+def custo_lote(metricas, custo='ITAE', sobressinal_max=None, acomodacao_max=None):
+    """Custo de cada candidato, penalizado pelas restrições violadas.
+
+    Malhas instáveis ou que não acomodam dentro da simulação recebem custo
+    infinito quando há restrição de acomodação.
+    """
+    if custo not in CUSTOS:
+        raise ValueError(f'Custo desconhecido: {custo} (use {", ".join(CUSTOS)})')
+    valor = np.where(np.isfinite(metricas[custo]), metricas[custo], np.inf)
+    violacao = np.zeros_like(valor)
+    if sobressinal_max is not None:
+        violacao += np.maximum(metricas['Overshoot'] - sobressinal_max, 0) / max(sobressinal_max, 1.0)
+    if acomodacao_max is not None:
+        acomodacao = metricas['SettlingTime']
+        violacao += np.where(np.isnan(acomodacao), np.inf,
+                             np.maximum(acomodacao - acomodacao_max, 0) / acomodacao_max)
+    return valor * (1 + PENALIDADE*violacao)
+
+
+def _avaliar(tempo, k, tau, theta, ganhos, executor, processos):
+    # Divide os candidatos entre os processos; sem executor avalia no processo atual
+    if executor is None:
+        return avaliar_pid_lote(tempo, k, tau, theta, ganhos)
+    partes = np.array_split(ganhos, processos)
+    resultados = list(executor.map(avaliar_pid_lote, *zip(*[(tempo, k, tau, theta, p) for p in partes])))
+    return {nome: np.concatenate([r[nome] for r in resultados]) for nome in resultados[0]}
+
+
+def _resultado(ganhos, metricas, custos, i, **extras):
+    resultado = {'Kp': float(ganhos[i, 0]), 'Ti': float(ganhos[i, 1]), 'Td': float(ganhos[i, 2])}
+    resultado.update(extras)
+    resultado['Custo'] = float(custos[i])
+    resultado.update({nome: float(valor[i]) for nome, valor in metricas.items()})
+    return resultado
+
+
+def otimizar_pid(tempo, k, tau, theta, custo='ITAE', sobressinal_max=None, acomodacao_max=None,
+                 inicial=None, populacao=256, iteracoes=12, fracao_elite=0.1, semente=0, processos=None):
+    """Busca Kp, Ti e Td que minimizam o custo, pelo método da entropia cruzada.
+
+    A cada iteração sorteia `populacao` candidatos (em escala logarítmica) ao
+    redor da média atual, avalia todos em lote e recentra a distribuição nos
+    melhores. Parte da sintonia CHR se `inicial` não for informado. Com
+    processos > 1 os candidatos são divididos entre processos.
+    Retorna um dicionário com Kp, Ti, Td, Custo e as métricas do melhor.
+    """
+    if inicial is None:
+        inicial = sintonia_chr(k, tau, theta)
+    kp0, ti0, td0 = inicial
+    rng = np.random.default_rng(semente)
+    media = np.log([kp0, ti0, max(td0, 1e-3*ti0)])
+    desvio = np.ones(3)
+    n_elite = max(2, int(populacao*fracao_elite))
+    melhor = None
+
+    executor = ProcessPoolExecutor(processos) if processos and processos > 1 else None
+    try:
+        for _ in range(iteracoes):
+            amostras = rng.normal(media, desvio, size=(populacao, 3))
+            amostras[0] = media
+            ganhos = np.exp(amostras)
+            metricas = _avaliar(tempo, k, tau, theta, ganhos, executor, processos)
+            custos = custo_lote(metricas, custo, sobressinal_max, acomodacao_max)
+            ordem = np.argsort(custos)
+            if melhor is None or custos[ordem[0]] < melhor['Custo']:
+                melhor = _resultado(ganhos, metricas, custos, ordem[0])
+            elite = amostras[ordem[:n_elite]]
+            media = elite.mean(axis=0)
+            desvio = np.maximum(elite.std(axis=0), 1e-3)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return melhor
+
+
+def otimizar_lambda_imc(tempo, k, tau, theta, custo='ITAE', sobressinal_max=None, acomodacao_max=None,
+                        lambdas=None):
+    """Escolhe o lambda do IMC que minimiza o custo, avaliando uma grade em lote.
+
+    A grade padrão vai de 0,1*theta a 10*theta em escala logarítmica.
+    Retorna um dicionário com Lambda, Kp, Ti, Td, Custo e as métricas.
+    """
+    if lambdas is None:
+        lambdas = np.geomspace(0.1*theta, 10*theta, 64)
+    lambdas = np.asarray(lambdas, dtype=np.float64)
+    kp, ti, td = sintonia_imc(k, tau, theta, lambdas)
+    ganhos = np.column_stack(np.broadcast_arrays(kp, ti, td))
+    metricas = avaliar_pid_lote(tempo, k, tau, theta, ganhos)
+    custos = custo_lote(metricas, custo, sobressinal_max, acomodacao_max)
+    i = int(np.argmin(custos))
+    return _resultado(ganhos, metricas, custos, i, Lambda=float(lambdas[i]))
+
@@ -0,0 +1,132 @@
+"""Execução de cálculos fora da thread da interface Qt.
+
+Cada janela/aba usa um ExecutorTarefas: executar(calcular, concluir) roda
+calcular() num QThreadPool e entrega o resultado a concluir(resultado) na
+thread da interface, por sinal. Um novo pedido substitui o anterior: se ele
+ainda estiver na fila é retirado, e se já estiver rodando seu resultado é
+descartado quando chegar.
+
+pre_carregar() importa em segundo plano os módulos pesados que a interface
+adia (Matplotlib, SciPy), para a janela abrir antes deles.
+"""
+import importlib
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _Sinais(QObject):
+    # Emitidos pela thread do pool e entregues na thread do ExecutorTarefas
+    terminou = pyqtSignal(int, object)
+    falhou = pyqtSignal(int, str)
+
+
+class _Tarefa(QRunnable):
+    # Tarefas agendadas e ainda não encerradas. O objeto Python é dono do
+    # QRunnable (autoDelete desligado, para o executor poder usar tryTake),
+    # então a referência que o mantém vivo só sai daqui quando run() acaba,
+    # na própria thread do pool, ou quando a tarefa é retirada da fila
+    vivas = set()
+
+    def __init__(self, numero, calcular, sinais):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.numero = numero
+        self.calcular = calcular
+        self.sinais = sinais
+
+    def run(self):
+        try:
+            resultado = self.calcular()
+        except Exception:
+            self.sinais.falhou.emit(self.numero, traceback.format_exc())
+        else:
+            self.sinais.terminou.emit(self.numero, resultado)
+        finally:
+            _Tarefa.vivas.discard(self)
+
+
+class ExecutorTarefas(QObject):
+    """Roda um cálculo por vez em segundo plano; só o pedido mais recente vale.
+
+    Sinais: ocupado(bool) quando começa/termina o pedido atual e
+    erro(str) com o traceback quando o pedido atual falha.
+    """
+
+    ocupado = pyqtSignal(bool)
+    erro = pyqtSignal(str)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self._pool = pool if pool is not None else QThreadPool.globalInstance()
+        self._sinais = _Sinais(self)
+        self._sinais.terminou.connect(self._terminou)
+        self._sinais.falhou.connect(self._falhou)
+        self._atual = 0          # número do pedido cujo resultado será entregue
+        self._concluir = None
+        self._tarefas = {}       # pedidos ainda sem resultado, por número (para tryTake)
+
+    def executar(self, calcular, concluir):
+        """Agenda calcular() e, ao terminar, chama concluir(resultado) na thread da interface."""
+        self.cancelar()
+        self._atual += 1
+        tarefa = _Tarefa(self._atual, calcular, self._sinais)
+        _Tarefa.vivas.add(tarefa)
+        self._tarefas[tarefa.numero] = tarefa
+        self._concluir = concluir
+        self._pool.start(tarefa)
+        self.ocupado.emit(True)
+        return tarefa.numero
+
+    def cancelar(self):
+        """Descarta o pedido atual (retira da fila se ainda não começou)."""
+        if self._concluir is None:
+            return
+        tarefa = self._tarefas.get(self._atual)
+        if tarefa is not None and self._pool.tryTake(tarefa):
+            del self._tarefas[tarefa.numero]
+            _Tarefa.vivas.discard(tarefa)
+        self._atual += 1  # o resultado de quem já está rodando fica obsoleto
+        self._concluir = None
+        self.ocupado.emit(False)
+
+    def _finalizar(self, numero):
+        # Devolve o callback se o pedido ainda for o atual, senão None
+        self._tarefas.pop(numero, None)
+        if numero != self._atual or self._concluir is None:
+            return None
+        concluir, self._concluir = self._concluir, None
+        self.ocupado.emit(False)
+        return concluir
+
+    def _terminou(self, numero, resultado):
+        concluir = self._finalizar(numero)
+        if concluir is not None:
+            concluir(resultado)
+
+    def _falhou(self, numero, mensagem):
+        if self._finalizar(numero) is not None:
+            self.erro.emit(mensagem)
+
+
+class _Importacao(QRunnable):
+    def __init__(self, modulos):
+        super().__init__()
+        self.modulos = modulos
+
+    def run(self):
+        for nome in self.modulos:
+            try:
+                importlib.import_module(nome)
+            except ImportError:
+                pass  # o erro reaparece, com contexto, no primeiro uso do módulo
+
+
+def pre_carregar(modulos, pool=None):
+    """Importa os módulos numa thread do pool (chamar depois de mostrar a janela).
+
+    Só adianta o trabalho: quem usa os módulos continua importando-os
+    normalmente, e se o uso vier antes o import espera o que está em curso.
+    """
+    pool = pool if pool is not None else QThreadPool.globalInstance()
+    pool.start(_Importacao(tuple(modulos)))
@@ -0,0 +1,133 @@
+"""Relatório de tempo de partida das interfaces, baseado em `python -X importtime`.
+
+Para cada ponto de entrada, um processo novo importa o script, cria a
+janela (plataforma Qt "offscreen" se não houver display) e a mostra. O
+relatório traz o tempo até a janela aparecer, a soma dos imports e os
+módulos mais caros, e falha (código de saída 1) se o tempo passar do
+orçamento ou se algum módulo adiado (Matplotlib, SciPy, python-control)
+tiver sido importado antes da janela abrir:
+
+    python -m c213.tempo_importacao
+    python -m c213.tempo_importacao --orcamento 800 --top 15
+
+Serve como verificação de CI para manter a partida a frio rápida.
+"""
+import argparse
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+PASTA_SCRIPTS = Path(__file__).resolve().parents[1]
+
+# Script e classe da janela principal de cada interface
+ENTRADAS = {
+    'codigo_principal': ('codigo_principal.py', 'MainWindow'),
+    '9_interface': ('9_interface.py', 'MethodSelectorGUI'),
+}
+
+# Tempo máximo (ms) do início dos imports até a janela ser mostrada
+ORCAMENTO_MS = 500.0
+
+# Pacotes que só podem ser importados depois que a janela abre
+MODULOS_ADIADOS = ('matplotlib', 'scipy', 'control', 'pandas')
+
+_MEDICAO = '''
+import sys, time
+inicio = time.perf_counter()
+import runpy
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+namespace = runpy.run_path({script!r}, run_name='medicao_partida')
+janela = namespace[{classe!r}]()
+janela.show()
+app.processEvents()
+print('JANELA_MS', (time.perf_counter() - inicio) * 1000)
+print('MODULOS', ' '.join(sorted(sys.modules)))
+'''
+
+
+def _ler_importtime(linhas):
+    # Linhas "import time: self [us] | cumulative | nome"; a indentação do nome
+    # indica o nível (0 = importado diretamente pelo código medido)
+    modulos = []
+    for linha in linhas:
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|')
+        nivel = (len(nome) - len(nome.lstrip(' ')) - 1) // 2
+        modulos.append((nome.strip(), int(proprio), int(acumulado), nivel))
+    return modulos
+
+
+def medir(nome, python=sys.executable):
+    """Mede a partida de uma entrada de ENTRADAS num processo novo.
+
+    Retorna um dicionário com janela_ms, imports_ms, modulos (lista de
+    (nome, próprio_us, acumulado_us, nível)) e adiados (pacotes de
+    MODULOS_ADIADOS já carregados quando a janela apareceu).
+    """
+    script, classe = ENTRADAS[nome]
+    ambiente = dict(os.environ)
+    if not ambiente.get('DISPLAY') and not ambiente.get('WAYLAND_DISPLAY'):
+        ambiente.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    codigo = _MEDICAO.format(script=str(PASTA_SCRIPTS / script), classe=classe)
+    processo = subprocess.run([python, '-X', 'importtime', '-c', codigo], cwd=PASTA_SCRIPTS,
+                              env=ambiente, capture_output=True, text=True)
+    if processo.returncode != 0:
+        raise RuntimeError(f'{nome}: a medição falhou\n{processo.stderr[-2000:]}')
+
+    janela_ms = carregados = None
+    for linha in processo.stdout.splitlines():
+        if linha.startswith('JANELA_MS '):
+            janela_ms = float(linha.split()[1])
+        elif linha.startswith('MODULOS '):
+            carregados = set(linha.split()[1:])
+    modulos = _ler_importtime(processo.stderr.splitlines())
+    return {
+        'janela_ms': janela_ms,
+        'imports_ms': sum(m[1] for m in modulos) / 1000,
+        'modulos': modulos,
+        'adiados': sorted(p for p in MODULOS_ADIADOS if p in carregados),
+    }
+
+
+def relatorio(nome, medicao, top=10, orcamento_ms=ORCAMENTO_MS):
+    """Texto do relatório e se a entrada está dentro do orçamento."""
+    linhas = [f'{nome}: janela em {medicao["janela_ms"]:.0f} ms '
+              f'(imports: {medicao["imports_ms"]:.0f} ms, orçamento: {orcamento_ms:.0f} ms)']
+    # Pacotes de primeiro nível mais caros (tempo acumulado, com dependências)
+    raizes = [m for m in medicao['modulos'] if m[3] == 0]
+    for nome_modulo, _, acumulado, _ in sorted(raizes, key=lambda m: -m[2])[:top]:
+        linhas.append(f'  {acumulado / 1000:8.1f} ms  {nome_modulo}')
+    ok = medicao['janela_ms'] <= orcamento_ms
+    if not ok:
+        linhas.append('  ERRO: partida acima do orçamento')
+    if medicao['adiados']:
+        ok = False
+        linhas.append(f'  ERRO: importados antes da janela: {", ".join(medicao["adiados"])}')
+    return '\n'.join(linhas), ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Tempo de partida das interfaces (-X importtime).')
+    parser.add_argument('entradas', nargs='*', metavar='entrada',
+                        help=f'interfaces medidas (padrão: todas; opções: {", ".join(sorted(ENTRADAS))})')
+    parser.add_argument('--orcamento', type=float, default=ORCAMENTO_MS,
+                        help='tempo máximo até a janela aparecer, em ms (padrão: %(default)s)')
+    parser.add_argument('--top', type=int, default=10, help='módulos listados por entrada')
+    args = parser.parse_args(argv)
+    desconhecidas = set(args.entradas) - set(ENTRADAS)
+    if desconhecidas:
+        parser.error(f'entrada desconhecida: {", ".join(sorted(desconhecidas))}')
+
+    tudo_ok = True
+    for nome in args.entradas or sorted(ENTRADAS):
+        texto, ok = relatorio(nome, medir(nome), args.top, args.orcamento)
+        print(texto)
+        tudo_ok &= ok
+    sys.exit(0 if tudo_ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""Execução do PID sintonizado em tempo real, com período fixo e instrumentação.
+
+ExecucaoPID roda o PID discreto (mesma discretização de c213.simulacao:
+integral por Euler e derivada filtrada) num laço asyncio com prazos
+absolutos t0 + n*periodo, sem acumular atraso. A cada período lê a saída,
+calcula o controle e o escreve num backend de E/S plugável: qualquer objeto
+com as corrotinas iniciar(), ler(), escrever(u) e fechar(). PlantaSimuladaES
+é o backend de teste: a planta FOPDT roda num processo separado
+(c213.planta_simulada), no lugar do hardware.
+
+São registrados em histogramas (memória constante):
+    jitter    atraso do despertar em relação ao prazo do período
+    latencia  do despertar ao controle escrito (leitura + cálculo + escrita)
+    calculo   só o cálculo do PID
+e são contados os prazos perdidos: quando um ciclo termina depois do prazo
+seguinte, os períodos já vencidos são pulados (a grade continua fixa).
+"""
+import asyncio
+from bisect import bisect_right
+import os
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+from c213.simulacao import N_FILTRO, coeficientes_pid
+
+# Limites das faixas dos histogramas (s): 10 por década, de 1 us a 10 s
+LIMITES_HISTOGRAMA = tuple(float(v) for v in np.logspace(-6, 1, 71))
+
+# Percentis no resumo dos histogramas
+PERCENTIS = (50, 90, 99)
+
+# Passos de integração da planta simulada por período de controle
+SUBPASSOS_PLANTA = 10
+
+
+class PIDDiscreto:
+    """PID Kp*(1 + 1/(Ti*s) + Td*s/(Td/N*s + 1)) discreto, com saturação e anti-windup.
+
+    Sem limites (u_min = u_max = None) dá exatamente os controles de
+    simular_malha_fechada. Com limites, a integral só acumula quando o
+    controle não está saturado ou quando o erro o tira da saturação
+    (integração condicional), para não acumular erro que a planta não pode
+    seguir.
+    """
+
+    def __init__(self, kp, ti, td, dt, n_filtro=N_FILTRO, u_min=None, u_max=None):
+        self.kp = float(kp)
+        self.dt = float(dt)
+        self.ki, self.kd, self.cd = coeficientes_pid(kp, ti, td, dt, n_filtro)
+        self.u_min = -np.inf if u_min is None else float(u_min)
+        self.u_max = np.inf if u_max is None else float(u_max)
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.integral = self.derivada = self.erro_anterior = 0.0
+        self.saturacoes = 0
+
+    def passo(self, setpoint, y):
+        """Controle a aplicar dada a saída medida."""
+        erro = setpoint - y
+        self.derivada = self.cd*self.derivada + self.kd*(erro - self.erro_anterior)
+        self.erro_anterior = erro
+        livre = self.kp*erro + self.integral + self.derivada
+        u = min(max(livre, self.u_min), self.u_max)
+        if u == livre or (livre > self.u_max and erro < 0) or (livre < self.u_min and erro > 0):
+            self.integral += self.ki*erro
+        if u != livre:
+            self.saturacoes += 1
+        return u
+
+
+class Histograma:
+    """Contagens por faixas fixas (limites em s, crescentes): memória constante."""
+
+    def __init__(self, limites=LIMITES_HISTOGRAMA):
+        self.limites = tuple(limites)
+        # Faixa 0: abaixo do primeiro limite; última: acima do último
+        self.contagens = [0] * (len(self.limites) + 1)
+        self.amostras = 0
+        self.soma = 0.0
+        self.maximo = -np.inf
+
+    def registrar(self, valor):
+        self.contagens[bisect_right(self.limites, valor)] += 1
+        self.amostras += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def percentil(self, p):
+        """Limite superior da faixa que contém o percentil p (estimativa conservadora)."""
+        if not self.amostras:
+            return np.nan
+        faixa = int(np.searchsorted(np.cumsum(self.contagens), p / 100 * self.amostras))
+        return self.limites[faixa] if faixa < len(self.limites) else self.maximo
+
+    def resumo(self):
+        """Dicionário com média, máximo, percentis e as faixas não vazias [de, até, contagem]."""
+        bordas = (0.0,) + self.limites + (np.inf,)
+        return {
+            'amostras': self.amostras,
+            'media': self.soma / self.amostras if self.amostras else np.nan,
+            'maximo': self.maximo if self.amostras else np.nan,
+            **{f'p{p}': self.percentil(p) for p in PERCENTIS},
+            'faixas': [[bordas[i], bordas[i + 1], c] for i, c in enumerate(self.contagens) if c],
+        }
+
+
+class PlantaSimuladaES:
+    """Backend de E/S com a planta FOPDT em outro processo (python -m c213.planta_simulada).
+
+    escala é quantos segundos de planta passam por segundo de relógio; passo
+    é o passo de integração da planta (s de planta).
+    """
+
+    def __init__(self, k, tau, theta, passo, escala=1.0, saida_inicial=0.0):
+        self.argumentos = ['--k', repr(float(k)), '--tau', repr(float(tau)), '--theta', repr(float(theta)),
+                           '--passo', repr(float(passo)), '--escala', repr(float(escala)),
+                           '--saida-inicial', repr(float(saida_inicial))]
+        self._processo = None
+
+    async def abrir(self):
+        # O processo filho encontra o pacote pelo mesmo diretório deste
+        ambiente = dict(os.environ)
+        raiz = str(Path(__file__).resolve().parent.parent)
+        ambiente['PYTHONPATH'] = os.pathsep.join(filter(None, (raiz, ambiente.get('PYTHONPATH'))))
+        self._processo = await asyncio.create_subprocess_exec(
+            sys.executable, '-m', 'c213.planta_simulada', *self.argumentos,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, env=ambiente)
+
+    async def _pedir(self, comando):
+        self._processo.stdin.write(comando)
+        await self._processo.stdin.drain()
+        resposta = await self._processo.stdout.readline()
+        if not resposta:
+            raise RuntimeError('A planta simulada encerrou.')
+        return resposta
+
+    async def iniciar(self):
+        await self._pedir(b'i\n')
+
+    async def ler(self):
+        return float(await self._pedir(b'l\n'))
+
+    async def escrever(self, u):
+        self._processo.stdin.write(b'e %r\n' % float(u))
+        await self._processo.stdin.drain()
+
+    async def fechar(self):
+        if self._processo is not None and self._processo.returncode is None:
+            self._processo.stdin.write(b'f\n')
+            await self._processo.stdin.drain()
+            await self._processo.wait()
+
+    async def __aenter__(self):
+        await self.abrir()
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.fechar()
+
+
+class ExecucaoPID:
+    """Laço de controle de período fixo (periodo em s de relógio) sobre um backend de E/S."""
+
+    def __init__(self, controlador, es, periodo, setpoint=1.0):
+        self.controlador = controlador
+        self.es = es
+        self.periodo = float(periodo)
+        self.setpoint = float(setpoint)
+        self.jitter = Histograma()
+        self.latencia = Histograma()
+        self.calculo = Histograma()
+        self.perdidos = 0
+        self.pulados = 0
+
+    async def executar(self, periodos):
+        """Roda `periodos` períodos; retorna (índices dos períodos executados, saídas, controles)."""
+        relogio = asyncio.get_running_loop().time
+        indices, saidas, controles = [], [], []
+        await self.es.iniciar()
+        inicio = relogio()
+        n = 0
+        while n < periodos:
+            prazo = inicio + n*self.periodo
+            espera = prazo - relogio()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            acordou = relogio()
+            self.jitter.registrar(max(acordou - prazo, 0.0))
+
+            y = await self.es.ler()
+            antes = time.perf_counter()
+            u = self.controlador.passo(self.setpoint, y)
+            self.calculo.registrar(time.perf_counter() - antes)
+            await self.es.escrever(u)
+            fim = relogio()
+            self.latencia.registrar(fim - acordou)
+            indices.append(n)
+            saidas.append(y)
+            controles.append(u)
+
+            n += 1
+            if fim > inicio + n*self.periodo:
+                # Prazo perdido: pula os períodos vencidos em vez de atrasar a grade
+                self.perdidos += 1
+                seguinte = int(np.ceil((fim - inicio) / self.periodo))
+                self.pulados += seguinte - n
+                n = seguinte
+        return np.array(indices), np.array(saidas), np.array(controles)
+
+    def resumo(self):
+        return {
+            'perdidos': self.perdidos,
+            'pulados': self.pulados,
+            'saturacoes': self.controlador.saturacoes,
+            'jitter': self.jitter.resumo(),
+            'latencia': self.latencia.resumo(),
+            'calculo': self.calculo.resumo(),
+        }
+
+
+async def _executar_simulada(k, tau, theta, controlador, periodos, escala, setpoint, subpassos):
+    es = PlantaSimuladaES(k, tau, theta, controlador.dt / subpassos, escala)
+    async with es:
+        execucao = ExecucaoPID(controlador, es, controlador.dt / escala, setpoint)
+        indices, saidas, controles = await execucao.executar(periodos)
+    return indices * controlador.dt, saidas, controles, execucao.resumo()
+
+
+def executar_planta_simulada(k, tau, theta, ganhos, dt, periodos, escala=1.0, setpoint=1.0,
+                             u_min=None, u_max=None, subpassos=SUBPASSOS_PLANTA):
+    """Roda o PID `ganhos` contra a planta simulada em outro processo.
+
+    dt é o período de controle em s de planta; o laço roda com período
+    dt/escala s de relógio. Retorna (tempo de planta, saídas, controles,
+    resumo da instrumentação).
+    """
+    controlador = PIDDiscreto(*ganhos, dt, u_min=u_min, u_max=u_max)
+    return asyncio.run(_executar_simulada(k, tau, theta, controlador, int(periodos), escala, setpoint, subpassos))
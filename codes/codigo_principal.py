@@ -1,10 +1,33 @@
 from PyQt5 import QtWidgets  # Base para criar interfaces gráficas (GUI)
-from PyQt5.QtWidgets import QFileDialog, QLabel, QGroupBox, QVBoxLayout, QRadioButton, QPushButton,QInputDialog,QMessageBox
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QFileDialog, QLabel, QGroupBox, QVBoxLayout, QRadioButton, QPushButton,QMessageBox
+from functools import partial
+import os
 from pathlib import Path # Importa a classe Path que serve para manipular caminhos de arquivos/diretórios de forma segura e multiplataforma
 import numpy as np # Usada para operações matemáticas e manipulação de arrays/vetores/matrizes
-import matplotlib.pyplot as plt # Usado para criar gráficos
-import control as ctrl #Usada em engenharia para análise e simulação de sistemas de controle
-from scipy import io   #Usado para carregar arquivos .mat do MATLAB
+from c213 import identify_smith, identify_sundaresan, simulate_until_settled, tune_chr, tune_imc  # API do pacote
+from c213.ajuste import ajustar_fopdt, ajustar_sopdt, eqm  # Ajuste por mínimos quadrados
+from c213.controles import ControleParametro  # Slider + spinbox da sintonia ao vivo
+from c213.dados import carregar_dataset  # Leitura do .mat com cache compartilhado entre as abas
+from c213.grafico import MODULOS_GRAFICO, GraficoIncremental  # Gráfico embutido com blitting
+from c213.metricas import metricas_degrau  # Métricas direto da resposta simulada
+from c213.robustez import PERCENTIS, amostrar_plantas, avaliar_robustez, resumir  # Monte Carlo da sintonia
+from c213.simulacao import malha_fechada_unitaria, resposta_degrau_fopdt, resposta_degrau_sopdt, simular_ate_acomodar  # Respostas exatas, sem Padé
+from c213.sintonia import otimizar_pid  # Busca automática de Kp, Ti e Td
+from c213.tarefas import ExecutorTarefas, pre_carregar  # Cálculos fora da thread da interface
+
+# Critério da sintonia otimizada da aba PID
+CUSTO_OTIMIZACAO = 'ITAE'
+SOBRESSINAL_MAX_OTIMIZACAO = 5.0
+
+# Plantas sorteadas em torno da identificada no botão de robustez
+AMOSTRAS_ROBUSTEZ = 1000
+
+# Importados só depois que a janela abre (em segundo plano) ou no primeiro uso
+MODULOS_ADIADOS = MODULOS_GRAFICO + ('scipy.io', 'scipy.signal', 'scipy.optimize')
+
+# Debounce da sintonia ao vivo (ms): no máximo ~60 simulações por segundo
+INTERVALO_AO_VIVO_MS = 15
 
 class MethodsTab(QtWidgets.QWidget):
     def __init__(self):
@@ -28,9 +51,11 @@ class MethodsTab(QtWidgets.QWidget):
         self.rb_sund_cl  = QRadioButton('Sundaresan - Fechado')
         self.rb_comp_smith  = QRadioButton('Comparacao - Smith')
         self.rb_comp_sundaresan  = QRadioButton('Comparacao - Sundaresan')
+        self.rb_minimos_quadrados = QRadioButton('Mínimos Quadrados - FOPDT e SOPDT')
         
         self.rb_smith_ol.setChecked(True)
-        for rb in (self.rb_smith_ol, self.rb_smith_cl, self.rb_sund_ol, self.rb_sund_cl, self.rb_comp_smith, self.rb_comp_sundaresan):
+        for rb in (self.rb_smith_ol, self.rb_smith_cl, self.rb_sund_ol, self.rb_sund_cl, self.rb_comp_smith, self.rb_comp_sundaresan,
+                   self.rb_minimos_quadrados):
             grp_layout.addWidget(rb)
         layout.addWidget(group)
 
@@ -38,7 +63,14 @@ class MethodsTab(QtWidgets.QWidget):
         self.btn_plot = QPushButton('Plotar Método')
         self.btn_plot.clicked.connect(self.plot_selected_method)
         layout.addWidget(self.btn_plot)
-        layout.addStretch()
+        # Gráfico embutido e persistente: as curvas são atualizadas sem recriar a figura
+        self.grafico = GraficoIncremental(self)
+        layout.addWidget(self.grafico, 1)
+
+        # Identificação e simulação rodam em segundo plano; um novo clique substitui o anterior
+        self.executor = ExecutorTarefas(self)
+        self.executor.ocupado.connect(lambda ocupado: self.btn_plot.setText('Calculando...' if ocupado else 'Plotar Método'))
+        self.executor.erro.connect(lambda mensagem: QMessageBox.critical(self, 'Erro', mensagem))
 
     def import_mat(self):
         path, _ = QFileDialog.getOpenFileName(self, 'Selecione .mat', filter='MAT files (*.mat)')
@@ -51,9 +83,6 @@ class MethodsTab(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, 'Atenção', 'Importe um arquivo .mat primeiro.')
             return
 
-        # Antes de plotar, garantir que figuras antigas estejam fechadas
-        plt.close('all')
-
         if self.rb_smith_ol.isChecked():
             self.plot_smith_aberta()
         elif self.rb_smith_cl.isChecked():
@@ -64,229 +93,150 @@ class MethodsTab(QtWidgets.QWidget):
             self.plot_sund_fechada()
         elif self.rb_comp_smith.isChecked():
             self.plot_comp_smith()
-        else:
+        elif self.rb_comp_sundaresan.isChecked():
             self.plot_comp_sundaresan()
+        else:
+            self.plot_minimos_quadrados()
 
     def plot_sund_aberto(self):
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_sund_aberto
+        self.executor.executar(partial(self._calcular_sund_aberto, self.mat_path), self._desenhar_sund_aberto)
+
+    @staticmethod
+    def _calcular_sund_aberto(caminho):
         # Carregar o dataset
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        # Extraindo entrada, saída e tempo
-        tempo  = valores_strct['sampleTime'].flatten().astype(float) 
-        entrada  = valores_strct['dataInput'].flatten()    
-        saida    = valores_strct['dataOutput'].flatten()
-        # 1. Determinar o valor final da saída
-        valor_final = saida[-1]
-        # 2. Encontrar os tempos correspondentes a 35,3% e 85,3% do valor final
-        y1 = 0.353 * valor_final
-        y2 = 0.853 * valor_final
-        # Encontrar t1 e t2 nos dados
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        # 3. Calcular τ e θ usando o Método de Sundaresan
-        tau = (2/3) * (t2 - t1)
-        theta = (1.3*t1) - (0.29*t2)
-        # 4. Calcular o ganho k
+        tempo, entrada, saida = carregar_dataset(caminho)
+        # 1-4. Calcular k, τ e θ usando o Método de Sundaresan (35,3% e 85,3% do valor final)
         amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
-        k = (valor_final - saida[0]) / amplitude_degrau
-        # 5. Modelo Identificado usando a Função de Transferência
-        # Modelo: G(s) = k * exp(-theta*s) / (tau * s + 1)
-        def modelo_identificado(k, tau, theta):
-            # Função de transferência do sistema de primeira ordem: G(s) = k / (tau * s + 1)
-            G_s = ctrl.tf([k], [tau, 1])
-            # Aproximação de Pade para o atraso
-            num_pade, den_pade = ctrl.pade(theta, 5)  # Aproximação de ordem 5
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            # Função de transferência com atraso
-            return ctrl.series(G_s, Pade_approx)
-        # 6. Calcular a resposta estimada usando o modelo
-        resposta_modelo = modelo_identificado(k, tau, theta)
-        # 7. Simular a resposta ao degrau do modelo identificado
-        t_sim, y_modelo = ctrl.step_response(resposta_modelo*amplitude_degrau, T=tempo)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+        # 5-7. Simular a resposta ao degrau do modelo identificado
+        # Modelo: G(s) = k * exp(-theta*s) / (tau * s + 1), com atraso exato (sem Padé)
+        t_sim = tempo
+        y_modelo = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
         # 8. Cálculo do Erro Quadrático Médio (EQM)
         EQM = np.sqrt(np.sum((y_modelo - saida) ** 2) / len(saida))
+        return tempo, entrada, saida, t_sim, y_modelo, k, tau, theta, EQM
+
+    def _desenhar_sund_aberto(self, dados):
+        tempo, entrada, saida, t_sim, y_modelo, k, tau, theta, EQM = dados
         # 9. Visualização dos Resultados
-        plt.figure(figsize=(12, 6))
-        plt.plot(tempo, saida, 'black', label='Resposta Real')
-        plt.plot(tempo, entrada, label='Entrada (Degrau)', color='blue')
-        plt.plot(t_sim, y_modelo, 'r', label='Modelo Identificado')
-        plt.title('Identificação da Planta pelo Método de Sundaresan (Malha Aberta)')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura ')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
         # Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
         textstr = '\n'.join((
             f'Ganho (k): {k:.4f}',
             f'Tempo de Atraso (θ): {theta:.4f} s',
             f'Constante de Tempo (τ): {tau:.4f} s',
             f'(EQM): {EQM:.4f}'))
-        #  Posicionar a caixa com os resultados no gráfico
-        plt.text(tempo[-1] * 0.77, max(saida) * 0.7, textstr, fontsize=10, bbox=props)
-        plt.show() 
+        self.grafico.atualizar(
+            [(tempo, saida, 'black', 'Resposta Real'),
+             (tempo, entrada, 'blue', 'Entrada (Degrau)'),
+             (t_sim, y_modelo, 'r', 'Modelo Identificado')],
+            titulo='Identificação da Planta pelo Método de Sundaresan (Malha Aberta)', ylabel='Temperatura ', texto=textstr)
 
     def plot_sund_fechada(self):
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo  = valores_strct['sampleTime'].flatten().astype(float) 
-        entrada  = valores_strct['dataInput'].flatten()    
-        saida    = valores_strct['dataOutput'].flatten()
-        valor_final = saida[-1]
-        y1 = 0.353 * valor_final
-        y2 = 0.853 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = (2/3) * (t2 - t1)
-        theta = (1.3*t1) - (0.29*t2)
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_sund_fechada
+        self.executor.executar(partial(self._calcular_sund_fechada, self.mat_path), self._desenhar_sund_fechada)
+
+    @staticmethod
+    def _calcular_sund_fechada(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
         amplitude_degrau = entrada.mean()
-        k = (valor_final - saida[0]) / amplitude_degrau
-        def modelo_identificado(k, tau, theta):
-            G_s = ctrl.tf([k], [tau, 1])
-            H_s = ctrl.feedback(G_s, 1)
-            num_pade, den_pade = ctrl.pade(theta, 5)
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            return ctrl.series(G_s, Pade_approx)
-        resposta_modelo = modelo_identificado(k, tau, theta)
-        t_sim, y_modelo = ctrl.step_response(resposta_modelo*amplitude_degrau, T=tempo)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+        t_sim = tempo
+        y_modelo = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
         EQM = np.sqrt(np.sum((y_modelo - entrada) ** 2) / len(entrada))
-        plt.figure(figsize=(12, 6))
-        plt.plot(tempo, saida, 'black', label='Resposta Real')
-        plt.plot(tempo, entrada, label='Entrada (Degrau)', color='blue')
-        plt.plot(t_sim, y_modelo, 'r', label='Modelo Identificado')
-        plt.title('Identificação da Planta pelo Método de Sundaresan (Malha Fechada)')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)
+        return tempo, entrada, saida, t_sim, y_modelo, k, tau, theta, EQM
+
+    def _desenhar_sund_fechada(self, dados):
+        tempo, entrada, saida, t_sim, y_modelo, k, tau, theta, EQM = dados
         textstr = '\n'.join((
             f'Ganho (k): {k:.4f}',
             f'Tempo de Atraso (θ): {theta:.4f} s',
             f'Constante de Tempo (τ): {tau:.4f} s',
             f'(EQM): {EQM:.4f}'))
-        plt.text(tempo[-1] * 0.77, max(saida) * 0.7, textstr, fontsize=10, bbox=props)
-        plt.show()
+        self.grafico.atualizar(
+            [(tempo, saida, 'black', 'Resposta Real'),
+             (tempo, entrada, 'blue', 'Entrada (Degrau)'),
+             (t_sim, y_modelo, 'r', 'Modelo Identificado')],
+            titulo='Identificação da Planta pelo Método de Sundaresan (Malha Fechada)', ylabel='Temperatura', texto=textstr)
 #-----------------------------------------------------------------------------------------------------------------------------------     
     def plot_smith_aberta(self):
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo = valores_strct['sampleTime'].flatten().astype(float)
-        entrada = valores_strct['dataInput'].flatten()
-        saida = valores_strct['dataOutput'].flatten()
-        valor_final = saida[-1]
-        y1 = 0.283 * valor_final; y2 = 0.632 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]; t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = 1.5 * (t2 - t1); theta = t2 - tau
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_smith_aberta
+        self.executor.executar(partial(self._calcular_smith_aberta, self.mat_path), self._desenhar_smith_aberta)
+
+    @staticmethod
+    def _calcular_smith_aberta(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
         amplitude_degrau = entrada.mean()
-        k = (valor_final - saida[0]) / amplitude_degrau
-        G_s = ctrl.tf([k], [tau, 1])
-        num_pade, den_pade = ctrl.pade(theta, 5)
-        modelo_estimado = ctrl.series(G_s, ctrl.tf(num_pade, den_pade))
-        t_open, y_open = ctrl.step_response(modelo_estimado * amplitude_degrau, T=tempo)
+        k, tau, theta = identify_smith(tempo, entrada, saida)
+        t_open = tempo
+        y_open = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
         EQM = np.sqrt(np.mean((y_open - saida) ** 2))
-        plt.figure(figsize=(12, 6))
-        plt.plot(tempo, saida, 'black', label='Resposta Real do Sistema')
-        plt.plot(tempo, entrada, label='Entrada (Degrau)', color='blue')
-        plt.plot(t_open, y_open, 'r', label='Modelo Identificado (Smith) Malha Aberta')
-        plt.title('Identificação da Planta pelo Método de Smith (Malha Aberta)')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)
+        return tempo, entrada, saida, t_open, y_open, k, tau, theta, EQM
+
+    def _desenhar_smith_aberta(self, dados):
+        tempo, entrada, saida, t_open, y_open, k, tau, theta, EQM = dados
         textstr = '\n'.join((
             f'Ganho (k): {k:.4f}',
             f'Tempo de Atraso (θ): {theta:.4f} s',
             f'Constante de Tempo (τ): {tau:.4f} s',
             f'(EQM): {EQM:.4f}'))
 
-        plt.text(tempo[-1] * 0.77, max(saida) * 0.7, textstr, fontsize=10, bbox=props)
-        plt.show()
+        self.grafico.atualizar(
+            [(tempo, saida, 'black', 'Resposta Real do Sistema'),
+             (tempo, entrada, 'blue', 'Entrada (Degrau)'),
+             (t_open, y_open, 'r', 'Modelo Identificado (Smith) Malha Aberta')],
+            titulo='Identificação da Planta pelo Método de Smith (Malha Aberta)', ylabel='Temperatura', texto=textstr)
 #--------------------------------------------------------------------------------------------------------------------
     def plot_smith_fechada(self):
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo = valores_strct['sampleTime'].flatten().astype(float)
-        entrada = valores_strct['dataInput'].flatten()
-        saida = valores_strct['dataOutput'].flatten()
-        valor_final = saida[-1]
-        y1 = 0.283 * valor_final; y2 = 0.632 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]; t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = 1.5 * (t2 - t1); theta = t2 - tau
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_smith_fechada
+        self.executor.executar(partial(self._calcular_smith_fechada, self.mat_path), self._desenhar_smith_fechada)
+
+    @staticmethod
+    def _calcular_smith_fechada(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
         amplitude_degrau = entrada.mean()
-        k = (valor_final - saida[0]) / amplitude_degrau
-        G_s = ctrl.tf([k], [tau, 1])
-        H_s = ctrl.feedback(G_s, 1)
-        resposta_modelo = ctrl.series(H_s, ctrl.tf(*ctrl.pade(theta, 5)))
-        t_sim, y_modelo = ctrl.step_response(resposta_modelo * amplitude_degrau, T=tempo)
+        k, tau, theta = identify_smith(tempo, entrada, saida)
+        k_h, tau_h = malha_fechada_unitaria(k, tau)  # feedback(G, 1) continua de 1ª ordem
+        t_sim = tempo
+        y_modelo = resposta_degrau_fopdt(tempo, k_h, tau_h, theta, amplitude_degrau)
         EQM = np.sqrt(np.mean((y_modelo - saida) ** 2))
-        plt.figure(figsize=(12, 6))
-        plt.plot(tempo, saida, 'black', label='Resposta Real')
-        plt.plot(tempo, entrada, label='Entrada (Degrau)', color='blue')
-        plt.plot(t_sim, y_modelo, 'r', label='SmModelo Identificado')
-        plt.title('Identificação da Planta pelo Método de Smith (Malha Fechada)')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)
+        return tempo, entrada, saida, t_sim, y_modelo, k, tau, theta, EQM
+
+    def _desenhar_smith_fechada(self, dados):
+        tempo, entrada, saida, t_sim, y_modelo, k, tau, theta, EQM = dados
         textstr = '\n'.join((
              f'Ganho (k): {k:.4f}',
              f'Tempo de Atraso (θ): {theta:.4f} s',
              f'Constante de Tempo (τ): {tau:.4f} s',
              f'(EQM): {EQM:.4f}'))
-        plt.text(tempo[-1] * 0.77, max(saida) * 0.7, textstr, fontsize=10, bbox=props)       
-        plt.show()
+        self.grafico.atualizar(
+            [(tempo, saida, 'black', 'Resposta Real'),
+             (tempo, entrada, 'blue', 'Entrada (Degrau)'),
+             (t_sim, y_modelo, 'r', 'SmModelo Identificado')],
+            titulo='Identificação da Planta pelo Método de Smith (Malha Fechada)', ylabel='Temperatura', texto=textstr)
  #--------------------------------------------------------------------------------------------------------------------  
     def plot_comp_smith(self):
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo  = valores_strct['sampleTime'].flatten().astype(float)
-        entrada  = valores_strct['dataInput'].flatten()    
-        saida    = valores_strct['dataOutput'].flatten()
-        valor_final = saida[-1]
-        y1 = 0.283 * valor_final
-        y2 = 0.632 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = 1.5 * (t2 - t1)
-        theta = t2 - tau
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_comp_smith
+        self.executor.executar(partial(self._calcular_comp_smith, self.mat_path), self._desenhar_comp_smith)
+
+    @staticmethod
+    def _calcular_comp_smith(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
         amplitude_degrau = entrada.mean()
-        k = (valor_final - saida[0]) / amplitude_degrau
-        def modelo_identificado_malha_aberta(k, tau, theta):
-            G_s = ctrl.tf([k], [tau, 1])
-            num_pade, den_pade = ctrl.pade(theta, 5)
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            return ctrl.series(G_s, Pade_approx)
-        def modelo_identificado_malha_fechada(k, tau, theta):
-            G_s = ctrl.tf([k], [tau, 1])
-            H_s = ctrl.feedback(G_s, 1)
-            num_pade, den_pade = ctrl.pade(theta, 5)
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            return ctrl.series(H_s, Pade_approx)
-        resposta_malha_aberta = modelo_identificado_malha_aberta(k, tau, theta)
-        resposta_malha_fechada = modelo_identificado_malha_fechada(k, tau, theta)
-        t_sim_aberta, y_modelo_aberta = ctrl.step_response(resposta_malha_aberta * amplitude_degrau, T=tempo)
-        t_sim_fechada, y_modelo_fechada = ctrl.step_response(resposta_malha_fechada * amplitude_degrau, T=tempo)
+        k, tau, theta = identify_smith(tempo, entrada, saida)
+        t_sim_aberta = t_sim_fechada = tempo
+        y_modelo_aberta = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
+        k_fechada, tau_fechada = malha_fechada_unitaria(k, tau)
+        y_modelo_fechada = resposta_degrau_fopdt(tempo, k_fechada, tau_fechada, theta, amplitude_degrau)
         EQM_aberta = np.sqrt(np.sum((y_modelo_aberta - saida) ** 2) / len(saida))
         EQM_fechada = np.sqrt(np.sum((y_modelo_fechada - saida) ** 2) / len(saida))
-        info_aberta = ctrl.step_info(resposta_malha_aberta)
-        info_fechada = ctrl.step_info(resposta_malha_fechada)
-        plt.figure(figsize=(12, 6))
-        plt.plot(t_sim_aberta, y_modelo_aberta, 'r', label='Modelo Identificado (Smith) Malha Aberta')
-        plt.plot(t_sim_fechada, y_modelo_fechada, 'b', label='Modelo Identificado (Smith) Malha Fechada')
-        plt.title('Comparacao entre Malha Aberta e Fechada')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)
+        # Métricas das respostas já simuladas (normalizadas para degrau unitário)
+        info_aberta = metricas_degrau(t_sim_aberta, y_modelo_aberta / amplitude_degrau, valor_final=k)
+        info_fechada = metricas_degrau(t_sim_fechada, y_modelo_fechada / amplitude_degrau, valor_final=k_fechada)
+        return tempo, saida, t_sim_aberta, t_sim_fechada, y_modelo_aberta, y_modelo_fechada, EQM_aberta, EQM_fechada, info_aberta, info_fechada
+
+    def _desenhar_comp_smith(self, dados):
+        tempo, saida, t_sim_aberta, t_sim_fechada, y_modelo_aberta, y_modelo_fechada, EQM_aberta, EQM_fechada, info_aberta, info_fechada = dados
         textstr = '\n'.join([
             f"Tempo de subida (Malha Aberta): {info_aberta['RiseTime']:.4f} s",
             f"Tempo de acomodação (Malha Aberta): {info_aberta['SettlingTime']:.4f} s",
@@ -297,56 +247,33 @@ class MethodsTab(QtWidgets.QWidget):
             f"Valor final (Malha Fechada): {info_fechada['Peak']:.4f}",
             f"Erro Quadrático Médio (Fechada): {EQM_fechada:.4f}"
         ])
-        plt.text(tempo[-1] * 0.68, max(saida) * 0.6, textstr, fontsize=10, bbox=props)
-        plt.show()
+        self.grafico.atualizar(
+            [(t_sim_aberta, y_modelo_aberta, 'r', 'Modelo Identificado (Smith) Malha Aberta'),
+             (t_sim_fechada, y_modelo_fechada, 'b', 'Modelo Identificado (Smith) Malha Fechada')],
+            titulo='Comparacao entre Malha Aberta e Fechada', ylabel='Temperatura', texto=textstr)
 #--------------------------------------------------------------------------------------------------------------------        
     def plot_comp_sundaresan(self):
-        
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo  = valores_strct['sampleTime'].flatten().astype(float) 
-        entrada  = valores_strct['dataInput'].flatten()    
-        saida    = valores_strct['dataOutput'].flatten()
-        valor_final = saida[-1]
-        y1 = 0.353 * valor_final
-        y2 = 0.853 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = (2/3) * (t2 - t1)
-        theta = (1.3*t1) - (0.29*t2)
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_comp_sundaresan
+        self.executor.executar(partial(self._calcular_comp_sundaresan, self.mat_path), self._desenhar_comp_sundaresan)
+
+    @staticmethod
+    def _calcular_comp_sundaresan(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
         amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
-        k = (valor_final - saida[0]) / amplitude_degrau
-        def modelo_identificado_malha_aberta(k, tau, theta):
-            G_s = ctrl.tf([k], [tau, 1])
-            # Aproximação de Pade para o atraso
-            num_pade, den_pade = ctrl.pade(theta, 5)  # Aproximação de ordem 5
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            # Função de transferência com atraso
-            return ctrl.series(G_s, Pade_approx)
-        def modelo_identificado_malha_fechada(k, tau, theta):
-            G_s = ctrl.tf([k], [tau, 1])
-            H_s = ctrl.feedback(G_s, 1)
-            num_pade, den_pade = ctrl.pade(theta, 5)  # Aproximação de ordem 5
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            return ctrl.series(H_s, Pade_approx)
-        resposta_malha_aberta = modelo_identificado_malha_aberta(k, tau, theta)
-        resposta_malha_fechada = modelo_identificado_malha_fechada(k, tau, theta)
-        t_sim_aberta, y_modelo_aberta = ctrl.step_response(resposta_malha_aberta * amplitude_degrau, T=tempo)
-        t_sim_fechada, y_modelo_fechada = ctrl.step_response(resposta_malha_fechada * amplitude_degrau, T=tempo)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+        t_sim_aberta = t_sim_fechada = tempo
+        y_modelo_aberta = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
+        k_fechada, tau_fechada = malha_fechada_unitaria(k, tau)
+        y_modelo_fechada = resposta_degrau_fopdt(tempo, k_fechada, tau_fechada, theta, amplitude_degrau)
         EQM_aberta = np.sqrt(np.sum((y_modelo_aberta - saida) ** 2) / len(saida))
         EQM_fechada = np.sqrt(np.sum((y_modelo_fechada - saida) ** 2) / len(saida))
-        info_aberta = ctrl.step_info(resposta_malha_aberta)
-        info_fechada = ctrl.step_info(resposta_malha_fechada)
-        plt.figure(figsize=(12, 6))
-        plt.plot(t_sim_aberta, y_modelo_aberta, 'r', label='Modelo Identificado (Sundaresan) Malha Aberta')
-        plt.plot(t_sim_fechada, y_modelo_fechada, 'b', label='Modelo Identificado (Sundaresan) Malha Fechada')
-        plt.title('Comparacao entre Malha Aberta e Fechada')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
+        # Métricas das respostas já simuladas (normalizadas para degrau unitário)
+        info_aberta = metricas_degrau(t_sim_aberta, y_modelo_aberta / amplitude_degrau, valor_final=k)
+        info_fechada = metricas_degrau(t_sim_fechada, y_modelo_fechada / amplitude_degrau, valor_final=k_fechada)
+        return tempo, saida, t_sim_aberta, t_sim_fechada, y_modelo_aberta, y_modelo_fechada, EQM_aberta, EQM_fechada, info_aberta, info_fechada
+
+    def _desenhar_comp_sundaresan(self, dados):
+        tempo, saida, t_sim_aberta, t_sim_fechada, y_modelo_aberta, y_modelo_fechada, EQM_aberta, EQM_fechada, info_aberta, info_fechada = dados
         textstr = '\n'.join([
             f"Tempo de subida (Malha Aberta): {info_aberta['RiseTime']:.4f} s",
             f"Tempo de acomodação (Malha Aberta): {info_aberta['SettlingTime']:.4f} s",
@@ -357,8 +284,42 @@ class MethodsTab(QtWidgets.QWidget):
             f"Valor final (Malha Fechada): {info_fechada['Peak']:.4f}",
             f"Erro Quadrático Médio (Fechada): {EQM_fechada:.4f}"
         ])
-        plt.text(tempo[-1] * 0.68, max(saida) * 0.6, textstr, fontsize=10, bbox=props)
-        plt.show()   
+        self.grafico.atualizar(
+            [(t_sim_aberta, y_modelo_aberta, 'r', 'Modelo Identificado (Sundaresan) Malha Aberta'),
+             (t_sim_fechada, y_modelo_fechada, 'b', 'Modelo Identificado (Sundaresan) Malha Fechada')],
+            titulo='Comparacao entre Malha Aberta e Fechada', ylabel='Temperatura', texto=textstr)
+ #--------------------------------------------------------------------------------------------------------------------
+    def plot_minimos_quadrados(self):
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_minimos_quadrados
+        self.executor.executar(partial(self._calcular_minimos_quadrados, self.mat_path), self._desenhar_minimos_quadrados)
+
+    @staticmethod
+    def _calcular_minimos_quadrados(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
+        amplitude_degrau = entrada.mean()
+        # Ajuste sobre o registro inteiro, partindo de Smith/Sundaresan
+        k, tau, theta = ajustar_fopdt(tempo, entrada, saida)
+        k2, tau1, tau2, theta2 = ajustar_sopdt(tempo, entrada, saida)
+        y_fopdt = resposta_degrau_fopdt(tempo, k, tau, theta, amplitude_degrau)
+        y_sopdt = resposta_degrau_sopdt(tempo, k2, tau1, tau2, theta2, amplitude_degrau)
+        EQM_fopdt = eqm(saida, y_fopdt)
+        EQM_sopdt = eqm(saida, y_sopdt)
+        return tempo, saida, y_fopdt, y_sopdt, k, tau, theta, k2, tau1, tau2, theta2, EQM_fopdt, EQM_sopdt
+
+    def _desenhar_minimos_quadrados(self, dados):
+        tempo, saida, y_fopdt, y_sopdt, k, tau, theta, k2, tau1, tau2, theta2, EQM_fopdt, EQM_sopdt = dados
+        textstr = '\n'.join((
+            f'FOPDT: k = {k:.4f}, θ = {theta:.4f} s',
+            f'τ = {tau:.4f} s',
+            f'(EQM): {EQM_fopdt:.4f}',
+            f'\nSOPDT: k = {k2:.4f}, θ = {theta2:.4f} s',
+            f'τ1 = {tau1:.4f} s, τ2 = {tau2:.4f} s',
+            f'(EQM): {EQM_sopdt:.4f}'))
+        self.grafico.atualizar(
+            [(tempo, saida, 'black', 'Resposta Real'),
+             (tempo, y_fopdt, 'r', 'FOPDT (Mínimos Quadrados)'),
+             (tempo, y_sopdt, {'color': 'b', 'linestyle': '--'}, 'SOPDT (Mínimos Quadrados)')],
+            titulo='Identificação da Planta por Mínimos Quadrados', ylabel='Temperatura', texto=textstr)
  #--------------------------------------------------------------------------------------------------------------------
 
 class PIDTab(QtWidgets.QWidget):
@@ -377,9 +338,10 @@ class PIDTab(QtWidgets.QWidget):
         grp_layout = QVBoxLayout(group)
         self.rb_imc = QRadioButton('IMC')
         self.rb_chr = QRadioButton('CHR - Sem Overshoot')
+        self.rb_otimo = QRadioButton(f'Otimizado ({CUSTO_OTIMIZACAO}, overshoot ≤ {SOBRESSINAL_MAX_OTIMIZACAO:g}%)')
         
         self.rb_imc.setChecked(True)
-        for rb in (self.rb_imc, self.rb_chr):
+        for rb in (self.rb_imc, self.rb_chr, self.rb_otimo):
             grp_layout.addWidget(rb)
         layout.addWidget(group)
 
@@ -387,9 +349,17 @@ class PIDTab(QtWidgets.QWidget):
         self.btn_plot = QPushButton('Plotar Método')
         self.btn_plot.clicked.connect(self.plot_selected_method)
         layout.addWidget(self.btn_plot)
-        layout.addStretch()
-        # Antes de plotar, garantir que figuras antigas estejam fechadas
-        plt.close('all')
+        self.btn_robustez = QPushButton(f'Robustez (Monte Carlo, {AMOSTRAS_ROBUSTEZ} plantas)')
+        self.btn_robustez.clicked.connect(self.plot_robustez)
+        layout.addWidget(self.btn_robustez)
+        # Gráfico embutido e persistente: as curvas são atualizadas sem recriar a figura
+        self.grafico = GraficoIncremental(self)
+        layout.addWidget(self.grafico, 1)
+
+        # Identificação e simulação rodam em segundo plano; um novo clique substitui o anterior
+        self.executor = ExecutorTarefas(self)
+        self.executor.ocupado.connect(lambda ocupado: self.btn_plot.setText('Calculando...' if ocupado else 'Plotar Método'))
+        self.executor.erro.connect(lambda mensagem: QMessageBox.critical(self, 'Erro', mensagem))
     
     def import_mat(self):
         path, _ = QFileDialog.getOpenFileName(self, 'Selecione .mat', filter='MAT files (*.mat)')
@@ -402,60 +372,33 @@ class PIDTab(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, 'Atenção', 'Importe um arquivo .mat primeiro.')
             return
 
-        # Antes de plotar, garantir que figuras antigas estejam fechadas
-        plt.close('all')
         if self.rb_chr.isChecked():
             self.plot_chr()
         elif self.rb_imc.isChecked():
             self.plot_imc()
+        elif self.rb_otimo.isChecked():
+            self.plot_otimizado()
 
     def plot_imc(self): 
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_imc
+        self.executor.executar(partial(self._calcular_imc, self.mat_path), self._desenhar_imc)
 
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo  = valores_strct['sampleTime'].flatten().astype(float)
-        entrada  = valores_strct['dataInput'].flatten()    
-        saida    = valores_strct['dataOutput'].flatten()
+    @staticmethod
+    def _calcular_imc(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
         valor_final = saida[-1]
         y_max = max(saida)
         overshoot = ((y_max - valor_final) / valor_final) * 100
-        y1 = 0.353 * valor_final
-        y2 = 0.853 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = (2/3) * (t2 - t1)
-        theta = (1.3*t1) - (0.29*t2)
-        amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
-        k = (valor_final - saida[0]) / amplitude_degrau
-        def modelo_identificado(k, tau, theta):
-            G_s = ctrl.tf([k], [tau, 1])
-            H_s = ctrl.feedback(G_s, 1)
-            # Aproximação de Pade para o atraso
-            num_pade, den_pade = ctrl.pade(theta, 5)  # Aproximação de ordem 5
-            Pade_approx = ctrl.tf(num_pade, den_pade)
-            # Função de transferência com atraso
-            return ctrl.series(H_s, Pade_approx)
-        resposta_modelo = modelo_identificado(k, tau, theta)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
         lamb = 100
-        kp = ((2*tau)+theta)/(k*((2*lamb)+theta))
-        ti = tau+(theta/2)
-        td = (tau*theta)/((2*tau)+theta)
-        def funcao_PID(kp, ti, td):
-            pid = ctrl.tf([kp*td, kp, kp/ti], [1, 0])
-            return pid
-        PID = funcao_PID(kp, ti, td)
-        sistema_em_malha_fechada = ctrl.feedback(ctrl.series(PID, resposta_modelo))
-        t_sim, y_modelo = ctrl.step_response(sistema_em_malha_fechada)
-        plt.figure(figsize=(12, 6))
-        plt.plot(t_sim, y_modelo, 'red', label='PID')
-        plt.title('IMC')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temepratura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        info = ctrl.step_info(sistema_em_malha_fechada)
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)  # Estilo da caixa
+        kp, ti, td = tune_imc(k, tau, theta, lamb)
+        # Simulação discreta com atraso exato (planta = feedback(G, 1) com atraso),
+        # numa grade estendida até a resposta acomodar
+        t_sim, y_modelo, info = simulate_until_settled(tempo, *malha_fechada_unitaria(k, tau), theta, kp, ti, td)
+        return tempo, t_sim, y_modelo, info, overshoot, kp, ti, td
+
+    def _desenhar_imc(self, dados):
+        tempo, t_sim, y_modelo, info, overshoot, kp, ti, td = dados
         txt = (
             f"Tempo de subida(tr): {info['RiseTime']:.4f} s\n"
             f"Valor de pico: {info['Peak']:.4f}\n"
@@ -465,46 +408,26 @@ class PIDTab(QtWidgets.QWidget):
             f"Ti = {ti:.4f} s\n"
             f"Td = {td:.4f} s"
             )
-# Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
-        plt.text(tempo[-1]*0.7, max(y_modelo)*-1.5, txt, bbox=props)
-        plt.show()
+        # Adicionando os parâmetros identificados no gráfico em uma caixa delimitada
+        self.grafico.atualizar(
+            [(t_sim, y_modelo, 'red', 'PID')],
+            titulo='IMC', ylabel='Temepratura', texto=txt)
 #---------------------------------------------------------------------------------------------------------
     def plot_chr(self):
-        arquivoDados = io.loadmat(self.mat_path)
-        valores_strct = arquivoDados['reactionExperiment'][0, 0]
-        tempo   = valores_strct['sampleTime'].flatten().astype(np.float64)
-        entrada = valores_strct['dataInput'].flatten()
-        saida   = valores_strct['dataOutput'].flatten()
-        valor_final = saida[-1]
-        y1 = 0.353 * valor_final
-        y2 = 0.853 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = (2/3) * (t2 - t1)
-        theta = (1.3*t1) - (0.29*t2)
-        amplitude_degrau = entrada.mean()  # Amplitude do degrau de entrada
-        k = (valor_final - saida[0]) / amplitude_degrau
-        G_s = ctrl.tf([k], [tau, 1])
-        Kp = 0.95 * tau / (k * theta)
-        Ti = 2.4 * tau
-        Td = 0.42 * tau
-        PID = ctrl.tf([Kp*Td, Kp, Kp/Ti], [1, 0])
-        num_pade, den_pade = ctrl.pade(theta, 5)
-        Pade = ctrl.tf(num_pade, den_pade)
-        loop = ctrl.series(PID, G_s, Pade)
-        sist_fc = ctrl.feedback(loop, 1)
-        t_sim, y_sim = ctrl.step_response(sist_fc, T=tempo)
-        plt.figure(figsize=(12,6))
-        plt.plot(tempo, saida,    'k', label='Resposta Real')
-        plt.plot(t_sim,  y_sim,   'r', label='CHR 0% Overshoot')
-        plt.title('Controle PID sintonizado pelo CHR (0% Overshoot)')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
-        info = ctrl.step_info(sist_fc)
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_chr
+        self.executor.executar(partial(self._calcular_chr, self.mat_path), self._desenhar_chr)
+
+    @staticmethod
+    def _calcular_chr(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+        Kp, Ti, Td = tune_chr(k, tau, theta)
+        # Simulação discreta com atraso exato (sem Padé), até a resposta acomodar
+        t_sim, y_sim, info = simulate_until_settled(tempo, k, tau, theta, Kp, Ti, Td)
+        return tempo, saida, t_sim, y_sim, info, Kp, Ti, Td
+
+    def _desenhar_chr(self, dados):
+        tempo, saida, t_sim, y_sim, info, Kp, Ti, Td = dados
         txt = (
             f'Kp = {Kp:.3f}\n'
             f'Ti = {Ti:.3f} s\n'
@@ -513,62 +436,95 @@ class PIDTab(QtWidgets.QWidget):
             f'SettlingTime = {info["SettlingTime"]:.3f} s\n'
             f'Overshoot = {info["Overshoot"]:.1f}%'
         )
-        plt.text(tempo[-1]*0.6, max(y_sim)*0.7, txt, bbox=props)
-        plt.show()
-
-class ManualTab(QtWidgets.QWidget):
-    def __init__(self):
-        super().__init__()
-
-        # 1) Cria o layout e atribui ao widget
-        layout = QVBoxLayout()
-        self.setLayout(layout)
-
-        # 2) Botão para importar arquivo .mat
-        self.btn_import = QPushButton('Importar .mat')
-        self.btn_import.clicked.connect(self.import_mat)
-        layout.addWidget(self.btn_import)
-        self.mat_path = None
-
-        # 3) Título da seção
-        layout.addWidget(QLabel('<h2>Manual</h2>'))
-
-        # 4) Botão para plotar método automático
-        self.btn_plot_auto = QPushButton('Plotar Automático')
-        self.btn_plot_auto.clicked.connect(self.on_plot_auto)
-        layout.addWidget(self.btn_plot_auto)
-
-        # 5) Botão para plotar manualmente com valores de Kp, Ti e Td
-        self.btn_manual = QPushButton('Manual')
-        self.btn_manual.clicked.connect(self.on_manual)
-        layout.addWidget(self.btn_manual)
-
-        # 6) Stretch para empurrar os botões para cima
-        layout.addStretch()
-
-        # 7) Inicializa variáveis de parâmetros manuais
-        self.kp_manual = None
-        self.ti_manual = None
-        self.td_manual = None
-        self.setpoint_manual = None
-
-        # 8) Fecha figuras antigas
-        plt.close('all')
-
-    def import_mat(self):
-        path, _ = QFileDialog.getOpenFileName(self, 'Selecione .mat', filter='MAT files (*.mat)')
-        if path:
-            self.mat_path = path
-            self.btn_import.setText(f'Arquivo: {Path(path).name}')
-
-    def on_plot_auto(self):
-        """Recalcula Kp, Ti, Td pelo método CHR e plota."""
-        if not self._check_mat():
+        self.grafico.atualizar(
+            [(tempo, saida, 'k', 'Resposta Real'),
+             (t_sim, y_sim, 'r', 'CHR 0% Overshoot')],
+            titulo='Controle PID sintonizado pelo CHR (0% Overshoot)', ylabel='Temperatura', texto=txt)
+#---------------------------------------------------------------------------------------------------------
+    def plot_otimizado(self):
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_otimizado
+        self.executor.executar(partial(self._calcular_otimizado, self.mat_path), self._desenhar_otimizado)
+
+    @staticmethod
+    def _calcular_otimizado(caminho):
+        tempo, entrada, saida = carregar_dataset(caminho)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+        # Busca Kp, Ti, Td minimizando o custo, partindo da sintonia CHR
+        res = otimizar_pid(tempo, k, tau, theta, CUSTO_OTIMIZACAO,
+                           sobressinal_max=SOBRESSINAL_MAX_OTIMIZACAO)
+        Kp, Ti, Td = res['Kp'], res['Ti'], res['Td']
+        # O custo é o da janela do ensaio; curva e métricas seguem até acomodar
+        t_sim, y_sim, info = simulate_until_settled(tempo, k, tau, theta, Kp, Ti, Td)
+        return tempo, saida, t_sim, y_sim, res, info, Kp, Ti, Td
+
+    def _desenhar_otimizado(self, dados):
+        tempo, saida, t_sim, y_sim, res, info, Kp, Ti, Td = dados
+        txt = (
+            f'Kp = {Kp:.3f}\n'
+            f'Ti = {Ti:.3f} s\n'
+            f'Td = {Td:.3f} s\n'
+            f'{CUSTO_OTIMIZACAO} = {res[CUSTO_OTIMIZACAO]:.4g}\n'
+            f'RiseTime = {info["RiseTime"]:.3f} s\n'
+            f'SettlingTime = {info["SettlingTime"]:.3f} s\n'
+            f'Overshoot = {info["Overshoot"]:.1f}%'
+        )
+        self.grafico.atualizar(
+            [(tempo, saida, 'k', 'Resposta Real'),
+             (t_sim, y_sim, 'r', f'PID Otimizado ({CUSTO_OTIMIZACAO})')],
+            titulo=f'Controle PID otimizado ({CUSTO_OTIMIZACAO}, overshoot ≤ {SOBRESSINAL_MAX_OTIMIZACAO:g}%)', ylabel='Temperatura', texto=txt)
+#---------------------------------------------------------------------------------------------------------
+    def plot_robustez(self):
+        if not self.mat_path:
+            QtWidgets.QMessageBox.warning(self, 'Atenção', 'Importe um arquivo .mat primeiro.')
             return
-        # limpa manual para forçar recálculo
-        self.kp_manual = None
-        self.setpoint_manual = None
-        self.plot_chr()
+        if self.rb_otimo.isChecked():
+            QtWidgets.QMessageBox.warning(self, 'Atenção', 'A análise de robustez é feita para as sintonias IMC e CHR.')
+            return
+        regra = 'imc' if self.rb_imc.isChecked() else 'chr'
+        self.executor.executar(partial(self._calcular_robustez, self.mat_path, regra), self._desenhar_robustez)
+
+    @staticmethod
+    def _calcular_robustez(caminho, regra):
+        tempo, entrada, saida = carregar_dataset(caminho)
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+        # Mesma sintonia e mesma planta nominal de plot_imc/plot_chr
+        if regra == 'imc':
+            ganhos = tune_imc(k, tau, theta, 100)
+            k, tau = malha_fechada_unitaria(k, tau)
+        else:
+            ganhos = tune_chr(k, tau, theta)
+        plantas = amostrar_plantas(k, tau, theta, AMOSTRAS_ROBUSTEZ)
+        # Todas as plantas no horizonte em que a nominal acomoda
+        t_sim, nominal = simular_ate_acomodar(tempo, k, tau, theta, *ganhos)
+        # Lotes divididos entre processos; 'spawn' porque estamos numa thread da interface.
+        # Os processos devolvem só as faixas de percentis, não as respostas
+        metricas, bandas = avaliar_robustez(t_sim, ganhos, *plantas, processos=os.cpu_count(),
+                                            percentis_faixas=PERCENTIS, contexto='spawn')
+        return t_sim, regra, ganhos, nominal, bandas, resumir(metricas, *plantas)
+
+    def _desenhar_robustez(self, dados):
+        tempo, regra, ganhos, nominal, (p5, p50, p95), resumo = dados
+
+        def linha(nome, rotulo, unidade=''):
+            distribuicao = resumo[nome]
+            pior = distribuicao['pior']['valor']
+            pior = 'não acomoda' if pior is None else f'{pior:.1f}{unidade}'
+            return f"{rotulo}: p50 {distribuicao.get('p50', np.nan):.1f}{unidade}, p95 {distribuicao.get('p95', np.nan):.1f}{unidade}, pior {pior}"
+
+        txt = (
+            f'Kp = {ganhos[0]:.3f}\n'
+            f'Ti = {ganhos[1]:.3f} s\n'
+            f'Td = {ganhos[2]:.3f} s\n'
+            f"{linha('Overshoot', 'Overshoot', '%')}\n"
+            f"{linha('SettlingTime', 'SettlingTime', ' s')}\n"
+            f"Não acomodam: {100 * resumo['nao_acomodam']:.1f}% de {resumo['amostras']}"
+        )
+        self.grafico.atualizar(
+            [(tempo, nominal, 'r', 'Planta nominal'),
+             (tempo, p50, 'b', 'Mediana'),
+             (tempo, p5, {'color': 'b', 'linestyle': '--'}, 'Percentis 5% e 95%'),
+             (tempo, p95, {'color': 'b', 'linestyle': '--'}, '_nolegend_')],
+            titulo=f'Robustez da sintonia {regra.upper()} (Monte Carlo)', ylabel='Temperatura', texto=txt)
 
 class ManualTab(QtWidgets.QWidget):
     def __init__(self):
@@ -591,12 +547,26 @@ class ManualTab(QtWidgets.QWidget):
         self.btn_plot_auto.clicked.connect(self.on_plot_auto)
         layout.addWidget(self.btn_plot_auto)
 
-        # Botão para plotar manualmente com valores de Kp, Ti, Td e Setpoint
-        self.btn_manual = QPushButton('Manual')
-        self.btn_manual.clicked.connect(self.on_manual)
-        layout.addWidget(self.btn_manual)
-
-        layout.addStretch()
+        # Painel de sintonia ao vivo: cada mudança reagenda a simulação
+        grupo = QGroupBox('Sintonia ao vivo')
+        grp_layout = QVBoxLayout(grupo)
+        self.controles = {
+            'kp': ControleParametro('Kp'),
+            'ti': ControleParametro('Ti', ' s'),
+            'td': ControleParametro('Td', ' s'),
+            'setpoint': ControleParametro('Setpoint'),
+        }
+        for controle in self.controles.values():
+            controle.valorMudou.connect(self.on_manual)
+            controle.arrastando.connect(self._ao_arrastar)
+            grp_layout.addWidget(controle)
+        grupo.setEnabled(False)  # habilitado depois da primeira sintonia CHR
+        self.painel = grupo
+        layout.addWidget(grupo)
+
+        # Gráfico embutido e persistente: as curvas são atualizadas sem recriar a figura
+        self.grafico = GraficoIncremental(self)
+        layout.addWidget(self.grafico, 1)
 
         # Inicializa variáveis de parâmetros manuais
         self.kp_manual = None
@@ -604,8 +574,20 @@ class ManualTab(QtWidgets.QWidget):
         self.td_manual = None
         self.setpoint_manual = None
 
-        # Fecha figuras antigas
-        plt.close('all')
+        # Simulação em segundo plano; um novo pedido substitui o anterior
+        self.executor = ExecutorTarefas(self)
+        self.executor.erro.connect(lambda mensagem: QMessageBox.critical(self, 'Erro', mensagem))
+        self.executor.ocupado.connect(self._ao_mudar_ocupado)
+
+        # Debounce: as mudanças dentro de um intervalo viram uma só simulação,
+        # feita com os valores mais recentes
+        self.temporizador = QTimer(self)
+        self.temporizador.setSingleShot(True)
+        self.temporizador.setInterval(INTERVALO_AO_VIVO_MS)
+        self.temporizador.timeout.connect(self.plot_chr)
+        self._calculando = False
+        self._pendente = False
+        self._arrastando = False
 
     def import_mat(self):
         path, _ = QFileDialog.getOpenFileName(self, 'Selecione .mat', filter='MAT files (*.mat)')
@@ -622,39 +604,34 @@ class ManualTab(QtWidgets.QWidget):
         self.ti_manual = None
         self.td_manual = None
         self.setpoint_manual = None
-        self.plot_chr()
-
-    def on_manual(self):
-        """Solicita Kp, Ti, Td e Setpoint manualmente e plota."""
-        if not self._check_mat():
-            return
-
-        # Valores padrão
-        kp_def = self.kp_manual or 0.0
-        ti_def = self.ti_manual or 1.0
-        td_def = self.td_manual or 0.1
-        # Carrega entrada para default setpoint
-        arquivo = io.loadmat(self.mat_path)
-        vals = arquivo['reactionExperiment'][0, 0]
-        entrada = vals['dataInput'].flatten()
-        sp_def = self.setpoint_manual or float(entrada.mean())
-
-        # Diálogos para parâmetros
-        kp, ok1 = QInputDialog.getDouble(self, 'Kp Manual', 'Digite Kp:', decimals=4, value=kp_def)
-        if not ok1: return
-        ti, ok2 = QInputDialog.getDouble(self, 'Ti Manual', 'Digite Ti (s):', decimals=4, value=ti_def)
-        if not ok2: return
-        td, ok3 = QInputDialog.getDouble(self, 'Td Manual', 'Digite Td (s):', decimals=4, value=td_def)
-        if not ok3: return
-        sp, ok4 = QInputDialog.getDouble(self, 'Setpoint Manual', 'Digite Setpoint:', decimals=4, value=sp_def)
-        if not ok4: return
-
-        # Armazena valores
-        self.kp_manual = kp
-        self.ti_manual = ti
-        self.td_manual = td
-        self.setpoint_manual = sp
-        self.plot_chr()
+        self.temporizador.stop()
+        self._pendente = False
+        self.executor.executar(partial(self._calcular_chr, self.mat_path, None, None), self._desenhar_auto)
+
+    def on_manual(self, *_):
+        """Lê Kp, Ti, Td e Setpoint do painel e agenda a simulação."""
+        self.kp_manual = self.controles['kp'].valor()
+        self.ti_manual = self.controles['ti'].valor()
+        self.td_manual = self.controles['td'].valor()
+        self.setpoint_manual = self.controles['setpoint'].valor()
+        # Não reinicia um temporizador já armado: durante o arraste as mudanças
+        # chegam mais rápido que o intervalo e o reinício adiaria tudo
+        if not self.temporizador.isActive():
+            self.temporizador.start()
+
+    def _ao_arrastar(self, arrastando):
+        self._arrastando = arrastando
+        if not arrastando:
+            # Ao soltar o slider os eixos voltam a se ajustar às curvas
+            self.temporizador.start()
+
+    def _ao_mudar_ocupado(self, ocupado):
+        self._calculando = ocupado
+        if not ocupado and self._pendente:
+            # Uma mudança chegou durante o cálculo: simula de novo com os valores
+            # atuais já agora, em paralelo com o desenho do resultado que chegou
+            self._pendente = False
+            self.plot_chr()
 
     def _check_mat(self):
         if not self.mat_path:
@@ -663,76 +640,75 @@ class ManualTab(QtWidgets.QWidget):
         return True
 
     def plot_chr(self):
-        # Carrega dados
-        arquivoDados = io.loadmat(self.mat_path)
-        vals = arquivoDados['reactionExperiment'][0, 0]
-        tempo = vals['sampleTime'].flatten().astype(np.float64)
-        entrada = vals['dataInput'].flatten()
-        saida = vals['dataOutput'].flatten()
+        # Não substitui um cálculo em andamento (o arraste nunca terminaria
+        # nenhum); a última mudança é simulada assim que ele acabar
+        if self._calculando:
+            self._pendente = True
+            return
+        # Cálculo em segundo plano; o gráfico é feito em _desenhar_chr
+        ganhos = None if self.kp_manual is None else (self.kp_manual, self.ti_manual, self.td_manual)
+        self.executor.executar(partial(self._calcular_chr, self.mat_path, ganhos, self.setpoint_manual),
+                               self._desenhar_chr)
 
-        # Calcula curva aberta
-        valor_final = saida[-1]
-        y1 = 0.353 * valor_final
-        y2 = 0.853 * valor_final
-        t1 = tempo[np.where(saida >= y1)[0][0]]
-        t2 = tempo[np.where(saida >= y2)[0][0]]
-        tau = (2/3) * (t2 - t1)
-        theta = (1.3 * t1) - (0.29 * t2)
+    @staticmethod
+    def _calcular_chr(caminho, ganhos_manuais, setpoint):
+        # Carrega dados
+        tempo, entrada, saida = carregar_dataset(caminho)
 
         # Usa o setpoint se definido ou média
-        amp = self.setpoint_manual if self.setpoint_manual is not None else entrada.mean()
-        k = (valor_final - saida[0]) / amp
+        amp = setpoint if setpoint is not None else entrada.mean()
+
+        # Calcula curva aberta
+        k, tau, theta = identify_sundaresan(tempo, entrada, saida, amplitude_degrau=amp)
 
         # Define PID
-        if self.kp_manual is None:
-            Kp = 0.95 * tau / (k * theta)
-            Ti = 2.4 * tau
-            Td = 0.42 * tau
+        if ganhos_manuais is None:
+            Kp, Ti, Td = tune_chr(k, tau, theta)
         else:
-            Kp, Ti, Td = self.kp_manual, self.ti_manual, self.td_manual
+            Kp, Ti, Td = ganhos_manuais
 
         # Monta e simula
-        G_s = ctrl.tf([k], [tau, 1])
-        PID_tf = ctrl.tf([Kp*Td, Kp, Kp/Ti], [1, 0])
-        num_pade, den_pade = ctrl.pade(theta, 5)
-        Pade = ctrl.tf(num_pade, den_pade)
-        loop = ctrl.series(PID_tf, G_s, Pade)
-        sist_fc = ctrl.feedback(loop, 1)
-        t_sim, y_sim = ctrl.step_response(sist_fc, T=tempo)
+        # Simulação discreta com atraso exato (sem Padé), até a resposta acomodar
+        t_sim, y_sim, info = simulate_until_settled(tempo, k, tau, theta, Kp, Ti, Td)
+        return tempo, saida, t_sim, y_sim, info, Kp, Ti, Td, amp
 
+    def _desenhar_chr(self, dados):
+        tempo, saida, t_sim, y_sim, info, Kp, Ti, Td, amp = dados
         # Plota
-        plt.close('all')
-        plt.figure(figsize=(12,6))
-        plt.plot(tempo, saida, 'k', label='Resposta Real')
-        plt.plot(t_sim, y_sim, 'r', label=f'CHR: Kp={Kp:.3f}, Ti={Ti:.3f}, Td={Td:.3f}')
-        plt.title('Controle PID Manual')
-        plt.xlabel('Tempo (s)')
-        plt.ylabel('Temperatura')
-        plt.legend()
-        plt.grid()
-        plt.tight_layout()
 
         # Caixa de texto
-        info = ctrl.step_info(sist_fc)
-        props = dict(boxstyle='round', facecolor='white', alpha=0.6)
         txt = (
             f'Kp = {Kp:.3f}\n'
             f'Ti = {Ti:.3f} s\n'
             f'Td = {Td:.3f} s\n'
-            f'Setpoint = {self.setpoint_manual if self.setpoint_manual is not None else entrada.mean():.3f}\n'
+            f'Setpoint = {amp:.3f}\n'
             f'RiseTime = {info["RiseTime"]:.3f} s\n'
             f'SettlingTime = {info["SettlingTime"]:.3f} s\n'
             f'Overshoot = {info["Overshoot"]:.1f}%'
         )
-        plt.text(tempo[-1]*0.6, max(y_sim)*0.2, txt, bbox=props)
-        plt.show()
-        
-    
+        # Os ganhos ficam na caixa de texto: com a legenda fixa, as atualizações
+        # ao vivo só redesenham curva e texto (blitting), sem renderizar a figura
+        rotulo = 'PID Manual' if self.kp_manual is not None else 'CHR'
+        self.grafico.atualizar(
+            [(tempo, saida, 'k', 'Resposta Real'),
+             (t_sim, y_sim, 'r', rotulo)],
+            titulo='Controle PID Manual', ylabel='Temperatura', texto=txt,
+            fixar_limites=self._arrastando)
+
+    def _desenhar_auto(self, dados):
+        # Os controles partem da sintonia CHR, com faixas centradas nela
+        _, _, _, _, _, Kp, Ti, Td, amp = dados
+        for nome, valor in (('kp', Kp), ('ti', Ti), ('td', Td), ('setpoint', amp)):
+            self.controles[nome].definir(float(valor))
+        self.painel.setEnabled(True)
+        self._desenhar_chr(dados)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Controle PID - Seleção de Métodos')
-        self.resize(600, 400)
+        self.resize(1000, 750)
         tabs = QtWidgets.QTabWidget()
         self.setCentralWidget(tabs)
 
@@ -742,12 +718,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pid_tab = PIDTab()
         tabs.addTab(self.pid_tab, 'PID')
 
-        self.pid_tab = ManualTab()
-        tabs.addTab(self.pid_tab, 'Manual')
+        self.manual_tab = ManualTab()
+        tabs.addTab(self.manual_tab, 'Manual')
 
 if __name__ == '__main__':
     import sys
     app = QtWidgets.QApplication(sys.argv)
     win = MainWindow()
     win.show()
+    pre_carregar(MODULOS_ADIADOS)
     sys.exit(app.exec_())
@@ -0,0 +1,45 @@
+"""Ajuste FOPDT/SOPDT por mínimos quadrados (python -m pytest, a partir de codes/)."""
+import numpy as np
+
+from c213.ajuste import _residuos_fopdt, _residuos_sopdt, ajustar_fopdt, ajustar_sopdt
+from c213.sintetico import gerar_registro
+
+AMPLITUDE = 1.5
+
+
+def _registro(tau, tau2=None):
+    return gerar_registro(6000, 2.0, tau, 120.0, tau2=tau2, amplitude=AMPLITUDE, ruido=0.01, semente=3)
+
+
+def _diferencas_finitas(residuos, parametros, tempo, saida):
+    # Jacobiano por diferenças centradas, passo relativo a cada parâmetro
+    parametros = np.asarray(parametros, dtype=np.float64)
+    colunas = []
+    for i, valor in enumerate(parametros):
+        passo = np.zeros_like(parametros)
+        passo[i] = 1e-6 * max(abs(valor), 1.0)
+        mais = residuos(parametros + passo, tempo, saida, AMPLITUDE)[0]
+        menos = residuos(parametros - passo, tempo, saida, AMPLITUDE)[0]
+        colunas.append((mais - menos) / (2 * passo[i]))
+    return np.column_stack(colunas)
+
+
+def test_fopdt_recupera_a_planta():
+    k, tau, theta = ajustar_fopdt(*_registro(300.0))
+    np.testing.assert_allclose((k, tau, theta), (2.0, 300.0, 120.0), rtol=2e-3)
+
+
+def test_sopdt_recupera_a_planta():
+    k, tau1, tau2, theta = ajustar_sopdt(*_registro(400.0, tau2=100.0))
+    np.testing.assert_allclose((k, tau1, tau2, theta), (2.0, 400.0, 100.0, 120.0), rtol=5e-3)
+
+
+def test_jacobianos_analiticos_iguais_as_diferencas_finitas():
+    # theta fora da grade: a derivada em theta é descontínua nas amostras
+    for residuos, parametros, tau2 in ((_residuos_fopdt, (2.1, 290.0, 120.5), None),
+                                       (_residuos_sopdt, (2.1, 390.0, 110.0, 120.5), 100.0)):
+        tempo, _, saida = _registro(400.0, tau2)
+        analitico = residuos(parametros, tempo, saida, AMPLITUDE)[1]
+        numerico = _diferencas_finitas(residuos, parametros, tempo, saida)
+        erro = np.max(np.abs(analitico - numerico), axis=0) / np.max(np.abs(analitico), axis=0)
+        assert np.all(erro < 1e-8)
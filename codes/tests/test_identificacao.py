@@ -0,0 +1,54 @@
+"""Métodos de dois pontos em lote e incrementais (python -m pytest, a partir de codes/)."""
+import numpy as np
+
+from c213.identificacao import METODOS, IdentificacaoIncremental, cruzamentos, identificar
+from c213.sintetico import gerar_registro
+
+K, TAU, THETA = 2.0, 300.0, 120.0
+
+
+def _registro(**opcoes):
+    return gerar_registro(6000, K, TAU, THETA, amplitude=1.5, **opcoes)
+
+
+def _incremental(tempo, entrada, saida, bloco=997, **opcoes):
+    acumulador = IdentificacaoIncremental(**opcoes)
+    for inicio in range(0, len(tempo), bloco):
+        fim = inicio + bloco
+        acumulador.atualizar(tempo[inicio:fim], entrada[inicio:fim], saida[inicio:fim])
+    return acumulador
+
+
+def test_smith_e_sundaresan_recuperam_a_planta():
+    resultados = identificar(*_registro())
+    for metodo in ('smith', 'sundaresan'):
+        k, tau, theta = resultados[metodo]
+        assert np.isclose(k, K, rtol=1e-6)
+        # As fórmulas de dois pontos são aproximadas: erro de ~1% de tau na planta exata
+        assert abs(tau - TAU) < 0.02 * TAU
+        assert abs(theta - THETA) < 0.02 * TAU
+
+
+def test_incremental_igual_ao_lote():
+    registro = _registro(ruido=0.01)
+    assert _incremental(*registro).resultado() == identificar(*registro)
+
+
+def test_incremental_rarefeito_erra_no_maximo_uma_faixa():
+    tempo, entrada, saida = _registro()
+    capacidade = 64
+    acumulador = _incremental(tempo, entrada, saida, capacidade=capacidade)
+    assert acumulador._n_pontos <= capacidade
+
+    niveis = np.array([f * saida[-1] for fracoes in METODOS.values() for f in fracoes])
+    faixa = (saida[-1] - saida[0]) / (capacidade // 2)
+    exatos = cruzamentos(tempo, saida, niveis)
+    # A escada rarefeita guarda o primeiro ponto de cada faixa de valor
+    limite = cruzamentos(tempo, saida, niveis + faixa) - exatos + (tempo[1] - tempo[0])
+    assert np.all(np.abs(acumulador.cruzamentos(niveis) - exatos) <= limite)
+
+    lote = identificar(tempo, entrada, saida)
+    for metodo, (k, tau, theta) in acumulador.resultado().items():
+        assert k == lote[metodo][0]
+        assert abs(tau - lote[metodo][1]) < 0.1 * TAU
+        assert abs(theta - lote[metodo][2]) < 0.1 * TAU
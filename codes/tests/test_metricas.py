@@ -0,0 +1,32 @@
+"""Métricas de degrau com valor final nulo ou negativo (python -m pytest, a partir de codes/)."""
+import warnings
+
+import numpy as np
+
+from c213.metricas import metricas_degrau
+from c213.simulacao import simular_malha_fechada
+from c213.sintonia import sintonia_chr
+
+TEMPO = np.arange(0, 2000.0, 1.0)
+
+
+def _resposta():
+    return simular_malha_fechada(TEMPO, 2.0, 100.0, 50.0, *sintonia_chr(2.0, 100.0, 50.0))
+
+
+def test_valor_final_nulo_da_sobressinal_nan_sem_aviso():
+    y = _resposta() * np.exp(-TEMPO / 300)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        metricas = metricas_degrau(TEMPO, y, valor_final=0.0)
+    assert np.isnan(metricas['Overshoot'])
+
+
+def test_acao_reversa_igual_a_direta():
+    y = _resposta()
+    direta = metricas_degrau(TEMPO, y, valor_final=1.0)
+    reversa = metricas_degrau(TEMPO, -y, valor_final=-1.0)
+    assert direta['Overshoot'] > 0
+    for nome in ('Overshoot', 'RiseTime', 'SettlingTime', 'IAE'):
+        assert np.isclose(reversa[nome], direta[nome])
+    assert np.isclose(reversa['Peak'], -direta['Peak'])
@@ -0,0 +1,37 @@
+"""Rejeição de outliers do pré-processamento (python -m pytest, a partir de codes/)."""
+import numpy as np
+
+from c213.preprocessamento import Preprocessamento, preprocessar
+from c213.simulacao import resposta_degrau_fopdt
+
+
+def _degrau_ruidoso(n=20000, desvio=0.2, semente=0):
+    tempo = np.arange(n, dtype=np.float64)
+    entrada = np.ones(n)
+    saida = resposta_degrau_fopdt(tempo, 50.0, 2000.0, 1000.0)
+    saida += np.random.default_rng(semente).normal(0.0, desvio, n)
+    return tempo, entrada, saida
+
+
+def test_saida_quantizada_quase_sem_outliers():
+    # Em contagens inteiras o desvio mediano é 0; a resolução limita o sigma
+    tempo, entrada, saida = _degrau_ruidoso()
+    etapa = Preprocessamento(filtro=None, limite_outlier=3)
+    etapa.atualizar(tempo, entrada, np.round(saida))
+    etapa.finalizar()
+    assert etapa.outliers <= 0.001 * len(tempo)
+
+
+def test_outliers_isolados_rejeitados():
+    tempo, entrada, saida = _degrau_ruidoso()
+    saida[[3000, 9000, 15000]] += 30.0
+    filtrada, _ = preprocessar(tempo, entrada, saida, filtro=None, limite_outlier=4)
+    assert np.all(np.abs(filtrada[[3000, 9000, 15000]] - saida[[2999, 8999, 14999]]) < 2.0)
+
+
+def test_saida_constante_sem_rejeicao():
+    n = 5000
+    etapa = Preprocessamento(filtro=None, limite_outlier=3)
+    etapa.atualizar(np.arange(n), np.ones(n), np.full(n, 7.0))
+    etapa.finalizar()
+    assert etapa.outliers == 0
@@ -0,0 +1,34 @@
+"""Identificação recursiva (RLS) com busca do atraso (python -m pytest, a partir de codes/)."""
+import numpy as np
+
+from c213.recursiva import IdentificacaoRecursiva
+from c213.simulacao import simular_fopdt
+
+
+def _prbs(n, periodo=100, semente=0):
+    # Sequência binária pseudoaleatória: um sorteio a cada `periodo` amostras
+    rng = np.random.default_rng(semente)
+    return np.repeat(rng.choice([0.0, 1.0], n // periodo), periodo)
+
+
+def test_grade_de_atrasos_uniforme():
+    for theta_max, atrasos in ((100.0, 64), (77.0, 64), (5000.0, 64), (40.0, 16)):
+        estimador = IdentificacaoRecursiva(theta_max, dt=1.0, atrasos=atrasos)
+        passos = np.diff(estimador.atrasos)
+        assert len(estimador.atrasos) <= atrasos
+        assert np.all(passos == passos[0])
+        assert estimador.atrasos[-1] <= theta_max
+
+
+def test_prbs_recupera_atraso_da_planta():
+    n = 10000
+    tempo = np.arange(n, dtype=np.float64)
+    entrada = _prbs(n)
+    ruido = 0.01 * np.random.default_rng(1).standard_normal(n)
+    saida = simular_fopdt(tempo, entrada, 2.0, 50.0, 30.0) + 10.0 + ruido
+    estimador = IdentificacaoRecursiva(100.0)
+    estimador.atualizar(tempo, entrada, saida)
+    k, tau, theta = estimador.resultado()
+    assert abs(theta - 30.0) < 0.5
+    assert abs(k - 2.0) < 0.1
+    assert abs(tau - 50.0) < 5.0
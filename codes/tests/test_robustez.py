@@ -0,0 +1,24 @@
+"""Faixas de percentis da análise de robustez (python -m pytest, a partir de codes/)."""
+import numpy as np
+
+from c213.robustez import PERCENTIS, amostrar_plantas, avaliar_robustez, faixas
+from c213.simulacao import simular_malha_fechada_lote
+from c213.sintonia import sintonia_imc
+
+TEMPO = np.arange(0, 3000.0, 1.0)
+
+
+def test_faixas_dos_lotes_aproximam_as_de_todas_as_respostas():
+    ganhos = sintonia_imc(2.0, 100.0, 50.0, 50.0)
+    plantas = amostrar_plantas(2.0, 100.0, 50.0, 600, variacao=0.1)
+    exatas = faixas(simular_malha_fechada_lote(TEMPO, *plantas, ganhos))
+
+    metricas, bandas = avaliar_robustez(TEMPO, ganhos, *plantas, tamanho_lote=600, percentis_faixas=PERCENTIS)
+    assert bandas.shape == (len(PERCENTIS), len(TEMPO))
+    assert len(metricas['Overshoot']) == 600
+    # Um só lote: os percentis são os de todas as respostas
+    np.testing.assert_allclose(bandas, exatas, rtol=0, atol=1e-12)
+
+    # Dois lotes: média ponderada dos percentis de cada lote, perto dos exatos
+    _, bandas = avaliar_robustez(TEMPO, ganhos, *plantas, tamanho_lote=300, percentis_faixas=PERCENTIS)
+    assert np.max(np.abs(bandas - exatas)) < 0.05 * np.max(exatas[-1] - exatas[0])
@@ -0,0 +1,52 @@
+"""Simulação de malha fechada e seu horizonte (python -m pytest, a partir de codes/)."""
+from pathlib import Path
+
+import numpy as np
+
+from c213.api import identify_sundaresan, simulate_until_settled, tune_chr
+from c213.dados import carregar_dataset
+from c213.simulacao import (ATRASO_MINIMO_BLOCOS, _simular_em_blocos, _simular_por_amostra,
+                            coeficientes_discretos, coeficientes_pid, resposta_degrau_fopdt,
+                            simular_fopdt, simular_malha_fechada, simular_malha_fechada_lote)
+from c213.sintonia import sintonia_chr
+
+DATASET = Path(__file__).resolve().parent.parent / 'Dataset_Grupo9.mat'
+
+
+def test_degrau_discreto_igual_a_forma_fechada_com_atraso_fracionario():
+    tempo = np.arange(0, 500.0, 1.0)
+    # theta = 37,4 amostras: o segurador de ordem zero reparte o atraso entre b1 e b2
+    y = simular_fopdt(tempo, np.ones_like(tempo), 2.0, 50.0, 37.4)
+    np.testing.assert_allclose(y, resposta_degrau_fopdt(tempo, 2.0, 50.0, 37.4), rtol=0, atol=1e-12)
+
+
+def test_simulacao_em_blocos_igual_a_por_amostra():
+    dt = 1.0
+    planta = coeficientes_discretos(2.0, 100.0, 45.3, dt)
+    assert planta[3] >= ATRASO_MINIMO_BLOCOS
+    kp, ti, td = sintonia_chr(2.0, 100.0, 45.3)
+    pid = (kp,) + coeficientes_pid(kp, ti, td, dt)
+    np.testing.assert_allclose(_simular_em_blocos(3000, planta, pid, 1.5),
+                               _simular_por_amostra(3000, planta, pid, 1.5), rtol=0, atol=1e-10)
+
+
+def test_lote_igual_a_simulacoes_individuais():
+    tempo = np.arange(0, 1000.0, 1.0)
+    k = np.array([1.5, 2.0, 2.5])
+    tau = np.array([80.0, 100.0, 120.0])
+    theta = np.array([10.5, 40.0, 60.2])  # atrasos por amostra e em blocos
+    ganhos = np.array([sintonia_chr(*planta) for planta in zip(k, tau, theta)])
+    lote = simular_malha_fechada_lote(tempo, k, tau, theta, ganhos, setpoint=2.0)
+    for i in range(len(k)):
+        individual = simular_malha_fechada(tempo, k[i], tau[i], theta[i], *ganhos[i], setpoint=2.0)
+        np.testing.assert_allclose(lote[i], individual, rtol=0, atol=1e-10)
+
+
+def test_chr_acomoda_na_planta_do_dataset():
+    tempo, entrada, saida = carregar_dataset(DATASET)
+    k, tau, theta = identify_sundaresan(tempo, entrada, saida)
+    t, y, info = simulate_until_settled(tempo, k, tau, theta, *tune_chr(k, tau, theta))
+    # Na grade do ensaio a resposta CHR ainda oscila no fim: o horizonte é estendido
+    assert t[-1] > tempo[-1]
+    assert np.isfinite(info['SettlingTime'])
+    assert tempo[-1] < info['SettlingTime'] <= t[-1] / 2
@@ -0,0 +1,44 @@
+"""Partida a frio dos pontos de entrada, em processos novos (python -m pytest, a partir de codes/)."""
+import subprocess
+import sys
+
+import pytest
+
+from c213.tempo_importacao import ENTRADAS, ORCAMENTO_MS, PASTA_SCRIPTS, medir
+
+# Medições por entrada: vale a mais rápida (a primeira pode pegar o disco frio)
+REPETICOES = 3
+
+_IMPORTACAO = '''
+import sys, time
+inicio = time.perf_counter()
+import c213.cli
+print((time.perf_counter() - inicio) * 1000)
+print(' '.join(sorted(sys.modules)))
+'''
+
+
+def _carregado(modulos, pacote):
+    return any(nome == pacote or nome.startswith(pacote + '.') for nome in modulos)
+
+
+def test_cli_nao_importa_graficos_nem_pandas():
+    tempos = []
+    for _ in range(REPETICOES):
+        processo = subprocess.run([sys.executable, '-c', _IMPORTACAO], cwd=PASTA_SCRIPTS,
+                                  capture_output=True, text=True, check=True)
+        tempo_ms, modulos = processo.stdout.splitlines()
+        modulos = modulos.split()
+        for pacote in ('matplotlib', 'pandas', 'PyQt5'):
+            assert not _carregado(modulos, pacote), pacote
+        tempos.append(float(tempo_ms))
+    assert min(tempos) <= ORCAMENTO_MS
+
+
+@pytest.mark.parametrize('entrada', sorted(ENTRADAS))
+def test_interface_abre_no_orcamento(entrada):
+    pytest.importorskip('PyQt5')
+    medicoes = [medir(entrada) for _ in range(REPETICOES)]
+    for medicao in medicoes:
+        assert medicao['adiados'] == []
+    assert min(m['janela_ms'] for m in medicoes) <= ORCAMENTO_MS